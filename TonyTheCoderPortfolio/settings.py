@@ -1,5 +1,6 @@
 # TonyTheCoderPortfolio/settings.py
 import os
+import sys
 from pathlib import Path
 import dotenv
 
@@ -45,11 +46,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "portfolio_app.querybudget.QueryBudgetMiddleware",
+    "portfolio_app.replicas.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "portfolio_app.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "portfolio_app.servertiming.ServerTimingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -58,7 +63,9 @@ ROOT_URLCONF = "TonyTheCoderPortfolio.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates that reports render time to the Server-Timing header
+        "BACKEND": "portfolio_app.servertiming.TimedDjangoTemplates",
+        "NAME": "django",  # Keep the default engine alias for engines["django"]
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -82,6 +89,96 @@ DATABASES = {
     }
 }
 
+# Read replicas (see portfolio_app/replicas.py). List replica aliases in
+# DATABASE_REPLICAS; DJANGO_SQLITE_REPLICAS adds local SQLite copies of the
+# primary as replica1, replica2, ... Tests read them through "default".
+DATABASE_REPLICAS = []
+for _index, _path in enumerate(
+    filter(None, os.environ.get("DJANGO_SQLITE_REPLICAS", "").split(",")), start=1
+):
+    DATABASES[f"replica{_index}"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": _path.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{_index}")
+DATABASE_ROUTERS = ["portfolio_app.replicas.PrimaryReplicaRouter"]
+# After a write, the client's requests read from the primary for this long.
+DATABASE_PRIMARY_STICKY_SECONDS = int(
+    os.environ.get("DATABASE_PRIMARY_STICKY_SECONDS", 10)
+)
+
+# Writes through portfolio_app/dbwrites.py retry this many times, backing off
+# from DB_WRITE_RETRY_BACKOFF seconds, when SQLite reports the database locked.
+DB_WRITE_RETRIES = int(os.environ.get("DB_WRITE_RETRIES", 5))
+DB_WRITE_RETRY_BACKOFF = float(os.environ.get("DB_WRITE_RETRY_BACKOFF", 0.05))
+
+# Cache
+# LocMemCache is per-process: signal-driven invalidation only reaches other
+# workers when they share a backend (e.g. Redis or Memcached), so point
+# DJANGO_CACHE_BACKEND/DJANGO_CACHE_LOCATION at one in production.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", "tonythecoder-portfolio"),
+    }
+}
+
+# Seconds a serialized /api/portfolio-projects/ payload may live in the cache.
+# Edits invalidate it immediately via signals, so this is only a safety net.
+PORTFOLIO_API_CACHE_TIMEOUT = int(
+    os.environ.get("PORTFOLIO_API_CACHE_TIMEOUT", 60 * 60 * 24)
+)
+
+# Full-page cache for anonymous visitors (see portfolio_app/pagecache.py).
+# Content edits purge the affected pages via signals; the timeout bounds how
+# long scheduled posts and related-post lists can lag behind.
+PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE_ENABLED", "True") == "True"
+PAGE_CACHE_TIMEOUT = int(os.environ.get("PAGE_CACHE_TIMEOUT", 60 * 10))
+# Request headers whose value changes the rendered page, and thus the key.
+PAGE_CACHE_VARY_HEADERS = ("Accept-Language",)
+# Bump on deploy (e.g. to the git SHA) so pages pointing at old asset hashes go,
+# along with the cached navbar/footer fragments (portfolio_app/fragments.py).
+PAGE_CACHE_RELEASE = os.environ.get("PAGE_CACHE_RELEASE", "1")
+
+# gzip/Brotli for dynamic responses (see portfolio_app/compression.py); Brotli
+# needs the optional `brotli` package. Smaller bodies are sent as they are.
+# COMPRESSION_STREAMING compresses streaming responses too, flushing every chunk.
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "True") == "True"
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 500))
+COMPRESSION_STREAMING = os.environ.get("COMPRESSION_STREAMING", "True") == "True"
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", 5))
+COMPRESSION_MAX_RANDOM_BYTES = 100  # gzip header padding against BREACH; 0 turns it off
+
+# Fragment cache for cards, navbar and footer (see portfolio_app/fragments.py):
+# a per-process LRU of FRAGMENT_CACHE_LOCAL_SIZE entries in front of the cache.
+FRAGMENT_CACHE_ENABLED = os.environ.get("FRAGMENT_CACHE_ENABLED", "True") == "True"
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get("FRAGMENT_CACHE_TIMEOUT", 60 * 60 * 24))
+FRAGMENT_CACHE_LOCAL_SIZE = int(os.environ.get("FRAGMENT_CACHE_LOCAL_SIZE", 1000))
+FRAGMENT_CACHE_LOCAL_TIMEOUT = int(os.environ.get("FRAGMENT_CACHE_LOCAL_TIMEOUT", 60 * 5))
+
+# Per-request query budgets (see portfolio_app/querybudget.py). Views declare
+# a maximum with @query_budget(n); going over logs a warning, or raises when
+# QUERY_BUDGET_RAISE is on (the default under `manage.py test`).
+TESTING = sys.argv[1:2] == ["test"]
+QUERY_BUDGET_ENABLED = os.environ.get("QUERY_BUDGET_ENABLED", "True") == "True"
+QUERY_BUDGET_RAISE = os.environ.get("QUERY_BUDGET_RAISE", str(TESTING)) == "True"
+# Share of requests whose totals go to the shared cache for
+# `manage.py query_budget_report` (0.0-1.0); off in settings_production.
+QUERY_BUDGET_STATS_SAMPLE_RATE = float(os.environ.get("QUERY_BUDGET_STATS_SAMPLE_RATE", 1))
+
+# Server-Timing db/cache/tpl/app breakdown (see portfolio_app/servertiming.py).
+# Staff requests are always timed; others are sampled at this rate (0.0-1.0).
+SERVER_TIMING_STAFF = os.environ.get("SERVER_TIMING_STAFF", "True") == "True"
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", 0))
+
+# Compile templates, import views and fill the URL resolver when wsgi.py or
+# asgi.py is loaded (see portfolio_app/warmup.py); on in settings_production.
+WARMUP_ON_STARTUP = os.environ.get("WARMUP_ON_STARTUP", "False") == "True"
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -119,6 +216,24 @@ STATIC_ROOT = "static/" # for collect static
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media/"
 
+# Blog list pages (keyset-paginated, see portfolio_app/pagination.py)
+BLOG_POSTS_PER_PAGE = 9
+
+# Precomputed related posts (see portfolio_app/related.py). More neighbours are
+# stored than shown so scheduled or unpublished ones can be skipped at read time.
+RELATED_POSTS_TOP_K = 6
+
+# Responsive image renditions (see portfolio_app/renditions.py)
+IMAGE_RENDITION_WIDTHS = (480, 960, 1600)
+IMAGE_RENDITION_FORMATS = ("WEBP", "JPEG")
+IMAGE_RENDITION_QUALITY = 80
+IMAGE_RENDITIONS_ON_SAVE = True  # Backfill with `manage.py generate_renditions`
+
+# Background jobs (see portfolio_app/jobs.py). Staff gallery uploads are
+# verified and attached on this thread pool instead of the request thread.
+BACKGROUND_JOBS_ASYNC = os.environ.get("BACKGROUND_JOBS_ASYNC", "True") == "True"
+BACKGROUND_JOB_WORKERS = int(os.environ.get("BACKGROUND_JOB_WORKERS", 2))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
@@ -0,0 +1,24 @@
+"""
+ASGI deployment settings for TonyTheCoderPortfolio.
+
+The production profile for running under an ASGI server, e.g.
+
+    DJANGO_SETTINGS_MODULE=TonyTheCoderPortfolio.settings_asgi \
+        gunicorn TonyTheCoderPortfolio.asgi:application -k uvicorn.workers.UvicornWorker
+
+The portfolio and contact APIs are async views and every middleware in
+MIDDLEWARE is async-capable, so those requests never switch the whole
+middleware stack onto a worker thread; only the individual ORM and cache
+calls do. Slow clients then wait on the event loop instead of holding a
+thread. `manage.py run_concurrency_benchmark` measures the difference.
+"""
+
+from .settings_production import *  # noqa: F403
+from .settings_production import DATABASES
+
+# --- Database ---
+# No persistent connections: under ASGI each request's ORM calls run on a
+# thread that ends with the request, so a connection kept for reuse would be
+# left behind with it. Pool at the database instead if needed.
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = 0
@@ -0,0 +1,89 @@
+"""
+Production settings for TonyTheCoderPortfolio.
+
+Point DJANGO_SETTINGS_MODULE at TonyTheCoderPortfolio.settings_production.
+Everything not overridden here comes from settings.py and its environment
+variables.
+"""
+
+import os
+
+from .settings import *  # noqa: F403
+from .settings import DATABASES, TEMPLATES
+
+DEBUG = False
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
+
+# --- Database ---
+# Applied by Django on every new SQLite connection, replicas included. WAL
+# lets readers run while a write is in progress; synchronous=NORMAL is durable
+# in WAL mode except for the last commits before a power loss. mmap and a
+# larger page cache keep the hot tables in memory, and busy_timeout makes a
+# second writer wait for the lock instead of failing at once (see
+# portfolio_app/dbwrites.py for retries).
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA mmap_size = {int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+    f"PRAGMA cache_size = -{int(os.environ.get('SQLITE_CACHE_SIZE_KIB', 64 * 1024))}",
+    f"PRAGMA busy_timeout = {int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+    "PRAGMA temp_store = MEMORY",
+)
+for database in DATABASES.values():
+    if database["ENGINE"] != "django.db.backends.sqlite3":
+        continue
+    database.update(
+        {
+            # Reuse connections (and their pragmas and page cache) across requests.
+            "CONN_MAX_AGE": int(os.environ.get("DJANGO_CONN_MAX_AGE", 600)),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                **database.get("OPTIONS", {}),
+                "init_command": ";".join(SQLITE_PRAGMAS),
+                # Take the write lock at BEGIN; a transaction that starts as a
+                # reader cannot upgrade while another connection is writing.
+                "transaction_mode": "IMMEDIATE",
+            },
+        }
+    )
+
+# --- Query budgets ---
+# Recording stats is a cache read and write per request; sample a share of
+# requests (e.g. 0.01) while investigating instead of paying it on every one.
+QUERY_BUDGET_STATS_SAMPLE_RATE = float(os.environ.get("QUERY_BUDGET_STATS_SAMPLE_RATE", 0))
+
+# --- Templates ---
+# Compile each template once per worker and keep it. Django already does this
+# whenever DEBUG is off and no loaders are set; spelling it out keeps it that
+# way if loaders are ever customised. APP_DIRS must be off once loaders are set.
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"] = {
+    **TEMPLATES[0]["OPTIONS"],
+    "debug": False,
+    "loaders": [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        ),
+    ],
+}
+
+# --- Static files ---
+# collectstatic writes .gz/.br siblings for the web server's gzip_static and
+# brotli_static (see portfolio_app/staticstorage.py).
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "portfolio_app.staticstorage.CompressedStaticFilesStorage"},
+}
+
+# --- Startup ---
+# Compile templates and import views as each worker loads wsgi.py/asgi.py
+# (see portfolio_app/warmup.py), instead of on its first requests.
+WARMUP_ON_STARTUP = os.environ.get("WARMUP_ON_STARTUP", "True") == "True"
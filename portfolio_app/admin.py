@@ -2,6 +2,7 @@
 from django.contrib import admin
 from django import forms
 from django.utils.html import mark_safe
+from django.db import transaction
 from django.utils import timezone # Required for make_published action
 from django.urls import reverse # For portfolio_project_link
 
@@ -12,8 +13,15 @@ from .models import (
     BlogCategory,
     BlogPost,
     ContactInquiry,
+    GalleryUploadJob,
+    ImageRendition,
     # ActivityLog # Optional: Uncomment to keep and register ActivityLog
 )
+from .caching import BLOG, bump_content_version
+from .jobs import submit
+from .pagecache import purge_blog_pages
+from .related import refresh_related_posts
+from . import search
 # Import the new widget for CKEditor 5
 from django_ckeditor_5.widgets import CKEditor5Widget
 
@@ -65,6 +73,16 @@ class BlogPostAdminForm(forms.ModelForm):
         model = BlogPost
         fields = '__all__'
 
+# --- Mixins ---
+class FullTextSearchMixin:
+    """Routes the admin search box through the full-text index (search.py)."""
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+        return search.filter_queryset(queryset, search_term), False
+
+
 # --- ModelAdmins ---
 
 @admin.register(PortfolioCategory)
@@ -75,7 +93,7 @@ class PortfolioCategoryAdmin(admin.ModelAdmin):
     list_filter = ('is_active',)
 
 @admin.register(PortfolioProject)
-class PortfolioProjectAdmin(admin.ModelAdmin):
+class PortfolioProjectAdmin(FullTextSearchMixin, admin.ModelAdmin):
     form = PortfolioProjectAdminForm # Uses the updated form with CKEditor5Widget
     list_display = ('title', 'display_categories', 'is_active', 'order', 'github_url', 'live_demo_url', 'created_at')
     list_filter = ('categories', 'is_active', 'status')
@@ -97,6 +115,10 @@ class PortfolioProjectAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # display_categories reads obj.categories for every row of the changelist
+        return super().get_queryset(request).prefetch_related('categories')
+
     def display_categories(self, obj):
         return ", ".join([cat.name for cat in obj.categories.all()])
     display_categories.short_description = "Categories"
@@ -124,21 +146,41 @@ class PortfolioImageAdmin(admin.ModelAdmin):
     portfolio_project_link.admin_order_field = 'portfolio_project'
 
 
+@admin.register(GalleryUploadJob)
+class GalleryUploadJobAdmin(admin.ModelAdmin):
+    list_display = ('original_name', 'portfolio_project', 'status', 'created_at', 'updated_at')
+    list_filter = ('status',)
+    search_fields = ('original_name', 'portfolio_project__title')
+    list_select_related = ('portfolio_project',)
+    readonly_fields = ('portfolio_project', 'original_name', 'staged_file', 'portfolio_image', 'error', 'created_at', 'updated_at')
+
+
+@admin.register(ImageRendition)
+class ImageRenditionAdmin(admin.ModelAdmin):
+    list_display = ('source_name', 'format', 'width', 'height', 'created_at')
+    list_filter = ('format', 'width')
+    search_fields = ('source_name',)
+    readonly_fields = ('source_name', 'source_width', 'file', 'format', 'width', 'height', 'created_at')
+
+
 @admin.register(BlogCategory)
 class BlogCategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'slug', 'is_active', 'description')
+    list_display = ('name', 'slug', 'is_active', 'live_post_count', 'description')
+    readonly_fields = ('live_post_count', 'next_post_live_at')
     prepopulated_fields = {'slug': ('name',)}
     search_fields = ('name', 'description')
     list_filter = ('is_active',)
 
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
+class BlogPostAdmin(FullTextSearchMixin, admin.ModelAdmin):
     form = BlogPostAdminForm # Uses the updated form with CKEditor5Widget
     list_display = ('title', 'category', 'status', 'published_date', 'author_name', 'is_active')
+    list_select_related = ('category', 'author')  # author_name reads obj.author on every row
     list_filter = ('status', 'category', 'is_active', 'author')
     search_fields = ('title', 'content', 'excerpt')
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'published_date'
+    ordering = ('-published_date', '-id')  # Walks blogpost_pub_date_id_idx; created_at would need a sort
     actions = ['make_published', 'make_draft']
     autocomplete_fields = ['author', 'category']
 
@@ -154,12 +196,30 @@ class BlogPostAdmin(admin.ModelAdmin):
             obj.author = request.user
         super().save_model(request, obj, form, change)
 
+    def _update_and_refresh(self, queryset, **changes):
+        # queryset.update() skips save() and signals, so counters, search rows,
+        # related posts and cached pages are refreshed here.
+        with transaction.atomic():
+            posts = list(queryset.values_list('pk', 'slug', 'category_id', 'category__slug'))
+            post_ids = [pk for pk, _, _, _ in posts]
+            queryset.update(updated_at=timezone.now(), **changes)
+            category_ids = {category_id for _, _, category_id, _ in posts if category_id}
+            BlogCategory.objects.filter(pk__in=category_ids).refresh_post_counts()
+            search.index_objects(BlogPost.objects.filter(pk__in=post_ids))
+            for post_id in post_ids:
+                transaction.on_commit(lambda post_id=post_id: submit(refresh_related_posts, post_id))
+        bump_content_version(BLOG)
+        purge_blog_pages(
+            post_slugs=[slug for _, slug, _, _ in posts],
+            category_slugs=[category_slug for _, _, _, category_slug in posts],
+        )
+
     def make_published(self, request, queryset):
-        queryset.update(status=BlogPost.PUBLISHED, published_date=timezone.now())
+        self._update_and_refresh(queryset, status=BlogPost.PUBLISHED, published_date=timezone.now())
     make_published.short_description = "Mark selected posts as Published"
 
     def make_draft(self, request, queryset):
-        queryset.update(status=BlogPost.DRAFT)
+        self._update_and_refresh(queryset, status=BlogPost.DRAFT)
     make_draft.short_description = "Mark selected posts as Draft"
 
 
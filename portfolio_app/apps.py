@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class PortfolioAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portfolio_app'
+
+    def ready(self):
+        from . import signals  # Registers the @receiver signal handlers
+
+        post_migrate.connect(signals.create_search_table, sender=self)
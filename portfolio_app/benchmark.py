@@ -0,0 +1,755 @@
+# portfolio_app/benchmark.py
+#
+# Reproducible load testing.
+#
+# seed_benchmark_data() fills the database with a synthetic site of a chosen
+# size: portfolio categories and projects with gallery images (tiny generated
+# PNGs), blog categories and posts (drafts, scheduled and published, spread
+# over three years) and contact inquiries. The same seed always produces the
+# same content. Everything is written as a content export and loaded through
+# content_io.import_content(), so slugs, rendered post bodies, counters, the
+# search index and the caches come out exactly as a real import would leave
+# them, and re-seeding updates the rows in place. Seeded rows are recognisable
+# by their "bench-" slugs and @benchmark.invalid inquiry addresses.
+#
+# run_benchmark() serves the site from a threaded WSGI server on a free local
+# port and drives the public pages, the portfolio APIs and the staff list
+# pages (logged in as the seeded staff user) with concurrent clients. Every
+# response carries a Server-Timing header (servertiming.py), which supplies
+# the queries and database/template time per request. The report is JSON with
+# stable keys so two runs can be diffed:
+#
+#     {"config": {...}, "dataset": {...}, "endpoints": {"blog_list": {
+#         "requests": 200, "errors": 0, "status": {"200": 200},
+#         "throughput_rps": 412.3, "latency_ms": {"p50": ..., "p95": ..., "p99": ...},
+#         "queries_per_request": {"mean": 3.0, "max": 3}, ...}}, "totals": {...}}
+#
+# run_concurrency_benchmark() measures how the async API endpoints scale with
+# concurrent slow clients. The same read requests go through the project's
+# WSGI application on a fixed pool of worker threads (like gunicorn's gthread
+# worker) and through its ASGI application on one event loop, both in this
+# process, at rising numbers of concurrent clients. Each client takes
+# client_delay seconds to drain a response: a WSGI thread is blocked for that
+# long, an ASGI request just awaits it. The report has throughput, latency
+# and the peak number of extra threads per level and server.
+#
+# run_contention_benchmark() measures database reads while writes are going
+# on: reader threads run the portfolio and blog list queries, first alone and
+# then next to writer threads that insert contact inquiries through
+# dbwrites.run_write(). Run it under settings and settings_production to see
+# what WAL and the connection pragmas change; the report records the pragmas
+# that were in effect.
+
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from PIL import Image as PillowImage
+
+from . import content_io
+from .dbwrites import run_write
+from .models import (
+    BlogCategory,
+    BlogPost,
+    ContactInquiry,
+    PortfolioCategory,
+    PortfolioImage,
+    PortfolioProject,
+)
+from .related import rebuild_related_posts
+
+logger = logging.getLogger(__name__)
+
+SLUG_PREFIX = "bench-"
+INQUIRY_DOMAIN = "benchmark.invalid"
+STAFF_USERNAME = "benchmark-staff"
+PERCENTILES = (50, 95, 99)
+
+VOCABULARY = (
+    "django python react api cache query index template render async deploy "
+    "performance database sqlite postgres docker testing pipeline frontend "
+    "backend component state hook migration schema model view router signal "
+    "middleware session security static media image upload search ranking "
+    "latency throughput profiling benchmark refactor design pattern service "
+    "queue worker thread process memory network browser server client"
+).split()
+TECHNOLOGIES = ("Python", "Django", "React", "TypeScript", "SQLite", "PostgreSQL", "Docker", "Tailwind")
+SWATCHES = ((37, 99, 235), (16, 185, 129), (245, 158, 11), (239, 68, 68), (139, 92, 246), (100, 116, 139))
+
+
+# --- Seeding ---
+def _words(rng, count):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(count))
+
+
+def _title(rng):
+    return _words(rng, rng.randint(3, 7)).capitalize()
+
+
+def _post_body(rng):
+    sections = []
+    for _ in range(rng.randint(2, 5)):
+        sections.append(f"<h2>{_title(rng)}</h2>")
+        for _ in range(rng.randint(1, 4)):
+            sections.append(f"<p>{_words(rng, rng.randint(40, 120)).capitalize()}.</p>")
+        if rng.random() < 0.3:
+            sections.append(f"<pre><code>{_words(rng, 12)}</code></pre>")
+    return "".join(sections)
+
+
+def _png(color, size=(64, 40)):
+    buffer = BytesIO()
+    PillowImage.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _benchmark_records(rng, media_dir, categories, projects, images_per_project, posts):
+    """Yields content_io records for a synthetic site, writing gallery PNGs to media_dir."""
+    now = timezone.now()
+    swatches = [_png(color) for color in SWATCHES]
+
+    portfolio_slugs = [f"{SLUG_PREFIX}portfolio-{i}" for i in range(categories)]
+    for i, slug in enumerate(portfolio_slugs):
+        yield content_io.PORTFOLIO_CATEGORY, {
+            "name": f"Benchmark Portfolio {i}", "slug": slug,
+            "description": _words(rng, 12), "is_active": True,
+        }
+
+    for i in range(projects):
+        slug = f"{SLUG_PREFIX}project-{i}"
+        yield content_io.PORTFOLIO_PROJECT, {
+            "title": f"{_title(rng)} {i}",
+            "slug": slug,
+            "short_description": _words(rng, 20),
+            "details": "".join(f"<p>{_words(rng, 60)}</p>" for _ in range(3)),
+            "technologies_used": ", ".join(rng.sample(TECHNOLOGIES, 3)),
+            "github_url": f"https://github.com/example/{slug}",
+            "order": i,
+            "status": "COMPLETED",
+            "year_completed": now.year - rng.randint(0, 5),
+            "is_active": rng.random() < 0.9,
+            "created_at": (now - timedelta(days=rng.randint(0, 1000))).isoformat(),
+            "categories": rng.sample(portfolio_slugs, min(len(portfolio_slugs), rng.randint(1, 3))),
+        }
+    for i in range(projects):
+        for n in range(images_per_project):
+            name = f"portfolio_gallery/{SLUG_PREFIX}project-{i}/shot-{n}.png"
+            target = media_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(rng.choice(swatches))
+            yield content_io.PORTFOLIO_IMAGE, {
+                "project": f"{SLUG_PREFIX}project-{i}", "image": name,
+                "caption": _words(rng, 4), "order": n,
+                "uploaded_at": (now - timedelta(days=rng.randint(0, 1000))).isoformat(),
+            }
+
+    blog_slugs = [f"{SLUG_PREFIX}blog-{i}" for i in range(categories)]
+    for i, slug in enumerate(blog_slugs):
+        yield content_io.BLOG_CATEGORY, {
+            "name": f"Benchmark Blog {i}", "slug": slug,
+            "description": _words(rng, 12), "is_active": True,
+        }
+
+    for i in range(posts):
+        roll = rng.random()
+        if roll < 0.1:
+            status, published = BlogPost.DRAFT, None
+        elif roll < 0.15:  # Scheduled
+            status, published = BlogPost.PUBLISHED, now + timedelta(days=rng.randint(1, 60))
+        else:
+            status, published = BlogPost.PUBLISHED, now - timedelta(minutes=rng.randint(1, 3 * 365 * 24 * 60))
+        yield content_io.BLOG_POST, {
+            "title": f"{_title(rng)} {i}",
+            "slug": f"{SLUG_PREFIX}post-{i}",
+            "content": _post_body(rng),
+            "excerpt": _words(rng, 30) if rng.random() < 0.5 else "",
+            "status": status,
+            "published_date": published.isoformat() if published else None,
+            "is_active": True,
+            "created_at": (published or now).isoformat(),
+            "category": rng.choice(blog_slugs) if blog_slugs else None,
+            "author": STAFF_USERNAME,
+        }
+
+
+def benchmark_staff_user():
+    """The staff account the benchmark logs in as (created if missing)."""
+    user, created = get_user_model().objects.get_or_create(
+        username=STAFF_USERNAME,
+        defaults={"is_staff": True, "is_superuser": True, "email": f"staff@{INQUIRY_DOMAIN}"},
+    )
+    if created:
+        user.set_unusable_password()
+        user.save(update_fields=["password"])
+    return user
+
+
+def seed_benchmark_data(categories=8, projects=200, images_per_project=3, posts=2000,
+                        inquiries=500, seed=1, batch_size=1000, related=True):
+    """
+    Creates or updates the synthetic dataset and returns {model: rows seeded}.
+    related=False skips rebuilding related posts (quadratic in posts).
+    """
+    rng = random.Random(seed)
+    benchmark_staff_user()
+    with tempfile.TemporaryDirectory() as export_dir:
+        export_dir = Path(export_dir)
+        media_dir = export_dir / content_io.MEDIA_DIR
+        with open(export_dir / content_io.CONTENT_FILE, "w", encoding="utf-8") as out:
+            for record_type, data in _benchmark_records(
+                rng, media_dir, categories, projects, images_per_project, posts
+            ):
+                out.write(json.dumps({"type": record_type, "data": data}))
+                out.write("\n")
+        content_io.import_content(export_dir, batch_size=batch_size)
+
+    ContactInquiry.objects.filter(email__endswith=f"@{INQUIRY_DOMAIN}").delete()
+    statuses = [choice for choice, _ in ContactInquiry.STATUS_CHOICES]
+    ContactInquiry.objects.bulk_create(
+        (
+            ContactInquiry(
+                name=f"Visitor {i}",
+                email=f"visitor{i}@{INQUIRY_DOMAIN}",
+                subject=_title(rng),
+                message=_words(rng, rng.randint(20, 80)),
+                status=rng.choice(statuses),
+            )
+            for i in range(inquiries)
+        ),
+        batch_size=batch_size,
+    )
+    if related:
+        rebuild_related_posts()
+    return dataset_counts()
+
+
+def clear_benchmark_data():
+    """Deletes the seeded rows (media files are left in storage)."""
+    deleted = {}
+    for model in (BlogPost, BlogCategory, PortfolioProject, PortfolioCategory):
+        _, per_model = model.objects.filter(slug__startswith=SLUG_PREFIX).delete()
+        deleted[model.__name__] = per_model.get(model._meta.label, 0)
+    deleted["ContactInquiry"], _ = ContactInquiry.objects.filter(
+        email__endswith=f"@{INQUIRY_DOMAIN}"
+    ).delete()
+    BlogCategory.objects.all().refresh_post_counts()
+    return deleted
+
+
+def dataset_counts():
+    return {
+        model.__name__: model.objects.count()
+        for model in (
+            PortfolioCategory, PortfolioProject, PortfolioImage,
+            BlogCategory, BlogPost, ContactInquiry,
+        )
+    }
+
+
+# --- Load test ---
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class _LocalServer:
+    """The project's WSGI application on a free 127.0.0.1 port, in a daemon thread."""
+
+    def __enter__(self):
+        self.server = ThreadedWSGIServer(("127.0.0.1", 0), _QuietHandler, allow_reuse_address=False)
+        self.server.set_app(get_wsgi_application())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def default_endpoints():
+    """[(name, path, as_staff)] covering the public pages, APIs and staff lists."""
+    endpoints = [
+        ("home", reverse("portfolio_app:home"), False),
+        ("about_us", reverse("portfolio_app:about_us"), False),
+        ("contact_us", reverse("portfolio_app:contact_us"), False),
+        ("blog_list", reverse("portfolio_app:blog_list"), False),
+        ("blog_list_json", reverse("portfolio_app:blog_list") + "?format=json", False),
+        ("portfolio_showcase_react", reverse("portfolio_app:portfolio_showcase_react"), False),
+        ("api_portfolio_projects", reverse("portfolio_app:api_portfolio_projects"), False),
+        ("api_portfolio_categories", reverse("portfolio_app:api_portfolio_categories"), False),
+        ("api_search", reverse("portfolio_app:api_search") + "?q=django+cache", False),
+    ]
+    post = (
+        BlogPost.objects.filter(status=BlogPost.PUBLISHED, is_active=True, published_date__lte=timezone.now())
+        .order_by("-published_date")
+        .select_related("category")
+        .first()
+    )
+    if post:
+        endpoints.append(("blog_post_detail", post.get_absolute_url(), False))
+        if post.category and post.category.is_active:
+            endpoints.append((
+                "blog_category_list",
+                reverse("portfolio_app:blog_category_list", kwargs={"slug": post.category.slug}),
+                False,
+            ))
+    endpoints += [
+        ("staff_dashboard", reverse("portfolio_app:staff_dashboard"), True),
+        ("staff_portfolio_list", reverse("portfolio_app:staff_portfolio_list"), True),
+        ("admin_blogpost_changelist", reverse("admin:portfolio_app_blogpost_changelist"), True),
+        ("admin_portfolioproject_changelist", reverse("admin:portfolio_app_portfolioproject_changelist"), True),
+        ("admin_contactinquiry_changelist", reverse("admin:portfolio_app_contactinquiry_changelist"), True),
+    ]
+    return endpoints
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+_TIMING_RE = re.compile(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) )?')
+
+
+def parse_server_timing(header):
+    """{"db": (ms, count), ...} from a Server-Timing header."""
+    return {
+        name: (float(duration), int(count) if count else None)
+        for name, duration, count in _TIMING_RE.findall(header or "")
+    }
+
+
+def _fetch(url, cookie):
+    request = urllib.request.Request(url, headers={"Cookie": cookie} if cookie else {})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            status, timing = response.status, response.headers.get("Server-Timing")
+    except urllib.error.HTTPError as e:
+        e.read()
+        status, timing = e.code, e.headers.get("Server-Timing")
+    except OSError as e:
+        logger.warning(f"Benchmark request to {url} failed: {e}")
+        status, timing = 0, None
+    return time.perf_counter() - start, status, parse_server_timing(timing)
+
+
+def _summarise(results, elapsed):
+    latencies = sorted(latency * 1000 for latency, _, _ in results)
+    statuses = Counter(str(status) for _, status, _ in results)
+    timed = [timing for _, _, timing in results if "db" in timing]
+    queries = [timing["db"][1] for timing in timed]
+    summary = {
+        "requests": len(results),
+        "errors": sum(count for status, count in statuses.items() if not status.startswith(("2", "3"))),
+        "status": dict(sorted(statuses.items())),
+        "throughput_rps": round(len(results) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 2) if latencies else None,
+            **{f"p{pct}": round(percentile(latencies, pct), 2) if latencies else None for pct in PERCENTILES},
+            "max": round(latencies[-1], 2) if latencies else None,
+        },
+        "queries_per_request": {
+            "mean": round(statistics.fmean(queries), 2) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+    }
+    for segment in ("db", "tpl", "cache"):
+        values = [timing[segment][0] for timing in timed if segment in timing]
+        summary[f"{segment}_ms_mean"] = round(statistics.fmean(values), 2) if values else None
+    return summary
+
+
+def run_benchmark(requests_per_endpoint=200, concurrency=8, warmup=5, page_cache=True,
+                  include_staff=True, endpoints=None, label=""):
+    """Load-tests each endpoint in turn and returns the JSON-ready report."""
+    endpoints = endpoints or default_endpoints()
+    if not include_staff:
+        endpoints = [endpoint for endpoint in endpoints if not endpoint[2]]
+    overrides = override_settings(
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "127.0.0.1"],
+        PAGE_CACHE_ENABLED=page_cache,
+        SERVER_TIMING_SAMPLE_RATE=1.0,  # Every response reports its queries
+        QUERY_BUDGET_RAISE=False,
+    )
+    report = {
+        "label": label,
+        "generated_at": timezone.now().isoformat(),
+        "config": {
+            "requests_per_endpoint": requests_per_endpoint,
+            "concurrency": concurrency,
+            "warmup": warmup,
+            "page_cache": page_cache,
+            "server": "wsgi",
+        },
+        "dataset": dataset_counts(),
+        "endpoints": {},
+    }
+    staff_cookie = ""
+    if include_staff:
+        client = Client()
+        client.force_login(benchmark_staff_user())
+        staff_cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+    all_results, total_elapsed = [], 0.0
+    with overrides, _LocalServer() as server, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for name, path, as_staff in endpoints:
+            url = server.base_url + path
+            cookie = staff_cookie if as_staff else ""
+            for _ in range(warmup):
+                _fetch(url, cookie)
+            start = time.perf_counter()
+            results = list(pool.map(lambda _: _fetch(url, cookie), range(requests_per_endpoint)))
+            elapsed = time.perf_counter() - start
+            report["endpoints"][name] = {"path": path, "as_staff": as_staff, **_summarise(results, elapsed)}
+            all_results += results
+            total_elapsed += elapsed
+    report["totals"] = _summarise(all_results, total_elapsed)
+    return report
+
+
+# --- Concurrency ---
+def concurrency_endpoints():
+    """[(name, path)] of the async, read-only API endpoints."""
+    return [
+        ("api_portfolio_projects", reverse("portfolio_app:api_portfolio_projects")),
+        ("api_portfolio_categories", reverse("portfolio_app:api_portfolio_categories")),
+    ]
+
+
+def _wsgi_get(application, path, client_delay):
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "127.0.0.1",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "127.0.0.1",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    statuses = []
+    start = time.perf_counter()
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(int(status[:3])))
+    try:
+        for _ in response:
+            pass
+        time.sleep(client_delay)  # The worker thread is stuck writing to the slow client
+    finally:
+        response.close()
+    return time.perf_counter() - start, statuses[0], {}
+
+
+async def _asgi_get(application, path, client_delay):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"127.0.0.1")],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 80),
+    }
+    requested, statuses = False, []
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # The client never disconnects early
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+        elif not message.get("more_body"):
+            await asyncio.sleep(client_delay)  # The slow client drains the body
+
+    start = time.perf_counter()
+    await application(scope, receive, send)
+    return time.perf_counter() - start, statuses[0] if statuses else 0, {}
+
+
+class _ThreadPeak:
+    """Samples threading.active_count() and reports the peak above the starting count."""
+
+    def __enter__(self):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        self.baseline = threading.active_count()
+        self.peak = self.baseline
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(0.002):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def extra(self):
+        return self.peak - self.baseline
+
+
+async def _drive(call, paths, concurrency, total):
+    """Runs total calls, at most concurrency at a time; returns (results, elapsed)."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def client(i):
+        async with semaphore:
+            return await call(paths[i % len(paths)])
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client(i) for i in range(total)))
+    return results, time.perf_counter() - start
+
+
+def _client(server, application, pool, client_delay):
+    """An async callable(path) that sends one request to the server."""
+    if server == "asgi":
+        return lambda path: _asgi_get(application, path, client_delay)
+    loop = asyncio.get_running_loop()
+    return lambda path: loop.run_in_executor(pool, _wsgi_get, application, path, client_delay)
+
+
+async def _run_levels(server, paths, levels, requests_per_level, client_delay, wsgi_threads, warmup):
+    application = get_asgi_application() if server == "asgi" else get_wsgi_application()
+    report = {}
+    for level in levels:
+        # A fresh pool per level, so its threads count towards that level's peak.
+        with ThreadPoolExecutor(max_workers=wsgi_threads) as pool, _ThreadPeak() as threads:
+            call = _client(server, application, pool, client_delay)
+            await _drive(call, paths, min(level, warmup or 1), warmup)
+            results, elapsed = await _drive(call, paths, level, requests_per_level)
+        summary = _summarise(results, elapsed)
+        report[str(level)] = {
+            "requests": summary["requests"],
+            "errors": summary["errors"],
+            "status": summary["status"],
+            "throughput_rps": summary["throughput_rps"],
+            "latency_ms": summary["latency_ms"],
+            "peak_extra_threads": threads.extra,
+        }
+    return report
+
+
+def run_concurrency_benchmark(levels=(1, 10, 50, 200), requests_per_level=400, client_delay=0.2,
+                              wsgi_threads=8, warmup=10, servers=("wsgi", "asgi"), label=""):
+    """Drives the async API endpoints through WSGI and ASGI at each concurrency level."""
+    endpoints = concurrency_endpoints()
+    paths = [path for _, path in endpoints]
+    report = {
+        "label": label,
+        "generated_at": timezone.now().isoformat(),
+        "config": {
+            "levels": list(levels),
+            "requests_per_level": requests_per_level,
+            "client_delay_ms": round(client_delay * 1000, 1),
+            "wsgi_threads": wsgi_threads,
+            "warmup": warmup,
+            "endpoints": dict(endpoints),
+        },
+        "dataset": dataset_counts(),
+        "servers": {},
+    }
+    with override_settings(
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "127.0.0.1"],
+        SERVER_TIMING_SAMPLE_RATE=0.0,
+        QUERY_BUDGET_RAISE=False,
+    ):
+        for server in servers:
+            report["servers"][server] = asyncio.run(
+                _run_levels(server, paths, levels, requests_per_level, client_delay, wsgi_threads, warmup)
+            )
+    return report
+
+
+# --- Reads under write load ---
+SQLITE_PRAGMAS = ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size", "temp_store")
+WRITER_NAME = "Benchmark writer"
+
+
+def database_profile():
+    """The connection settings the contention benchmark ran with."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    profile = {"vendor": connection.vendor, "conn_max_age": connection.settings_dict["CONN_MAX_AGE"]}
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(f"PRAGMA {pragma}")
+                row = cursor.fetchone()  # mmap_size returns no row for in-memory databases
+                profile[pragma] = row[0] if row else None
+        profile["transaction_mode"] = connection.transaction_mode
+    return profile
+
+
+def _read_operations():
+    return [
+        lambda: list(
+            PortfolioProject.objects.filter(is_active=True)
+            .order_by("order", "-created_at")
+            .prefetch_related("categories")
+            .with_first_image()[:50]
+        ),
+        lambda: list(
+            BlogPost.objects.filter(status=BlogPost.PUBLISHED, is_active=True, published_date__lte=timezone.now())
+            .select_related("category", "author")
+            .order_by("-published_date")[:20]
+        ),
+    ]
+
+
+def _write_inquiry(writer, number):
+    ContactInquiry.objects.create(
+        name=f"{WRITER_NAME} {writer}",
+        email=f"writer-{writer}-{number}@{INQUIRY_DOMAIN}",
+        subject="Contention benchmark",
+        message=" ".join(VOCABULARY[:40]),
+    )
+
+
+def _reader(stop, latencies, errors):
+    operations = _read_operations()
+    try:
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                operations[len(latencies) % len(operations)]()
+            except OperationalError:
+                errors.append(1)
+                continue
+            latencies.append(time.perf_counter() - start)
+    finally:
+        connections.close_all()
+
+
+def _writer(stop, writer, interval, latencies, errors):
+    try:
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                run_write(_write_inquiry, writer, len(latencies) + len(errors))
+                latencies.append(time.perf_counter() - start)
+            except OperationalError as e:
+                logger.warning(f"Benchmark write failed: {e}")
+                errors.append(1)
+            if interval:
+                stop.wait(interval)
+    finally:
+        connections.close_all()
+
+
+def _latency_summary(latencies, errors, elapsed):
+    latencies = sorted(latency * 1000 for latency in latencies)
+    return {
+        "operations": len(latencies),
+        "errors": len(errors),
+        "per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            **{f"p{pct}": round(percentile(latencies, pct), 2) if latencies else None for pct in PERCENTILES},
+            "max": round(latencies[-1], 2) if latencies else None,
+        },
+    }
+
+
+def _contention_phase(readers, writers, duration, write_interval):
+    stop = threading.Event()
+    read_latencies, read_errors = [[] for _ in range(readers)], [[] for _ in range(readers)]
+    write_latencies, write_errors = [[] for _ in range(writers)], [[] for _ in range(writers)]
+    threads = [
+        threading.Thread(target=_reader, args=(stop, read_latencies[i], read_errors[i])) for i in range(readers)
+    ] + [
+        threading.Thread(target=_writer, args=(stop, i, write_interval, write_latencies[i], write_errors[i]))
+        for i in range(writers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    phase = {
+        "reads": _latency_summary(
+            [x for chunk in read_latencies for x in chunk], [x for chunk in read_errors for x in chunk], elapsed
+        )
+    }
+    if writers:
+        phase["writes"] = _latency_summary(
+            [x for chunk in write_latencies for x in chunk], [x for chunk in write_errors for x in chunk], elapsed
+        )
+    return phase
+
+
+def run_contention_benchmark(readers=4, writers=2, duration=5.0, write_interval=0.0, label=""):
+    """Measures read throughput alone and alongside concurrent writers."""
+    report = {
+        "label": label,
+        "generated_at": timezone.now().isoformat(),
+        "config": {
+            "readers": readers,
+            "writers": writers,
+            "duration_s": duration,
+            "write_interval_ms": round(write_interval * 1000, 1),
+        },
+        "database": database_profile(),
+        "dataset": dataset_counts(),
+    }
+    try:
+        report["reads_only"] = _contention_phase(readers, 0, duration, write_interval)
+        report["reads_with_writes"] = _contention_phase(readers, writers, duration, write_interval)
+    finally:
+        ContactInquiry.objects.filter(
+            name__startswith=WRITER_NAME, email__endswith=f"@{INQUIRY_DOMAIN}"
+        ).delete()
+    alone = report["reads_only"]["reads"]["per_second"]
+    loaded = report["reads_with_writes"]["reads"]["per_second"]
+    report["read_throughput_retained"] = round(loaded / alone, 3) if alone else None
+    return report
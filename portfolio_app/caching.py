@@ -0,0 +1,82 @@
+# portfolio_app/caching.py
+#
+# Versioned cache keys for public content.
+#
+# Instead of hunting down and deleting every cached payload when staff edit
+# something, each content area ("portfolio", "blog", ...) carries a version
+# number in the cache. Cached payloads embed that number in their key, so
+# bumping the version (see signals.py) makes every old entry unreachable at
+# once and it simply ages out of the cache.
+#
+# The same counters double as dependency tags for the page cache
+# (pagecache.py): a cached page records the versions of the tags it depends
+# on and is discarded when any of them has moved on.
+#
+# The a-prefixed functions are the same lookups for async views.
+
+from django.core.cache import cache
+
+CONTENT_VERSION_KEY = "portfolio_app:content_version:{namespace}"
+
+PORTFOLIO = "portfolio"
+BLOG = "blog"
+
+
+def get_content_version(namespace):
+    """Returns the current version number for a content namespace."""
+    key = CONTENT_VERSION_KEY.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        # add() is a no-op if another worker initialised the key first.
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+async def aget_content_version(namespace):
+    key = CONTENT_VERSION_KEY.format(namespace=namespace)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, 1, timeout=None)
+        version = await cache.aget(key, 1)
+    return version
+
+
+def bump_content_version(namespace):
+    """Invalidates every payload cached under the namespace's current version."""
+    key = CONTENT_VERSION_KEY.format(namespace=namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:  # Key missing (evicted or never set)
+        cache.set(key, 2, timeout=None)
+        return 2
+
+
+def versioned_cache_key(namespace, *parts):
+    """Builds a cache key tied to the namespace's current content version."""
+    return _versioned_key(namespace, get_content_version(namespace), parts)
+
+
+async def aversioned_cache_key(namespace, *parts):
+    return _versioned_key(namespace, await aget_content_version(namespace), parts)
+
+
+def _versioned_key(namespace, version, parts):
+    suffix = ":".join(str(part) for part in parts)
+    return f"portfolio_app:{namespace}:v{version}:{suffix}"
+
+
+def get_tag_versions(tags):
+    """Returns {tag: version} for several namespaces with one cache round trip."""
+    keys = {CONTENT_VERSION_KEY.format(namespace=tag): tag for tag in tags}
+    found = cache.get_many(keys.keys())
+    versions = {keys[key]: version for key, version in found.items()}
+    for tag in tags:
+        if tag not in versions:
+            versions[tag] = get_content_version(tag)
+    return versions
+
+
+def bump_tags(*tags):
+    for tag in tags:
+        bump_content_version(tag)
@@ -0,0 +1,275 @@
+# portfolio_app/compression.py
+#
+# gzip and Brotli for dynamic responses.
+#
+# CompressionMiddleware replaces Django's GZipMiddleware. It picks the best
+# encoding the client accepts (Brotli when the optional `brotli` package is
+# installed, else gzip) and compresses HTML, JSON and other text responses of
+# at least settings.COMPRESSION_MIN_SIZE bytes. Like GZipMiddleware it adds
+# Vary: Accept-Encoding, weakens strong ETags and pads gzip output with a
+# random-length file name against BREACH.
+#
+# Streaming responses are compressed only when settings.COMPRESSION_STREAMING
+# is on, and then chunk by chunk with a flush after each one, so nothing a
+# view has yielded sits in the compressor's buffer. FileResponse (downloads,
+# DEBUG static files) is left alone.
+#
+# Pages in the page cache (pagecache.py) store their compressed variants next
+# to the plain body, so a cache hit is served compressed without compressing
+# again. Static files are compressed once at collectstatic time instead (see
+# staticstorage.py) and served by the web server with gzip_static and
+# brotli_static.
+
+import gzip
+import random
+import string
+from io import BytesIO
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import StreamingBuffer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Media types worth compressing; matched as prefixes of the Content-Type.
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/manifest+json",
+    "image/svg+xml",
+)
+
+# Suffix of the precompressed sibling file for each encoding.
+FILE_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+# Levels for files compressed once and served many times.
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 11
+
+
+def available_encodings():
+    """The encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding):
+    """The best available encoding for an Accept-Encoding header, or None."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            weights[coding.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(response):
+    content_type = response.get("Content-Type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not isinstance(response, FileResponse)
+
+
+def _random_filename():
+    # Varies the gzip header length per response (Heal the BREACH).
+    length = random.randint(1, settings.COMPRESSION_MAX_RANDOM_BYTES)
+    return "".join(random.choices(string.ascii_letters, k=length))
+
+
+def _gzip_file(fileobj, level):
+    filename = _random_filename() if settings.COMPRESSION_MAX_RANDOM_BYTES else None
+    return gzip.GzipFile(filename=filename, mode="wb", compresslevel=level, fileobj=fileobj, mtime=0)
+
+
+def compress(data, encoding):
+    """Compresses a whole body at the dynamic-response level."""
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    buffer = BytesIO()
+    with _gzip_file(buffer, settings.COMPRESSION_GZIP_LEVEL) as zfile:
+        zfile.write(data)
+    return buffer.getvalue()
+
+
+def precompress(data, min_size=None):
+    """
+    {encoding: bytes} at maximum compression for content stored and served
+    as-is (static files, exported pages). Encodings that do not make the
+    content smaller are left out.
+    """
+    min_size = settings.COMPRESSION_MIN_SIZE if min_size is None else min_size
+    if len(data) < min_size:
+        return {}
+    variants = {"gzip": gzip.compress(data, compresslevel=PRECOMPRESS_GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=PRECOMPRESS_BROTLI_QUALITY)
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(data)}
+
+
+def compressed_variants(response):
+    """
+    {encoding: bytes} of a finished response for every available encoding, for
+    the page cache; empty when the response would not be compressed.
+    """
+    if (
+        not settings.COMPRESSION_ENABLED
+        or response.streaming
+        or response.has_header("Content-Encoding")
+        or not is_compressible(response)
+        or len(response.content) < settings.COMPRESSION_MIN_SIZE
+    ):
+        return {}
+    variants = {encoding: compress(response.content, encoding) for encoding in available_encodings()}
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(response.content)}
+
+
+def encode_response(response, encoding, body):
+    """Swaps a response's content for its compressed form."""
+    response.content = body
+    response.headers["Content-Length"] = str(len(body))
+    _mark_encoded(response, encoding)
+    return response
+
+
+def encode_for_request(request, response, variants):
+    """Serves the stored variant the client accepts, if any (page cache)."""
+    if variants:
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.headers.get("Accept-Encoding", ""))
+        if encoding in variants:
+            encode_response(response, encoding, variants[encoding])
+    return response
+
+
+def _mark_encoded(response, encoding):
+    # A strong ETag names exact bytes; the compressed body is a different
+    # representation of the same content (RFC 9110 8.8.1).
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response.headers["ETag"] = "W/" + etag
+    response.headers["Content-Encoding"] = encoding
+
+
+class _GzipStream:
+    def __init__(self):
+        self.buffer = StreamingBuffer()
+        self.file = _gzip_file(self.buffer, settings.COMPRESSION_GZIP_LEVEL)
+
+    def compress(self, chunk):
+        self.file.write(chunk)
+        self.file.flush()
+        return self.buffer.read()
+
+    def finish(self):
+        self.file.close()
+        return self.buffer.read()
+
+
+class _BrotliStream:
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, chunk):
+        return self.compressor.process(chunk) + self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+def _stream(encoding):
+    return _BrotliStream() if encoding == "br" else _GzipStream()
+
+
+def compress_stream(chunks, encoding):
+    stream = _stream(encoding)
+    for chunk in chunks:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    stream = _stream(encoding)
+    async for chunk in chunks:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compresses text responses with Brotli or gzip. Place it after
+    SecurityMiddleware and before anything that reads or rewrites the body.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if (
+            not settings.COMPRESSION_ENABLED
+            or response.has_header("Content-Encoding")
+            or not is_compressible(response)
+        ):
+            return response
+        if response.streaming:
+            if not settings.COMPRESSION_STREAMING:
+                return response
+        elif len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            # Capture the iterator now in case streaming_content is replaced later.
+            chunks = response.streaming_content
+            if response.is_async:
+                response.streaming_content = acompress_stream(chunks, encoding)
+            else:
+                response.streaming_content = compress_stream(chunks, encoding)
+            # The compressed length is unknown until the stream ends.
+            del response.headers["Content-Length"]
+            _mark_encoded(response, encoding)
+            return response
+
+        body = compress(response.content, encoding)
+        if len(body) >= len(response.content):
+            return response
+        return encode_response(response, encoding, body)
@@ -0,0 +1,374 @@
+# portfolio_app/content_io.py
+#
+# Streaming content export/import (JSON Lines + media directory).
+#
+# An export directory looks like
+#     content.jsonl   one {"type": ..., "data": {...}} record per line
+#     media/          copies of every referenced image, under its storage name
+#
+# Records are written in dependency order (portfolio categories, projects,
+# gallery images, blog categories, posts) and refer to each other by slug,
+# so an export can be imported into a database with different primary keys.
+# Export walks each table with .iterator(); import reads the file line by line
+# and upserts in batches with bulk_create/bulk_update, keyed on slug (gallery
+# images on project + file name), so re-running an import is idempotent and
+# memory stays bounded by the batch size.
+#
+# Bulk writes skip save() and the signals, so import_content() refreshes the
+# derived data itself: rendered post bodies and slugs before writing, then the
+# category counters, the search index and the caches at the end.
+
+import json
+import logging
+import shutil
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import search
+from .caching import BLOG, PORTFOLIO, bump_content_version
+from .models import BlogCategory, BlogPost, PortfolioCategory, PortfolioImage, PortfolioProject
+from .pagecache import purge_blog_pages
+from .slugs import allocate_slugs
+
+logger = logging.getLogger(__name__)
+
+CONTENT_FILE = "content.jsonl"
+MEDIA_DIR = "media"
+CHUNK_SIZE = 2000
+
+PORTFOLIO_CATEGORY = "portfolio_category"
+PORTFOLIO_PROJECT = "portfolio_project"
+PORTFOLIO_IMAGE = "portfolio_image"
+BLOG_CATEGORY = "blog_category"
+BLOG_POST = "blog_post"
+
+# Plain column fields per record type (relations are handled separately).
+FIELDS = {
+    PORTFOLIO_CATEGORY: ["name", "slug", "description", "is_active"],
+    PORTFOLIO_PROJECT: [
+        "title", "slug", "featured_image", "short_description", "details",
+        "technologies_used", "github_url", "live_demo_url", "order", "status",
+        "year_completed", "is_active", "created_at",
+    ],
+    PORTFOLIO_IMAGE: ["image", "caption", "order", "uploaded_at"],
+    BLOG_CATEGORY: ["name", "slug", "description", "is_active"],
+    BLOG_POST: [
+        "title", "slug", "content", "excerpt", "featured_image", "status",
+        "published_date", "is_active", "created_at",
+    ],
+}
+FILE_FIELDS = {"featured_image", "image"}
+DATETIME_FIELDS = {"created_at", "uploaded_at", "published_date"}
+
+
+# --- Export ---
+def _row(obj, record_type):
+    data = {}
+    for field in FIELDS[record_type]:
+        value = getattr(obj, field)
+        if field in FILE_FIELDS:
+            value = value.name or None
+        elif field in DATETIME_FIELDS and value:
+            value = value.isoformat()  # Full precision; DjangoJSONEncoder drops microseconds
+        data[field] = value
+    return data
+
+
+def _copy_media(field_file, media_dir):
+    if not field_file or not field_file.name:
+        return
+    target = media_dir / field_file.name
+    if target.exists():
+        return
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with field_file.storage.open(field_file.name, "rb") as source, open(target, "wb") as out:
+            shutil.copyfileobj(source, out)
+    except OSError as e:
+        logger.warning(f"Could not export media file {field_file.name}: {e}")
+
+
+def _export_records():
+    """Yields (record_type, data, [FieldFiles to copy]) in dependency order."""
+    for category in PortfolioCategory.objects.order_by("pk").iterator(chunk_size=CHUNK_SIZE):
+        yield PORTFOLIO_CATEGORY, _row(category, PORTFOLIO_CATEGORY), []
+
+    projects = PortfolioProject.objects.order_by("pk").prefetch_related("categories")
+    for project in projects.iterator(chunk_size=CHUNK_SIZE):
+        data = _row(project, PORTFOLIO_PROJECT)
+        data["categories"] = sorted(category.slug for category in project.categories.all())
+        yield PORTFOLIO_PROJECT, data, [project.featured_image]
+
+    images = PortfolioImage.objects.select_related("portfolio_project").only(
+        "image", "caption", "order", "uploaded_at", "portfolio_project__slug"
+    ).order_by("pk")
+    for image in images.iterator(chunk_size=CHUNK_SIZE):
+        data = _row(image, PORTFOLIO_IMAGE)
+        data["project"] = image.portfolio_project.slug
+        yield PORTFOLIO_IMAGE, data, [image.image]
+
+    for category in BlogCategory.objects.order_by("pk").iterator(chunk_size=CHUNK_SIZE):
+        yield BLOG_CATEGORY, _row(category, BLOG_CATEGORY), []
+
+    posts = BlogPost.objects.select_related("category", "author").only(
+        *FIELDS[BLOG_POST], "category__slug", "author__username"
+    ).order_by("pk")
+    for post in posts.iterator(chunk_size=CHUNK_SIZE):
+        data = _row(post, BLOG_POST)
+        data["category"] = post.category.slug if post.category else None
+        data["author"] = post.author.username if post.author else None
+        yield BLOG_POST, data, [post.featured_image]
+
+
+def export_content(output_dir, include_media=True):
+    """Writes content.jsonl (and media/) to output_dir. Returns {type: count}."""
+    output_dir = Path(output_dir)
+    media_dir = output_dir / MEDIA_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    with open(output_dir / CONTENT_FILE, "w", encoding="utf-8") as out:
+        for record_type, data, files in _export_records():
+            out.write(json.dumps({"type": record_type, "data": data}, cls=DjangoJSONEncoder))
+            out.write("\n")
+            if include_media:
+                for field_file in files:
+                    _copy_media(field_file, media_dir)
+            counts[record_type] = counts.get(record_type, 0) + 1
+    return counts
+
+
+# --- Import ---
+class ContentImporter:
+    """Upserts exported records in batches; see import_content()."""
+
+    def __init__(self, source_dir, batch_size=1000):
+        self.source_dir = Path(source_dir)
+        self.media_dir = self.source_dir / MEDIA_DIR
+        self.batch_size = batch_size
+        self.created = {}
+        self.updated = {}
+        self._slug_ids = {PORTFOLIO_CATEGORY: {}, BLOG_CATEGORY: {}}  # Small tables, kept whole
+        self._user_ids = {}
+
+    # Helpers
+    def _media(self, name):
+        """Copies an exported media file into storage (once) and returns its name."""
+        if not name:
+            return ""
+        source = self.media_dir / name
+        if not default_storage.exists(name) and source.exists():
+            with open(source, "rb") as f:
+                saved = default_storage.save(name, File(f))
+            if saved != name:
+                logger.warning(f"Imported media {name} was stored as {saved}")
+            return saved
+        return name
+
+    def _values(self, record_type, data):
+        values = {}
+        for field in FIELDS[record_type]:
+            if field not in data:
+                continue
+            value = data[field]
+            if field in DATETIME_FIELDS and value:
+                value = parse_datetime(value)
+            elif field in FILE_FIELDS:
+                value = self._media(value)
+            values[field] = value
+        return values
+
+    def _category_ids(self, model, record_type, slugs):
+        known = self._slug_ids[record_type]
+        missing = {slug for slug in slugs if slug and slug not in known}
+        if missing:
+            known.update(model.objects.filter(slug__in=missing).values_list("slug", "pk"))
+        return known
+
+    def _user_id(self, usernames):
+        missing = {name for name in usernames if name and name not in self._user_ids}
+        if missing:
+            self._user_ids.update(
+                get_user_model().objects.filter(username__in=missing).values_list("username", "pk")
+            )
+        return self._user_ids
+
+    def _count(self, record_type, created, updated):
+        self.created[record_type] = self.created.get(record_type, 0) + created
+        self.updated[record_type] = self.updated.get(record_type, 0) + updated
+
+    def _bulk_create(self, model, objects):
+        """bulk_create that keeps imported auto_now_add timestamps (created_at/uploaded_at)."""
+        stamped = [f.attname for f in model._meta.concrete_fields if getattr(f, "auto_now_add", False)]
+        originals = [{name: getattr(obj, name) for name in stamped} for obj in objects]
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        restored = []
+        for obj, values in zip(objects, originals):
+            if any(value and getattr(obj, name) != value for name, value in values.items()):
+                for name, value in values.items():
+                    setattr(obj, name, value or getattr(obj, name))
+                restored.append(obj)
+        if restored and all(obj.pk is not None for obj in restored):
+            model.objects.bulk_update(restored, stamped, batch_size=self.batch_size)
+
+    def _upsert_by_slug(self, model, record_type, objects):
+        """bulk_create new slugs, bulk_update existing ones; returns {slug: pk}."""
+        allocate_slugs([obj for obj in objects if not obj.slug], model.slug_source_field)
+        by_slug = {obj.slug: obj for obj in objects}  # Last record wins within a batch
+        existing = dict(model.objects.filter(slug__in=by_slug).values_list("slug", "pk"))
+        to_create, to_update = [], []
+        for slug, obj in by_slug.items():
+            if slug in existing:
+                obj.pk = existing[slug]
+                to_update.append(obj)
+            else:
+                to_create.append(obj)
+        self._bulk_create(model, to_create)
+        if to_update:
+            fields = [f for f in FIELDS[record_type] + self._extra_update_fields(model) if f != "slug"]
+            model.objects.bulk_update(to_update, fields, batch_size=self.batch_size)
+        self._count(record_type, len(to_create), len(to_update))
+        if any(obj.pk is None for obj in to_create):  # Backends without RETURNING
+            existing = dict(model.objects.filter(slug__in=by_slug).values_list("slug", "pk"))
+            for obj in to_create:
+                obj.pk = existing[obj.slug]
+        return {slug: obj.pk for slug, obj in by_slug.items()}
+
+    def _extra_update_fields(self, model):
+        if model is BlogPost:
+            return ["category", "author", "updated_at"] + BlogPost.RENDERED_FIELDS
+        if model is PortfolioProject:
+            return ["updated_at"]
+        return []
+
+    # Per-type batch handlers
+    def _import_categories(self, model, record_type, batch):
+        objects = [model(**self._values(record_type, data)) for data in batch]
+        self._slug_ids[record_type].update(self._upsert_by_slug(model, record_type, objects))
+
+    def _import_projects(self, batch):
+        now = timezone.now()
+        objects = []
+        for data in batch:
+            values = self._values(PORTFOLIO_PROJECT, data)
+            objects.append(PortfolioProject(updated_at=now, **values))
+        project_ids = self._upsert_by_slug(PortfolioProject, PORTFOLIO_PROJECT, objects)
+
+        # Replace the category links of every project in the batch in two queries.
+        category_ids = self._category_ids(
+            PortfolioCategory, PORTFOLIO_CATEGORY,
+            {slug for data in batch for slug in data.get("categories", [])},
+        )
+        through = PortfolioProject.categories.through
+        through.objects.filter(portfolioproject_id__in=project_ids.values()).delete()
+        links = {
+            (project_ids[data["slug"]], category_ids[slug])
+            for data in batch
+            if data.get("slug") in project_ids
+            for slug in data.get("categories", [])
+            if slug in category_ids
+        }
+        through.objects.bulk_create(
+            [through(portfolioproject_id=p, portfoliocategory_id=c) for p, c in links],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+
+    def _import_images(self, batch):
+        project_ids = dict(
+            PortfolioProject.objects.filter(slug__in={data["project"] for data in batch})
+            .values_list("slug", "pk")
+        )
+        existing = {
+            (project_id, name): pk
+            for pk, project_id, name in PortfolioImage.objects.filter(
+                portfolio_project_id__in=project_ids.values()
+            ).values_list("pk", "portfolio_project_id", "image")
+        }
+        to_create, to_update = [], []
+        for data in batch:
+            project_id = project_ids.get(data["project"])
+            if project_id is None:
+                logger.warning(f"Skipping image {data.get('image')}: unknown project {data['project']}")
+                continue
+            values = self._values(PORTFOLIO_IMAGE, data)
+            image = PortfolioImage(portfolio_project_id=project_id, **values)
+            image.pk = existing.get((project_id, image.image.name))
+            (to_update if image.pk else to_create).append(image)
+        self._bulk_create(PortfolioImage, to_create)
+        PortfolioImage.objects.bulk_update(to_update, ["caption", "order"], batch_size=self.batch_size)
+        self._count(PORTFOLIO_IMAGE, len(to_create), len(to_update))
+
+    def _import_posts(self, batch):
+        now = timezone.now()
+        category_ids = self._category_ids(
+            BlogCategory, BLOG_CATEGORY, {data.get("category") for data in batch}
+        )
+        user_ids = self._user_id({data.get("author") for data in batch})
+        objects = []
+        for data in batch:
+            values = self._values(BLOG_POST, data)
+            post = BlogPost(
+                category_id=category_ids.get(data.get("category")),
+                author_id=user_ids.get(data.get("author")),
+                updated_at=now,
+                **values,
+            )
+            if post.status == BlogPost.PUBLISHED and post.published_date is None:
+                post.published_date = now
+            post.render_content()
+            objects.append(post)
+        post_ids = self._upsert_by_slug(BlogPost, BLOG_POST, objects)
+        purge_blog_pages(post_slugs=post_ids.keys())
+
+    def _flush(self, record_type, batch):
+        if not batch:
+            return
+        with transaction.atomic():
+            if record_type == PORTFOLIO_CATEGORY:
+                self._import_categories(PortfolioCategory, record_type, batch)
+            elif record_type == BLOG_CATEGORY:
+                self._import_categories(BlogCategory, record_type, batch)
+            elif record_type == PORTFOLIO_PROJECT:
+                self._import_projects(batch)
+            elif record_type == PORTFOLIO_IMAGE:
+                self._import_images(batch)
+            elif record_type == BLOG_POST:
+                self._import_posts(batch)
+            else:
+                logger.warning(f"Skipping {len(batch)} record(s) of unknown type {record_type!r}")
+
+    def run(self):
+        current_type, batch = None, []
+        with open(self.source_dir / CONTENT_FILE, encoding="utf-8") as source:
+            for line in source:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                # Records arrive grouped by type in dependency order; flush on change.
+                if record["type"] != current_type or len(batch) >= self.batch_size:
+                    self._flush(current_type, batch)
+                    current_type, batch = record["type"], []
+                batch.append(record["data"])
+        self._flush(current_type, batch)
+        self._refresh_derived_data()
+        return self.created, self.updated
+
+    def _refresh_derived_data(self):
+        BlogCategory.objects.all().refresh_post_counts()
+        if search.get_backend() is not None:
+            search.rebuild_index()
+        bump_content_version(PORTFOLIO)
+        bump_content_version(BLOG)
+        purge_blog_pages(categories_changed=True)
+
+
+def import_content(source_dir, batch_size=1000):
+    """Imports an export directory. Returns ({type: created}, {type: updated})."""
+    return ContentImporter(source_dir, batch_size=batch_size).run()
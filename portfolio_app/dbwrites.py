@@ -0,0 +1,77 @@
+# portfolio_app/dbwrites.py
+#
+# Short, retried write transactions.
+#
+# SQLite has one writer at a time. In WAL mode (settings_production.py)
+# readers no longer wait for it, but concurrent writers still queue for the
+# write lock: each waits up to busy_timeout and then fails with "database is
+# locked". run_write() keeps that window small and survivable:
+#
+#   * func runs in its own transaction.atomic() block, so the lock is held
+#     for the statements of one logical write and no longer. With
+#     transaction_mode=IMMEDIATE the lock is taken at BEGIN, so a busy
+#     database fails the transaction before func has run rather than halfway
+#     through it
+#   * when the lock cannot be had within busy_timeout, the transaction is
+#     retried after an exponential, jittered backoff, up to
+#     settings.DB_WRITE_RETRIES times
+#
+# Inside an outer atomic block func simply runs in that transaction: a retry
+# could not redo the outer block's earlier statements, so the outermost
+# run_write() is the one that retries. Keep file I/O and other slow work out
+# of func where possible.
+
+import logging
+import random
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+BUSY_MESSAGES = ("database is locked", "database table is locked", "database is busy")
+
+
+def is_busy_error(error):
+    return isinstance(error, OperationalError) and any(
+        message in str(error).lower() for message in BUSY_MESSAGES
+    )
+
+
+def run_write(func, *args, **kwargs):
+    """Runs func(*args, **kwargs) in a short transaction, retrying while the database is busy."""
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return func(*args, **kwargs)
+    attempt = 0
+    while True:
+        try:
+            with transaction.atomic():
+                return func(*args, **kwargs)
+        except OperationalError as e:
+            if not is_busy_error(e) or attempt >= settings.DB_WRITE_RETRIES:
+                raise
+            delay = settings.DB_WRITE_RETRY_BACKOFF * 2**attempt * random.uniform(0.5, 1.5)
+            attempt += 1
+            logger.warning(
+                f"Database busy in {getattr(func, '__qualname__', func)}; "
+                f"retry {attempt}/{settings.DB_WRITE_RETRIES} in {delay * 1000:.0f} ms"
+            )
+            time.sleep(delay)
+
+
+async def arun_write(func, *args, **kwargs):
+    """run_write() for async views; func runs on the request's sync thread."""
+    return await sync_to_async(run_write)(func, *args, **kwargs)
+
+
+def write_transaction(func):
+    """Decorator form of run_write()."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return run_write(func, *args, **kwargs)
+
+    return wrapper
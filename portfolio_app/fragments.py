@@ -0,0 +1,116 @@
+# portfolio_app/fragments.py
+#
+# Template fragment cache for cards, the navbar and the footer.
+#
+#     {% load fragment_tags %}
+#     {% fragment_cache "blog_card" post post.category.slug %} ... {% endfragment_cache %}
+#
+# The key is built from the fragment name and the given values. A model
+# instance contributes (model, pk, updated_at), so a card is re-rendered only
+# after its object is saved; other values are used as they are. Every key
+# also carries settings.PAGE_CACHE_RELEASE, a hash of the template file the
+# tag sits in (so editing a template re-renders its fragments without a cache
+# flush) and the version of the FRAGMENT_MEDIA tag, bumped when image
+# renditions are added or removed, which changes card srcsets without
+# touching updated_at. With DEBUG on, fragments are not cached at all, so
+# edits to templates included inside a fragment show up too.
+#
+# Lookups go to a small in-process LRU first and then to the shared cache, so
+# a list page is assembled from memory once its cards are warm. Because the
+# keys change whenever the content does, nothing is ever deleted: stale keys
+# fall out of the LRU by size and out of the shared cache by timeout. LRU
+# entries also expire after FRAGMENT_CACHE_LOCAL_TIMEOUT, bounding how long a
+# worker could serve a fragment if the shared cache is flushed and the tag
+# versions start counting again from 1.
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+
+from .caching import get_tag_versions
+
+FRAGMENT_CACHE_KEY = "portfolio_app:fragment:{name}:{digest}"
+FRAGMENT_MEDIA = "fragment:media"
+FRAGMENT_TAGS = (FRAGMENT_MEDIA,)
+
+
+class LocalLRU:
+    """A thread-safe, size-bounded LRU of {key: value} with a per-entry lifetime."""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+local_fragments = LocalLRU(settings.FRAGMENT_CACHE_LOCAL_SIZE, settings.FRAGMENT_CACHE_LOCAL_TIMEOUT)
+
+
+def fragment_versions(request=None):
+    """The FRAGMENT_TAGS versions, fetched once per request when one is given."""
+    versions = getattr(request, "_fragment_versions", None)
+    if versions is None:
+        versions = get_tag_versions(FRAGMENT_TAGS)
+        if request is not None:
+            request._fragment_versions = versions
+    return versions
+
+
+def _key_part(value):
+    if isinstance(value, models.Model):
+        return (value._meta.label_lower, value.pk, getattr(value, "updated_at", None))
+    return value
+
+
+def fragment_key(name, vary_on, versions):
+    parts = (settings.PAGE_CACHE_RELEASE, sorted(versions.items()), [_key_part(v) for v in vary_on])
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return FRAGMENT_CACHE_KEY.format(name=name, digest=digest)
+
+
+def get_or_render(name, vary_on, render, request=None):
+    """Returns the cached HTML for the fragment, calling render() on a miss."""
+    if not settings.FRAGMENT_CACHE_ENABLED or settings.DEBUG:
+        return render()
+    key = fragment_key(name, vary_on, fragment_versions(request))
+    html = local_fragments.get(key)
+    if html is not None:
+        return html
+    html = cache.get(key)
+    if html is None:
+        html = render()
+        cache.set(key, html, timeout=settings.FRAGMENT_CACHE_TIMEOUT)
+    local_fragments.set(key, html)
+    return html
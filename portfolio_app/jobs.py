@@ -0,0 +1,148 @@
+# portfolio_app/jobs.py
+#
+# In-process background jobs for staff gallery uploads.
+#
+# Staff upload views only check the extension, stage each file on disk and
+# create a GalleryUploadJob row. Pillow verification, PortfolioImage creation
+# and rendition generation then run on a small thread pool, and the staff page
+# polls staff_portfolio_upload_status for progress. Job state lives in the DB,
+# so jobs interrupted by a restart can be picked up again with
+# `manage.py process_upload_jobs`.
+#
+# The pool also runs small follow-up writes that public read paths must not
+# do themselves, such as recounting a blog category once a scheduled post in
+# it has gone live (BlogCategoryQuerySet.for_sidebar) or storing the rendered
+# body of a post saved before it was rendered on save (BlogPost.ensure_rendered).
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+
+try:
+    from PIL import Image as PillowImage
+except ImportError:
+    PillowImage = None
+
+from .dbwrites import run_write
+from .models import BlogCategory, BlogPost, GalleryUploadJob, PortfolioImage
+from .pagecache import purge_blog_pages
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_JOB_WORKERS,
+                thread_name_prefix="portfolio-jobs",
+            )
+    return _executor
+
+
+def _run_job(func, *args):
+    # Worker threads get their own DB connections; drop stale ones around each job.
+    close_old_connections()
+    try:
+        func(*args)
+    except Exception:
+        logger.exception(f"Background job {func.__name__}{args} failed")
+    finally:
+        close_old_connections()
+
+
+def submit(func, *args):
+    """Runs func(*args) on the pool, or inline when BACKGROUND_JOBS_ASYNC is off."""
+    if not settings.BACKGROUND_JOBS_ASYNC:
+        func(*args)
+        return
+    get_executor().submit(_run_job, func, *args)
+
+
+def refresh_category_counts(category_ids):
+    """Recounts the categories' live posts and purges the cached blog pages listing them."""
+    categories = BlogCategory.objects.filter(pk__in=category_ids)
+    run_write(categories.refresh_post_counts)
+    purge_blog_pages(
+        category_slugs=categories.values_list("slug", flat=True), categories_changed=True
+    )
+
+
+def render_stored_posts(post_ids):
+    """Stores the rendered body columns of posts that still lack them."""
+    for post in BlogPost.objects.filter(pk__in=post_ids, rendered_content="").exclude(content=""):
+        post.render_content()
+        if post.rendered_content:
+            # A regular save, so the search index, related posts and cached pages follow.
+            run_write(post.save, update_fields=BlogPost.RENDERED_FIELDS)
+
+
+def has_allowed_extension(uploaded_file):
+    return os.path.splitext(uploaded_file.name)[1].lower() in ALLOWED_IMAGE_EXTENSIONS
+
+
+def queue_gallery_uploads(project, uploaded_files):
+    """
+    Stages uploaded files on disk and schedules their processing once the
+    current transaction commits. Returns the created GalleryUploadJob rows.
+    """
+    jobs = []
+    for uploaded_file in uploaded_files:
+        job = GalleryUploadJob(
+            portfolio_project=project,
+            original_name=os.path.basename(uploaded_file.name),
+        )
+        job.staged_file.save(uploaded_file.name, uploaded_file, save=False)
+        job.save()
+        jobs.append(job)
+    if jobs:
+        job_ids = [job.pk for job in jobs]
+        transaction.on_commit(
+            lambda: [submit(process_gallery_upload, job_id) for job_id in job_ids]
+        )
+    return jobs
+
+
+def process_gallery_upload(job_id):
+    """Verifies a staged upload and attaches it to its project as a PortfolioImage."""
+    # Claim the job atomically so a resumed run never processes it twice.
+    claimed = run_write(
+        GalleryUploadJob.objects.filter(pk=job_id, status="PENDING").update,
+        status="PROCESSING",
+    )
+    if not claimed:
+        return
+    job = GalleryUploadJob.objects.select_related("portfolio_project").get(pk=job_id)
+    try:
+        if PillowImage:
+            with job.staged_file.open("rb") as staged:
+                PillowImage.open(staged).verify()  # Check if it's a valid image
+        with job.staged_file.open("rb") as staged:
+            image = PortfolioImage(
+                portfolio_project=job.portfolio_project, caption="", order=0
+            )
+            image.image.save(job.original_name, File(staged), save=False)
+            image.save()  # post_save generates the renditions
+        job.portfolio_image = image
+        job.status = "DONE"
+    except Exception as e:
+        logger.error(f"Could not process gallery upload {job.original_name}: {e}")
+        job.status = "FAILED"
+        job.error = f"File {job.original_name} could not be verified as a valid image."
+    try:
+        job.staged_file.delete(save=False)
+    except OSError as e:
+        logger.warning(f"Could not delete staged upload for job {job.pk}: {e}")
+    run_write(job.save)
+
@@ -0,0 +1,33 @@
+# portfolio_app/management/commands/check_query_plans.py
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio_app.queryplans import check_query_plans
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN QUERY PLAN on every SELECT the public pages, APIs and "
+        "staff lists make, and fails if any scans a whole table or sorts in a "
+        "temp B-tree. Run it against realistic data (`manage.py seed_benchmark_data`)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--skip-staff", action="store_true", help="Only public pages and APIs.")
+        parser.add_argument("--show-plans", action="store_true", help="Print every plan, not only the bad ones.")
+
+    def handle(self, *args, **options):
+        results = check_query_plans(include_staff=not options["skip_staff"])
+        failures = [result for result in results if result["problems"]]
+        for result in results:
+            if not result["problems"] and not options["show_plans"]:
+                continue
+            style = self.style.ERROR if result["problems"] else self.style.SUCCESS
+            self.stdout.write(style(f"{result['endpoint']}: {', '.join(result['problems']) or 'ok'}"))
+            self.stdout.write(f"  {result['sql']}")
+            for step in result["plan"]:
+                self.stdout.write(f"    {step}")
+        if failures:
+            raise CommandError(
+                f"{len(failures)} of {len(results)} statements scan a table or sort in a temp B-tree."
+            )
+        self.stdout.write(self.style.SUCCESS(f"All {len(results)} statements use indexes."))
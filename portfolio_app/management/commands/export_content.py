@@ -0,0 +1,28 @@
+# portfolio_app/management/commands/export_content.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.content_io import export_content
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams portfolio categories, projects, gallery images, blog categories "
+        "and posts to <output_dir>/content.jsonl, copying referenced images to "
+        "<output_dir>/media/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output_dir", help="Directory to write the export into.")
+        parser.add_argument(
+            "--no-media",
+            action="store_true",
+            help="Only write content.jsonl; do not copy image files.",
+        )
+
+    def handle(self, *args, **options):
+        counts = export_content(options["output_dir"], include_media=not options["no_media"])
+        for record_type, count in counts.items():
+            self.stdout.write(f"{record_type}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Exported {sum(counts.values())} record(s) to {options['output_dir']}.")
+        )
@@ -0,0 +1,47 @@
+# portfolio_app/management/commands/export_static_site.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.compression import available_encodings
+from portfolio_app.static_export import export_site
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the public pages and portfolio JSON APIs into a static tree "
+        "(with .gz/.br siblings and manifest.json) for nginx. Only pages whose "
+        "content changed since the last export are re-rendered."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output_dir", help="Directory to write the site into.")
+        parser.add_argument(
+            "--base-url",
+            default="http://localhost",
+            help="Public origin, e.g. https://tonythecoder.com (used for absolute URLs).",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Re-render every page, ignoring the manifest.",
+        )
+
+    def handle(self, *args, **options):
+        if "br" not in available_encodings():
+            self.stderr.write(
+                self.style.WARNING("brotli is not installed; only .gz siblings will be written.")
+            )
+        summary = export_site(
+            options["output_dir"], base_url=options["base_url"], full=options["full"]
+        )
+        for path in summary["rendered"]:
+            self.stdout.write(f"rendered {path}")
+        for path in summary["removed"]:
+            self.stdout.write(f"removed  {path}")
+        for path in summary["failed"]:
+            self.stderr.write(self.style.ERROR(f"failed   {path}"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(summary['rendered'])} rendered, {len(summary['skipped'])} unchanged, "
+                f"{len(summary['removed'])} removed, {len(summary['failed'])} failed."
+            )
+        )
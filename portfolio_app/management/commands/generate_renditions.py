@@ -0,0 +1,70 @@
+# portfolio_app/management/commands/generate_renditions.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.models import BlogPost, ImageRendition, PortfolioImage, PortfolioProject
+from portfolio_app.renditions import PillowImage, delete_renditions, generate_renditions
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills responsive WebP/JPEG renditions for gallery images and "
+        "project/blog featured images."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Delete and rebuild renditions that already exist.",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete renditions whose original image is no longer referenced.",
+        )
+
+    def _source_images(self):
+        for image in PortfolioImage.objects.exclude(image="").only("image").iterator():
+            yield image.image
+        for model in (PortfolioProject, BlogPost):
+            queryset = (
+                model.objects.exclude(featured_image="")
+                .exclude(featured_image__isnull=True)
+                .only("featured_image")
+            )
+            for obj in queryset.iterator():
+                yield obj.featured_image
+
+    def handle(self, *args, **options):
+        if PillowImage is None:
+            self.stderr.write(self.style.ERROR("Pillow is not installed."))
+            return
+
+        referenced = set()
+        processed = 0
+        for field_file in self._source_images():
+            referenced.add(field_file.name)
+            if not field_file.storage.exists(field_file.name):
+                self.stderr.write(self.style.WARNING(f"Missing file: {field_file.name}"))
+                continue
+            renditions = generate_renditions(field_file, force=options["force"])
+            processed += 1
+            self.stdout.write(f"{field_file.name}: {len(renditions)} rendition(s)")
+
+        pruned = 0
+        if options["prune"]:
+            source_names = (
+                ImageRendition.objects.values_list("source_name", flat=True)
+                .order_by("source_name")
+                .distinct()
+            )
+            for source_name in list(source_names):
+                if source_name not in referenced:
+                    delete_renditions(source_name)
+                    pruned += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {processed} image(s); pruned renditions for {pruned} missing source(s)."
+            )
+        )
@@ -0,0 +1,33 @@
+# portfolio_app/management/commands/import_content.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.content_io import import_content
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports a directory written by export_content. Records are upserted by "
+        "slug in batches, so running the same import twice is safe."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source_dir", help="Directory containing content.jsonl (and media/).")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Records per bulk_create/bulk_update batch (default 1000).",
+        )
+
+    def handle(self, *args, **options):
+        created, updated = import_content(options["source_dir"], batch_size=options["batch_size"])
+        for record_type in sorted(set(created) | set(updated)):
+            self.stdout.write(
+                f"{record_type}: {created.get(record_type, 0)} created, {updated.get(record_type, 0)} updated"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Import finished. Run `generate_renditions` for image renditions and "
+                "`rebuild_related_posts` for related posts."
+            )
+        )
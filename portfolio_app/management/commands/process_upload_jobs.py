@@ -0,0 +1,36 @@
+# portfolio_app/management/commands/process_upload_jobs.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.jobs import process_gallery_upload
+from portfolio_app.models import GalleryUploadJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Processes gallery upload jobs left pending, e.g. after a worker restart "
+        "interrupted the background queue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset-stuck",
+            action="store_true",
+            help="Also retry jobs stuck in PROCESSING (only safe when no workers are running).",
+        )
+
+    def handle(self, *args, **options):
+        if options["reset_stuck"]:
+            reset = GalleryUploadJob.objects.filter(status="PROCESSING").update(
+                status="PENDING"
+            )
+            self.stdout.write(f"Reset {reset} stuck job(s) to PENDING.")
+
+        job_ids = list(
+            GalleryUploadJob.objects.filter(status="PENDING").values_list("pk", flat=True)
+        )
+        for job_id in job_ids:
+            process_gallery_upload(job_id)
+        failed = GalleryUploadJob.objects.filter(pk__in=job_ids, status="FAILED").count()
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {len(job_ids)} job(s); {failed} failed.")
+        )
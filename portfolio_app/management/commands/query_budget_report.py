@@ -0,0 +1,66 @@
+# portfolio_app/management/commands/query_budget_report.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.querybudget import load_stats, reset_stats
+
+SORT_KEYS = {
+    "violations": lambda entry: (entry["violations"], entry["max_queries"]),
+    "queries": lambda entry: (entry["max_queries"], entry["queries"] / entry["requests"]),
+    "db-time": lambda entry: (entry["db_time"] / entry["requests"], entry["max_db_time"]),
+    "duplicates": lambda entry: max(entry["duplicates"].values(), default=0),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Lists the endpoints with the most query-budget violations, queries, "
+        "database time or repeated statements, as recorded by "
+        "QueryBudgetMiddleware in the shared cache for the requests sampled "
+        "at QUERY_BUDGET_STATS_SAMPLE_RATE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sort",
+            choices=sorted(SORT_KEYS),
+            default="violations",
+            help="What makes an endpoint worse (default: violations).",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=10, help="Number of endpoints to show."
+        )
+        parser.add_argument(
+            "--reset", action="store_true", help="Clear the recorded stats afterwards."
+        )
+
+    def handle(self, *args, **options):
+        stats = load_stats()
+        if not stats:
+            self.stdout.write("No requests recorded yet.")
+            return
+
+        ranked = sorted(
+            stats.items(), key=lambda item: SORT_KEYS[options["sort"]](item[1]), reverse=True
+        )[: options["limit"]]
+        self.stdout.write(
+            f"{'endpoint':<50} {'reqs':>6} {'avg q':>6} {'max q':>6} {'budget':>6} "
+            f"{'over':>5} {'avg ms':>8} {'max ms':>8}"
+        )
+        for endpoint, entry in ranked:
+            budget = "-" if entry["budget"] is None else entry["budget"]
+            line = (
+                f"{endpoint[:50]:<50} {entry['requests']:>6} "
+                f"{entry['queries'] / entry['requests']:>6.1f} {entry['max_queries']:>6} "
+                f"{budget:>6} {entry['violations']:>5} "
+                f"{entry['db_time'] / entry['requests'] * 1000:>8.1f} "
+                f"{entry['max_db_time'] * 1000:>8.1f}"
+            )
+            self.stdout.write(self.style.ERROR(line) if entry["violations"] else line)
+            for sql, count in entry["duplicates"].items():
+                self.stdout.write(f"    {count:>4}x {sql}")
+
+        if options["reset"]:
+            reset_stats()
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(stats)} endpoint(s) recorded, {len(ranked)} shown.")
+        )
@@ -0,0 +1,15 @@
+# portfolio_app/management/commands/rebuild_related_posts.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.related import rebuild_related_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the precomputed related-post lists (TF-IDF similarity) for "
+        "every published blog post."
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_related_posts()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt related posts for {count} post(s)."))
@@ -0,0 +1,19 @@
+# portfolio_app/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.search import get_backend, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index for blog posts and coding projects."
+
+    def handle(self, *args, **options):
+        if get_backend() is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "This database has no full-text backend; search uses icontains queries."
+                )
+            )
+            return
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} document(s)."))
@@ -0,0 +1,33 @@
+# portfolio_app/management/commands/reconcile_category_counts.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.models import BlogCategory
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts live blog posts for every category and fixes the stored "
+        "live_post_count / next_post_live_at counters that drifted (e.g. after "
+        "raw SQL or queryset.update() writes)."
+    )
+
+    def handle(self, *args, **options):
+        before = dict(
+            BlogCategory.objects.values_list("pk", "live_post_count")
+        )
+        BlogCategory.objects.all().refresh_post_counts()
+
+        drifted = 0
+        for category in BlogCategory.objects.order_by("name"):
+            old_count = before.get(category.pk, 0)
+            if old_count != category.live_post_count:
+                drifted += 1
+                self.stdout.write(
+                    f"{category.name}: {old_count} -> {category.live_post_count}"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {len(before)} category counter(s); {drifted} had drifted."
+            )
+        )
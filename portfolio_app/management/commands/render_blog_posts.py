@@ -0,0 +1,21 @@
+# portfolio_app/management/commands/render_blog_posts.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.dbwrites import run_write
+from portfolio_app.models import BlogPost
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the stored body HTML, plain text, meta description, word "
+        "count, reading time and table of contents for every blog post."
+    )
+
+    def handle(self, *args, **options):
+        rendered = 0
+        for post in BlogPost.objects.iterator():
+            post.render_content()
+            # A regular save, so the search index, related posts and cached pages follow.
+            run_write(post.save, update_fields=BlogPost.RENDERED_FIELDS)
+            rendered += 1
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} blog post(s)."))
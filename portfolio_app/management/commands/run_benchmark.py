@@ -0,0 +1,52 @@
+# portfolio_app/management/commands/run_benchmark.py
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from portfolio_app.benchmark import run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests the public pages, portfolio APIs and staff list pages through "
+        "a local threaded WSGI server and writes p50/p95/p99 latency, throughput "
+        "and queries per request to a JSON report. Seed data first with "
+        "`manage.py seed_benchmark_data`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="benchmark-results.json", help="JSON report path.")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients.")
+        parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per endpoint first.")
+        parser.add_argument(
+            "--no-page-cache",
+            action="store_true",
+            help="Disable the anonymous page cache to measure full renders.",
+        )
+        parser.add_argument("--skip-staff", action="store_true", help="Only public pages and APIs.")
+        parser.add_argument("--label", default="", help="Free-form label stored in the report, e.g. a commit.")
+
+    def handle(self, *args, **options):
+        report = run_benchmark(
+            requests_per_endpoint=options["requests"],
+            concurrency=options["concurrency"],
+            warmup=options["warmup"],
+            page_cache=not options["no_page_cache"],
+            include_staff=not options["skip_staff"],
+            label=options["label"],
+        )
+        self.stdout.write(f"{'endpoint':<36} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'q/req':>6} {'err':>5}")
+        for name, result in report["endpoints"].items():
+            latency = result["latency_ms"]
+            line = (
+                f"{name:<36} {result['throughput_rps'] or 0:>8.1f} {latency['p50'] or 0:>8.1f} "
+                f"{latency['p95'] or 0:>8.1f} {latency['p99'] or 0:>8.1f} "
+                f"{result['queries_per_request']['mean'] or 0:>6.1f} {result['errors']:>5}"
+            )
+            self.stdout.write(self.style.ERROR(line) if result["errors"] else line)
+
+        output = Path(options["output"])
+        output.write_text(json.dumps(report, indent=2, sort_keys=True))
+        self.stdout.write(self.style.SUCCESS(f"Report written to {output}."))
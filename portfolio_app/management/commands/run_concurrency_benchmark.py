@@ -0,0 +1,64 @@
+# portfolio_app/management/commands/run_concurrency_benchmark.py
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from portfolio_app.benchmark import run_concurrency_benchmark
+
+
+def _levels(value):
+    return [int(level) for level in value.split(",") if level.strip()]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives the async portfolio API endpoints with rising numbers of "
+        "concurrent slow clients, through the WSGI application on a fixed "
+        "thread pool and through the ASGI application, and writes throughput, "
+        "latency and thread use per level to a JSON report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="concurrency-results.json", help="JSON report path.")
+        parser.add_argument(
+            "--levels", type=_levels, default=[1, 10, 50, 200], help="Comma-separated client counts."
+        )
+        parser.add_argument("--requests", type=int, default=400, help="Measured requests per level.")
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=200,
+            help="Milliseconds each client takes to read a response.",
+        )
+        parser.add_argument("--wsgi-threads", type=int, default=8, help="WSGI worker threads.")
+        parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per level first.")
+        parser.add_argument(
+            "--server", choices=["wsgi", "asgi"], action="append", help="Only this server (repeatable)."
+        )
+        parser.add_argument("--label", default="", help="Free-form label stored in the report, e.g. a commit.")
+
+    def handle(self, *args, **options):
+        report = run_concurrency_benchmark(
+            levels=options["levels"],
+            requests_per_level=options["requests"],
+            client_delay=options["client_delay"] / 1000,
+            wsgi_threads=options["wsgi_threads"],
+            warmup=options["warmup"],
+            servers=options["server"] or ("wsgi", "asgi"),
+            label=options["label"],
+        )
+        self.stdout.write(f"{'server':<6} {'clients':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'threads':>7} {'err':>5}")
+        for server, levels in report["servers"].items():
+            for level, result in levels.items():
+                latency = result["latency_ms"]
+                line = (
+                    f"{server:<6} {level:>7} {result['throughput_rps'] or 0:>8.1f} {latency['p50'] or 0:>8.1f} "
+                    f"{latency['p95'] or 0:>8.1f} {latency['p99'] or 0:>8.1f} "
+                    f"{result['peak_extra_threads']:>7} {result['errors']:>5}"
+                )
+                self.stdout.write(self.style.ERROR(line) if result["errors"] else line)
+
+        output = Path(options["output"])
+        output.write_text(json.dumps(report, indent=2, sort_keys=True))
+        self.stdout.write(self.style.SUCCESS(f"Report written to {output}."))
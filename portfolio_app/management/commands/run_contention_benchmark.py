@@ -0,0 +1,54 @@
+# portfolio_app/management/commands/run_contention_benchmark.py
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from portfolio_app.benchmark import run_contention_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures database read throughput and latency with no writes and then "
+        "alongside concurrent writers, and writes a JSON report that includes "
+        "the SQLite pragmas in effect. Compare runs with --settings "
+        "TonyTheCoderPortfolio.settings and TonyTheCoderPortfolio.settings_production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="contention-results.json", help="JSON report path.")
+        parser.add_argument("--readers", type=int, default=4, help="Reader threads.")
+        parser.add_argument("--writers", type=int, default=2, help="Writer threads.")
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per phase.")
+        parser.add_argument(
+            "--write-interval", type=float, default=0, help="Milliseconds each writer pauses between writes."
+        )
+        parser.add_argument("--label", default="", help="Free-form label stored in the report, e.g. a commit.")
+
+    def handle(self, *args, **options):
+        report = run_contention_benchmark(
+            readers=options["readers"],
+            writers=options["writers"],
+            duration=options["duration"],
+            write_interval=options["write_interval"] / 1000,
+            label=options["label"],
+        )
+        database = report["database"]
+        self.stdout.write(
+            "Database: "
+            + ", ".join(f"{key}={value}" for key, value in database.items() if key != "vendor")
+        )
+        self.stdout.write(f"{'phase':<18} {'op':<7} {'per s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5}")
+        for phase in ("reads_only", "reads_with_writes"):
+            for op, result in report[phase].items():
+                latency = result["latency_ms"]
+                line = (
+                    f"{phase:<18} {op:<7} {result['per_second'] or 0:>9.1f} {latency['p50'] or 0:>8.2f} "
+                    f"{latency['p95'] or 0:>8.2f} {latency['p99'] or 0:>8.2f} {result['errors']:>5}"
+                )
+                self.stdout.write(self.style.ERROR(line) if result["errors"] else line)
+        self.stdout.write(f"Read throughput retained under writes: {report['read_throughput_retained']:.0%}")
+
+        output = Path(options["output"])
+        output.write_text(json.dumps(report, indent=2, sort_keys=True))
+        self.stdout.write(self.style.SUCCESS(f"Report written to {output}."))
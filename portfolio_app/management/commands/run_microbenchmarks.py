@@ -0,0 +1,86 @@
+# portfolio_app/management/commands/run_microbenchmarks.py
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio_app.microbench import (
+    BENCHMARKS,
+    DEFAULT_ROUNDS,
+    DEFAULT_THRESHOLD,
+    compare,
+    environment,
+    load_baseline,
+    run_microbenchmarks,
+    save_baseline,
+)
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "microbench_baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the per-row/per-request helpers (API payload, slugs, upload paths, "
+        "Pillow verify, template filters, blog card rendering), records peak "
+        "memory and allocated blocks, and fails if any metric regressed past "
+        "the threshold against the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help=f"Benchmarks to run (default: all). One of: {', '.join(BENCHMARKS)}")
+        parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help="Allowed relative slowdown/growth per metric, e.g. 0.2 for 20%%.",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Store this run as the new baseline instead of comparing.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            results = run_microbenchmarks(options["names"], rounds=options["rounds"])
+        except KeyError as e:
+            raise CommandError(e.args[0])
+
+        baseline_path = Path(options["baseline"])
+        baseline = None if options["save_baseline"] else load_baseline(baseline_path)
+        recorded = (baseline or {}).get("benchmarks", {})
+        self.stdout.write(f"{'benchmark':<30} {'median':>12} {'baseline':>12} {'peak KiB':>10} {'blocks':>8}")
+        for name, metrics in results.items():
+            old = recorded.get(name, {}).get("ns_median")
+            self.stdout.write(
+                f"{name:<30} {metrics['ns_median'] / 1000:>10.1f}us "
+                f"{(f'{old / 1000:.1f}us' if old else '-'):>12} "
+                f"{metrics['peak_kib']:>10.1f} {metrics['allocated_blocks']:>8}"
+            )
+
+        if options["save_baseline"]:
+            if options["names"] and (existing := load_baseline(baseline_path)):
+                results = {**existing.get("benchmarks", {}), **results}
+            save_baseline(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline_path}."))
+            return
+        if baseline is None:
+            self.stdout.write(
+                self.style.WARNING(f"No baseline at {baseline_path}; run with --save-baseline to record one.")
+            )
+            return
+        if baseline.get("environment") != environment():
+            self.stdout.write(
+                self.style.WARNING("Baseline was recorded on a different Python/platform; timings may not compare.")
+            )
+
+        regressions = compare(results, baseline, options["threshold"])
+        for name, metric, old, new in regressions:
+            self.stderr.write(self.style.ERROR(f"{name}: {metric} {old} -> {new}"))
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} metric(s) regressed by more than {options['threshold']:.0%}."
+            )
+        self.stdout.write(self.style.SUCCESS(f"No regressions beyond {options['threshold']:.0%}."))
@@ -0,0 +1,49 @@
+# portfolio_app/management/commands/seed_benchmark_data.py
+from django.core.management.base import BaseCommand
+
+from portfolio_app.benchmark import clear_benchmark_data, seed_benchmark_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates (or updates in place) a reproducible synthetic dataset for load "
+        "testing: categories, projects with generated PNG gallery images, blog "
+        "posts and contact inquiries. Use --clear to remove it again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=8, help="Portfolio and blog categories each.")
+        parser.add_argument("--projects", type=int, default=200)
+        parser.add_argument("--images-per-project", type=int, default=3)
+        parser.add_argument("--posts", type=int, default=2000)
+        parser.add_argument("--inquiries", type=int, default=500)
+        parser.add_argument("--seed", type=int, default=1, help="Random seed; same seed, same data.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--skip-related",
+            action="store_true",
+            help="Do not rebuild related posts (slow for very large post counts).",
+        )
+        parser.add_argument("--clear", action="store_true", help="Delete the seeded data instead.")
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            deleted = clear_benchmark_data()
+            for model, count in deleted.items():
+                self.stdout.write(f"{model}: {count} deleted")
+            self.stdout.write(self.style.SUCCESS("Benchmark data cleared."))
+            return
+
+        counts = seed_benchmark_data(
+            categories=options["categories"],
+            projects=options["projects"],
+            images_per_project=options["images_per_project"],
+            posts=options["posts"],
+            inquiries=options["inquiries"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            related=not options["skip_related"],
+        )
+        for model, count in counts.items():
+            self.stdout.write(f"{model}: {count} row(s) in the database")
+        self.stdout.write(self.style.SUCCESS("Benchmark data seeded."))
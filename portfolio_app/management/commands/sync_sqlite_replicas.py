@@ -0,0 +1,38 @@
+# portfolio_app/management/commands/sync_sqlite_replicas.py
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies the primary SQLite database into each SQLite replica listed in "
+        "DATABASE_REPLICAS (see DJANGO_SQLITE_REPLICAS), standing in for "
+        "replication when trying out read replicas locally."
+    )
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES[DEFAULT_DB_ALIAS]
+        replicas = [
+            alias
+            for alias in settings.DATABASE_REPLICAS
+            if settings.DATABASES[alias]["ENGINE"] == "django.db.backends.sqlite3"
+        ]
+        if primary["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("The primary database is not SQLite.")
+        if not replicas:
+            raise CommandError("No SQLite replicas configured; set DJANGO_SQLITE_REPLICAS.")
+        source = sqlite3.connect(primary["NAME"])
+        try:
+            for alias in replicas:
+                target = sqlite3.connect(settings.DATABASES[alias]["NAME"])
+                try:
+                    source.backup(target)  # A consistent snapshot, even while the site writes
+                finally:
+                    target.close()
+                self.stdout.write(f"{alias}: copied from {primary['NAME']}")
+        finally:
+            source.close()
+        self.stdout.write(self.style.SUCCESS(f"Synced {len(replicas)} replica(s)."))
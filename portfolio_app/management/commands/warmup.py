@@ -0,0 +1,25 @@
+# portfolio_app/management/commands/warmup.py
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio_app.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports every view, fills the URL resolver and compiles every project "
+        "and app template, so a fresh worker's first request runs warm. Fails "
+        "when a template does not compile."
+    )
+
+    def handle(self, *args, **options):
+        summary = warm_up()
+        for name, error in summary["template_errors"].items():
+            self.stderr.write(self.style.ERROR(f"{name}: {error}"))
+        if summary["template_errors"]:
+            raise CommandError(f"{len(summary['template_errors'])} template(s) failed to compile.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed up in {summary['seconds']}s: {summary['urls']} URL patterns, "
+                f"{summary['templates']} templates."
+            )
+        )
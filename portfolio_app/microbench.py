@@ -0,0 +1,254 @@
+# portfolio_app/microbench.py
+#
+# Microbenchmarks for the code that runs per row or per request.
+#
+# Each benchmark is a setup function registered with @microbenchmark that
+# builds its inputs in memory (unsaved model instances, generated images) and
+# returns the operation to measure. measure() then reports:
+#
+#     ns_median / ns_min  time per operation over several timed rounds, each
+#                         round long enough (>= MIN_ROUND_SECONDS) to swamp
+#                         timer overhead, after one warm-up call
+#     peak_kib            peak traced memory above the starting point during
+#                         one call (tracemalloc)
+#     allocated_blocks    memory blocks allocated by one call that are still
+#                         alive when it returns, i.e. the result it builds
+#
+# `manage.py run_microbenchmarks` compares a run against a stored baseline
+# file and fails when any metric got worse by more than the threshold;
+# --save-baseline records a new one. Baselines are machine-specific: record
+# them on the machine (or CI runner class) that will compare against them.
+#
+# Only allocate_slugs touches the database (its one SELECT per batch is part
+# of what is being measured); everything else runs without I/O.
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.template import engines
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from PIL import Image as PillowImage
+
+from .models import (
+    BlogCategory,
+    BlogPost,
+    PortfolioCategory,
+    PortfolioImage,
+    PortfolioProject,
+    get_portfolio_image_upload_path,
+)
+from .slugs import allocate_slugs
+from .templatetags.auth_extras import has_group
+from .templatetags.math_filters import mult
+from .templatetags.template_extras import get_item
+from .views import portfolio_project_payload
+
+MIN_ROUND_SECONDS = 0.05
+DEFAULT_ROUNDS = 5
+DEFAULT_THRESHOLD = 0.2
+METRICS = ("ns_median", "peak_kib", "allocated_blocks")
+
+BENCHMARKS = {}
+
+
+def microbenchmark(name, **settings_overrides):
+    """Registers a setup function; settings_overrides apply while it is measured."""
+
+    def register(setup):
+        BENCHMARKS[name] = (setup, settings_overrides)
+        return setup
+
+    return register
+
+
+# --- Benchmarks ---
+@microbenchmark("api_project_payload_x50")
+def _api_project_payload():
+    request = RequestFactory().get("/api/portfolio-projects/")
+    categories = [
+        PortfolioCategory(pk=i, name=f"Category {i}", slug=f"category-{i}") for i in range(1, 4)
+    ]
+    projects, renditions_by_name = [], {}
+    for i in range(1, 51):
+        project = PortfolioProject(
+            pk=i, title=f"Project {i}", slug=f"project-{i}", short_description="Short " * 10,
+            details="<p>Details</p>" * 20, technologies_used="Python, Django, React",
+            github_url="https://github.com/example/project", year_completed=2024, status="COMPLETED",
+        )
+        project.featured_image.name = f"portfolio_featured/project-{i}.png"
+        project._prefetched_objects_cache = {"categories": categories}
+        renditions_by_name[project.featured_image.name] = {
+            "source_width": 1600,
+            "WEBP": [(w, f"/media/renditions/project-{i}-{w}w.webp") for w in (480, 960)],
+            "JPEG": [(w, f"/media/renditions/project-{i}-{w}w.jpg") for w in (480, 960)],
+        }
+        projects.append(project)
+    return lambda: [
+        portfolio_project_payload(request, p, p.featured_image, renditions_by_name) for p in projects
+    ]
+
+
+@microbenchmark("allocate_slugs_x100")
+def _allocate_slugs():
+    titles = [f"Weekly notes on Django performance {i % 10}" for i in range(100)]
+    return lambda: allocate_slugs([BlogPost(title=title) for title in titles], "title")
+
+
+@microbenchmark("image_upload_path")
+def _image_upload_path():
+    image = PortfolioImage(portfolio_project=PortfolioProject(title="Project", slug="project"))
+    return lambda: get_portfolio_image_upload_path(image, "uploads/tmp/Screenshot 2024-05-01.png")
+
+
+@microbenchmark("pillow_verify_1600x1000")
+def _pillow_verify():
+    buffer = BytesIO()
+    PillowImage.effect_noise((1600, 1000), 64).convert("RGB").save(buffer, format="PNG")
+    data = buffer.getvalue()
+    # The same call process_gallery_upload() makes on every staged upload.
+    return lambda: PillowImage.open(BytesIO(data)).verify()
+
+
+@microbenchmark("filter_mult")
+def _filter_mult():
+    return lambda: mult("12", 3)
+
+
+@microbenchmark("filter_get_item")
+def _filter_get_item():
+    mapping = {f"key-{i}": i for i in range(50)}
+    return lambda: get_item(mapping, "key-25")
+
+
+@microbenchmark("filter_has_group")
+def _filter_has_group():
+    # Group names are loaded once per request; this is the cost of every later check.
+    user = get_user_model()(pk=1, username="staff")
+    user._group_names = {"OfficeStaff", "Editors"}
+    anonymous = AnonymousUser()
+    return lambda: (has_group(user, "OfficeStaff"), has_group(anonymous, "OfficeStaff"))
+
+
+# The card template sits inside {% fragment_cache %}; after the warm-up call a
+# cached run would time only LRU hits, so the rendering cost is measured with
+# the fragment cache off and the hit path separately.
+@microbenchmark("render_blog_post_card_x100_cached", FRAGMENT_CACHE_ENABLED=True, DEBUG=False)
+@microbenchmark("render_blog_post_card_x100", FRAGMENT_CACHE_ENABLED=False)
+def _render_blog_post_cards():
+    template = engines["django"].from_string(
+        "{% for post in posts %}{% include 'partials/_blog_post_card.html' %}{% endfor %}"
+    )
+    author = get_user_model()(pk=1, username="tony", first_name="Tony", last_name="Coder")
+    category = BlogCategory(pk=1, name="Django", slug="django")
+    now = timezone.now()
+    posts = [
+        BlogPost(
+            pk=i, title=f"Making Django views faster, part {i}", slug=f"making-django-views-faster-{i}",
+            meta_description="A look at query counts, caching and template rendering " * 3,
+            published_date=now - timedelta(days=i), category=category, author=author,
+        )
+        for i in range(1, 101)
+    ]
+    return lambda: template.render({"posts": posts})
+
+
+# --- Measurement ---
+def _time(operation, number):
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        operation()
+    return time.perf_counter_ns() - start
+
+
+def _memory(operation):
+    """(peak bytes, blocks kept alive) for one call, including tracemalloc's own noise."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start_memory = tracemalloc.get_traced_memory()[0]
+        before = tracemalloc.take_snapshot()
+        result = operation()
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    blocks = sum(stat.count for stat in after.statistics("filename")) - sum(
+        stat.count for stat in before.statistics("filename")
+    )
+    return peak - start_memory, blocks
+
+
+def measure(operation, rounds=DEFAULT_ROUNDS):
+    operation()  # Warm up: template compilation, lazy imports, caches
+    number = 1
+    while (elapsed := _time(operation, number)) < MIN_ROUND_SECONDS * 1e9:
+        number *= 2
+    per_op = [elapsed / number] + [_time(operation, number) / number for _ in range(rounds - 1)]
+
+    noise_peak, noise_blocks = _memory(lambda: None)
+    peak, blocks = _memory(operation)
+    return {
+        "ns_median": round(statistics.median(per_op)),
+        "ns_min": round(min(per_op)),
+        "loops_per_round": number,
+        "peak_kib": round(max(peak - noise_peak, 0) / 1024, 1),
+        "allocated_blocks": max(blocks - noise_blocks, 0),
+    }
+
+
+def run_microbenchmarks(names=None, rounds=DEFAULT_ROUNDS):
+    """Returns {name: metrics} for the selected (default: all) benchmarks."""
+    unknown = set(names or ()) - set(BENCHMARKS)
+    if unknown:
+        raise KeyError(f"Unknown microbenchmark(s): {', '.join(sorted(unknown))}")
+    results = {}
+    for name in names or BENCHMARKS:
+        setup, settings_overrides = BENCHMARKS[name]
+        with override_settings(**settings_overrides):
+            results[name] = measure(setup(), rounds)
+    return results
+
+
+def environment():
+    return {"python": sys.version.split()[0], "platform": platform.platform(), "machine": platform.machine()}
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"environment": environment(), "benchmarks": results}, indent=2, sort_keys=True)
+    )
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """[(name, metric, baseline value, current value)] for every metric over the threshold."""
+    regressions = []
+    for name, metrics in results.items():
+        recorded = baseline.get("benchmarks", {}).get(name)
+        if not recorded:
+            continue
+        for metric in METRICS:
+            old, new = recorded.get(metric), metrics[metric]
+            if old is not None and new > old * (1 + threshold) and new - old > 1:
+                regressions.append((name, metric, old, new))
+    return regressions
@@ -1,12 +1,17 @@
 # portfolio_app/models.py
 import os
-from django.db import models
+from django.core.cache import cache
+from django.db import models, router, transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.conf import settings # For BlogPost author
-from django.utils.text import slugify
 from django.utils.html import mark_safe
 from django.urls import reverse
 
+from .rendering import render_post_body
+from .replicas import replica_reads
+from .slugs import UniqueSlugMixin
+
 # --- Helper Functions ---
 
 def get_portfolio_image_upload_path(instance, filename):
@@ -20,22 +25,12 @@ def get_portfolio_image_upload_path(instance, filename):
 
 # --- Models for TonyTheCoder.com ---
 
-class PortfolioCategory(models.Model):
+class PortfolioCategory(UniqueSlugMixin, models.Model):
     name = models.CharField(max_length=100, unique=True, help_text="e.g., Python/Django, React, AI/ML, Full-Stack")
     slug = models.SlugField(max_length=110, unique=True, blank=True)
     description = models.TextField(blank=True, null=True, help_text="Optional: A brief description of this category/tech stack.")
     is_active = models.BooleanField(default=True, db_index=True)
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-            original_slug = self.slug
-            counter = 1
-            while PortfolioCategory.objects.filter(slug=self.slug).exclude(id=self.id).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return self.name
 
@@ -50,7 +45,24 @@ class PortfolioCategory(models.Model):
         ordering = ['name']
 
 
-class PortfolioProject(models.Model):  # For Your Coding Projects
+class PortfolioProjectQuerySet(models.QuerySet):
+    def with_first_image(self):
+        """
+        Prefetches each project's first gallery image (by order, upload time) in a
+        single windowed query so get_first_image_url() never hits the database
+        per row.
+        """
+        first_images = (
+            PortfolioImage.objects.filter(image__isnull=False)
+            .exclude(image__exact='')
+            .order_by('order', 'uploaded_at')[:1]
+        )
+        return self.prefetch_related(
+            models.Prefetch('images', queryset=first_images, to_attr='prefetched_first_images')
+        )
+
+
+class PortfolioProject(UniqueSlugMixin, models.Model):  # For Your Coding Projects
     categories = models.ManyToManyField(
         PortfolioCategory,
         blank=True,
@@ -58,7 +70,8 @@ class PortfolioProject(models.Model):  # For Your Coding Projects
         help_text="Select one or more categories/tech stacks for this project (e.g., Python, React, AI)."
     )
     title = models.CharField(max_length=255, help_text="Name of your coding project.")
-    slug = models.SlugField(max_length=270, unique=True, blank=True)
+    slug = models.SlugField(max_length=270, unique=True, blank=True)  # Allocated from title (see slugs.py)
+    slug_source_field = 'title'
     featured_image = models.ImageField(
         upload_to='portfolio_featured_images/',
         null=True, blank=True,
@@ -100,21 +113,13 @@ class PortfolioProject(models.Model):  # For Your Coding Projects
     )
 
     is_active = models.BooleanField(
-        default=True, db_index=True,
+        default=True,
         help_text="Controls if this project is visible on your public portfolio."
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
-            original_slug = self.slug
-            counter = 1
-            while PortfolioProject.objects.filter(slug=self.slug).exclude(id=self.id).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        super().save(*args, **kwargs)
+    objects = PortfolioProjectQuerySet.as_manager()
 
     def __str__(self):
         return self.title
@@ -132,19 +137,35 @@ class PortfolioProject(models.Model):  # For Your Coding Projects
             return "#"
 
 
+    def get_first_image(self): # The image file shown on cards: featured image, else first gallery image
+        if self.featured_image:
+            return self.featured_image
+        if hasattr(self, 'prefetched_first_images'):  # Set by PortfolioProject.objects.with_first_image()
+            first_gallery_image = self.prefetched_first_images[0] if self.prefetched_first_images else None
+        else:
+            # Ensure 'images' related_name is correct and refers to PortfolioImage model
+            with replica_reads():  # Card image lookup; a replica's slight lag is harmless
+                first_gallery_image = self.images.filter(image__isnull=False).exclude(image__exact='').order_by('order', 'uploaded_at').first()
+        if first_gallery_image and first_gallery_image.image:
+            return first_gallery_image.image
+        return None
+
     def get_first_image_url(self): # For API and templates
-        if self.featured_image and hasattr(self.featured_image, 'url'):
-            return self.featured_image.url
-        # Ensure 'images' related_name is correct and refers to PortfolioImage model
-        first_gallery_image = self.images.filter(image__isnull=False).exclude(image__exact='').order_by('order', 'uploaded_at').first()
-        if first_gallery_image and first_gallery_image.image and hasattr(first_gallery_image.image, 'url'):
-            return first_gallery_image.image.url
+        first_image = self.get_first_image()
+        if first_image and hasattr(first_image, 'url'):
+            return first_image.url
         return None # Or return static('portfolio_app/images/default_project.png')
 
     class Meta:
         verbose_name = "Coding Project"
         verbose_name_plural = "Coding Projects"
         ordering = ['order', '-created_at']
+        indexes = [
+            # Public lists and the admin changelist read projects in display order.
+            models.Index(fields=['order', '-created_at', '-id'], name='project_order_created_idx'),
+            # Covers the ETag validator (MAX(updated_at), COUNT(*) of active projects).
+            models.Index(fields=['is_active', 'updated_at'], name='project_active_updated_idx'),
+        ]
 
 
 class PortfolioImage(models.Model):
@@ -171,23 +192,122 @@ class PortfolioImage(models.Model):
         verbose_name = "Coding Project Image"
         verbose_name_plural = "Coding Project Images"
         ordering = ['portfolio_project', 'order', 'uploaded_at']
+        indexes = [
+            # Galleries and with_first_image() read a project's images in gallery order.
+            models.Index(fields=['portfolio_project', 'order', 'uploaded_at'], name='pimage_project_order_idx'),
+        ]
+
+
+class GalleryUploadJob(models.Model):
+    """
+    One gallery image uploaded through the staff portal. The request thread only
+    stages the file on disk and creates this row; verification, PortfolioImage
+    creation and renditions happen on the background pool in portfolio_app/jobs.py.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('PROCESSING', 'Processing'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+    portfolio_project = models.ForeignKey(
+        PortfolioProject,
+        on_delete=models.CASCADE,
+        related_name='upload_jobs'
+    )
+    original_name = models.CharField(max_length=255)
+    staged_file = models.FileField(upload_to='upload_staging/', max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    error = models.TextField(blank=True)
+    portfolio_image = models.ForeignKey(
+        PortfolioImage,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
+    def __str__(self):
+        return f"{self.original_name} for {self.portfolio_project.title} ({self.get_status_display()})"
 
-class BlogCategory(models.Model):
+    class Meta:
+        verbose_name = "Gallery Upload Job"
+        verbose_name_plural = "Gallery Upload Jobs"
+        ordering = ['-created_at']
+
+
+# One recount job per set of due categories, however many sidebars notice them.
+CATEGORY_RECOUNT_GUARD_KEY = 'portfolio_app:category_recount:{ids}'
+CATEGORY_RECOUNT_GUARD_TIMEOUT = 60
+
+
+class BlogCategoryQuerySet(models.QuerySet):
+    def refresh_post_counts(self):
+        """
+        Recounts live posts for the categories in this queryset and stores the
+        result in live_post_count / next_post_live_at. The category rows are
+        locked first so concurrent post saves in the same category recount one
+        after the other and the last writer always sees the other's post.
+        Everything runs on the write database, never a replica.
+        """
+        db = router.db_for_write(BlogCategory)
+        with transaction.atomic(using=db):
+            category_ids = list(self.using(db).select_for_update().values_list('pk', flat=True))
+            if not category_ids:
+                return 0
+            now = timezone.now()
+            published = models.Q(posts__status=BlogPost.PUBLISHED, posts__is_active=True)
+            rows = (
+                BlogCategory.objects.using(db).filter(pk__in=category_ids)
+                .annotate(
+                    counted=models.Count('posts', filter=published & models.Q(posts__published_date__lte=now)),
+                    next_live=models.Min('posts__published_date', filter=published & models.Q(posts__published_date__gt=now)),
+                )
+                .values_list('pk', 'counted', 'next_live')
+            )
+            categories = [
+                BlogCategory(pk=pk, live_post_count=counted, next_post_live_at=next_live)
+                for pk, counted, next_live in rows
+            ]
+            BlogCategory.objects.using(db).bulk_update(categories, ['live_post_count', 'next_post_live_at'])
+        return len(categories)
+
+    def for_sidebar(self):
+        """
+        Active categories with at least one live post, ordered by name. Reads
+        the stored counters only. A category whose next scheduled post has
+        gone live is shown right away and recounted on the job pool, so this
+        read path (often on a replica) never writes. A cache add() lets only
+        the first request to notice queue the recount; the guard expires after
+        CATEGORY_RECOUNT_GUARD_TIMEOUT in case that job failed.
+        """
+        from .jobs import refresh_category_counts, submit
+
+        now = timezone.now()
+        categories = list(
+            self.filter(is_active=True).filter(
+                models.Q(live_post_count__gt=0) | models.Q(next_post_live_at__lte=now)
+            ).order_by('name')
+        )
+        due = {c.pk for c in categories if c.next_post_live_at and c.next_post_live_at <= now}
+        if due:
+            guard = CATEGORY_RECOUNT_GUARD_KEY.format(ids=','.join(map(str, sorted(due))))
+            if cache.add(guard, True, timeout=CATEGORY_RECOUNT_GUARD_TIMEOUT):
+                submit(refresh_category_counts, sorted(due))
+        return [c for c in categories if c.live_post_count > 0 or c.pk in due]
+
+
+class BlogCategory(UniqueSlugMixin, models.Model):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(max_length=120, unique=True, blank=True)
     description = models.TextField(blank=True, help_text="A short description for the category page (SEO).")
     is_active = models.BooleanField(default=True, db_index=True)
+    # Maintained by BlogPost.save()/delete (see refresh_post_counts); rebuild with `manage.py reconcile_category_counts`.
+    live_post_count = models.PositiveIntegerField(default=0, editable=False)
+    next_post_live_at = models.DateTimeField(null=True, blank=True, editable=False, help_text="Earliest scheduled post that is not live yet.")
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-            original_slug = self.slug
-            counter = 1
-            while BlogCategory.objects.filter(slug=self.slug).exclude(id=self.id).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        super().save(*args, **kwargs)
+    objects = BlogCategoryQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -199,16 +319,22 @@ class BlogCategory(models.Model):
         verbose_name = "Blog Category"
         verbose_name_plural = "Blog Categories"
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['is_active', 'name'], name='blogcategory_active_name_idx'),
+        ]
 
 
-class BlogPost(models.Model):
-    STATUS_CHOICES = [('DRAFT', 'Draft'), ('PUBLISHED', 'Published')]
+class BlogPost(UniqueSlugMixin, models.Model):
+    DRAFT = 'DRAFT'
+    PUBLISHED = 'PUBLISHED'
+    STATUS_CHOICES = [(DRAFT, 'Draft'), (PUBLISHED, 'Published')]
     title = models.CharField(max_length=255)
-    slug = models.SlugField(max_length=270, unique=True, blank=True)
+    slug = models.SlugField(max_length=270, unique=True, blank=True)  # Allocated from title (see slugs.py)
+    slug_source_field = 'title'
     content = models.TextField(help_text="Main content of the blog post. Use Markdown or enable CKEditor.")
     excerpt = models.TextField(blank=True, help_text="A short summary for list views and meta descriptions (SEO).")
     featured_image = models.ImageField(upload_to='blog_featured_images/', null=True, blank=True)
-    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='DRAFT', db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='DRAFT')
     category = models.ForeignKey(BlogCategory, on_delete=models.SET_NULL, null=True, blank=True, related_name='posts')
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -221,17 +347,73 @@ class BlogPost(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Derived from content/excerpt by save() (see rendering.py); the public views read only these.
+    rendered_content = models.TextField(blank=True, editable=False, help_text="Sanitized body HTML with heading anchors.")
+    plain_text = models.TextField(blank=True, editable=False)
+    meta_description = models.CharField(max_length=300, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False, help_text="Estimated minutes to read.")
+    table_of_contents = models.JSONField(default=list, blank=True, editable=False)
+
+    RENDERED_FIELDS = ['rendered_content', 'plain_text', 'meta_description', 'word_count', 'reading_time', 'table_of_contents']
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
-            original_slug = self.slug
-            counter = 1
-            while BlogPost.objects.filter(slug=self.slug).exclude(id=self.id).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
         if self.status == 'PUBLISHED' and self.published_date is None:
             self.published_date = timezone.now()
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'content', 'excerpt'} & set(update_fields):
+            self.render_content()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(self.RENDERED_FIELDS)
+        changed_categories = self._categories_needing_recount()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if changed_categories:
+                BlogCategory.objects.filter(pk__in=changed_categories).refresh_post_counts()
+        self._count_snapshot = self._count_fields()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if cls._COUNT_FIELDS.issubset(field_names):  # Never load deferred fields here
+            instance._count_snapshot = instance._count_fields()
+        return instance
+
+    _COUNT_FIELDS = frozenset({'category_id', 'status', 'is_active', 'published_date'})
+
+    def _count_fields(self):
+        """The fields that decide whether (and where) a post counts as live."""
+        return (self.category_id, self.status, self.is_active, self.published_date)
+
+    def _categories_needing_recount(self):
+        snapshot = getattr(self, '_count_snapshot', None)
+        if snapshot == self._count_fields():
+            return set()
+        category_ids = {self.category_id}
+        if snapshot is not None:
+            category_ids.add(snapshot[0])
+        elif not self._state.adding:
+            # Saved without being loaded from the DB: the old category is unknown.
+            category_ids.update(BlogPost.objects.filter(pk=self.pk).values_list('category_id', flat=True))
+        category_ids.discard(None)
+        return category_ids
+
+    def render_content(self):
+        """Refreshes the derived body columns from content and excerpt."""
+        for field, value in render_post_body(self.content, self.excerpt).items():
+            setattr(self, field, value)
+
+    def ensure_rendered(self):
+        """
+        Posts saved before the derived columns existed have them empty until
+        `render_blog_posts` runs. Such a post is rendered in memory for the
+        current request, and storing the result is queued on the job pool.
+        """
+        if self.rendered_content or not self.content:
+            return
+        from .jobs import render_stored_posts, submit  # jobs imports this module
+        self.render_content()
+        submit(render_stored_posts, [self.pk])
 
     def is_live(self):
         return self.status == 'PUBLISHED' and self.published_date is not None and self.published_date <= timezone.now() and self.is_active
@@ -246,6 +428,68 @@ class BlogPost(models.Model):
         verbose_name = "Blog Post"
         verbose_name_plural = "Blog Posts"
         ordering = ['-published_date', '-created_at']
+        indexes = [
+            # Keyset pagination walks posts by (published_date, id), overall and per category.
+            models.Index(fields=['-published_date', '-id'], name='blogpost_pub_date_id_idx'),
+            models.Index(fields=['category', '-published_date', '-id'], name='blogpost_cat_pub_date_id_idx'),
+            # Live posts only, for the public list and feeds. A plain (status, is_active, ...)
+            # index would not help: the ORM tests is_active as a bare boolean, which SQLite
+            # cannot match to an index column, and it lures the planner away from the
+            # related-posts index.
+            models.Index(
+                fields=['-published_date', '-id'],
+                condition=Q(status='PUBLISHED', is_active=True),
+                name='blogpost_live_pub_date_idx',
+            ),
+            # Drafts, for the staff dashboard count and draft lists.
+            models.Index(fields=['-updated_at'], condition=Q(status='DRAFT'), name='blogpost_draft_updated_idx'),
+        ]
+
+
+class RelatedPost(models.Model):
+    """
+    A precomputed "related post" link, ranked by TF-IDF cosine similarity of
+    the two posts' text. Maintained by portfolio_app/related.py.
+    """
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField(help_text="1 = most similar.")
+
+    def __str__(self):
+        return f"{self.post} -> {self.related} ({self.score:.3f})"
+
+    class Meta:
+        verbose_name = "Related Post"
+        verbose_name_plural = "Related Posts"
+        ordering = ['post', 'rank']
+        unique_together = [('post', 'related')]
+        indexes = [
+            models.Index(fields=['post', 'rank'], name='relatedpost_post_rank_idx'),
+        ]
+
+
+class RelatedTerm(models.Model):
+    """
+    One term of a published post's TF-IDF vector: the term index that lets
+    related.py score a changed post against only the posts sharing its terms.
+    """
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='+')
+    term = models.CharField(max_length=64)
+    count = models.PositiveIntegerField(help_text="Field-weighted occurrences in the post's text.")
+    weight = models.FloatField(help_text="L2-normalised TF-IDF weight.")
+
+    def __str__(self):
+        return f"{self.post_id}: {self.term} ({self.weight:.3f})"
+
+    class Meta:
+        verbose_name = "Related Term"
+        verbose_name_plural = "Related Terms"
+        unique_together = [('post', 'term')]
+        indexes = [
+            # Covers the "posts sharing these terms" lookup.
+            models.Index(fields=['term', 'post', 'weight'], name='relatedterm_term_idx'),
+        ]
 
 
 class ContactInquiry(models.Model):
@@ -255,7 +499,7 @@ class ContactInquiry(models.Model):
     phone_number = models.CharField(max_length=25, blank=True)
     subject = models.CharField(max_length=255, blank=True)
     message = models.TextField()
-    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='NEW', db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='NEW')
     internal_notes = models.TextField(blank=True, help_text="Internal notes about this inquiry.")
     submitted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -267,6 +511,35 @@ class ContactInquiry(models.Model):
         verbose_name = "Contact Inquiry"
         verbose_name_plural = "Contact Inquiries"
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['status', '-submitted_at', '-id'], name='inquiry_status_submitted_idx'),
+            models.Index(fields=['-submitted_at', '-id'], name='inquiry_submitted_idx'),
+        ]
+
+class ImageRendition(models.Model):
+    """
+    A resized copy of an uploaded image (gallery image or featured image), stored
+    next to the original. Renditions are keyed by the source file's storage name
+    so any ImageField can use them; see portfolio_app/renditions.py.
+    """
+    FORMAT_CHOICES = [('WEBP', 'WebP'), ('JPEG', 'JPEG')]
+    source_name = models.CharField(max_length=255, db_index=True, help_text="Storage name of the original image.")
+    source_width = models.PositiveIntegerField(help_text="Width of the original image in pixels.")
+    file = models.ImageField(upload_to='renditions/', max_length=255)
+    format = models.CharField(max_length=4, choices=FORMAT_CHOICES)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.source_name} ({self.format}, {self.width}w)"
+
+    class Meta:
+        verbose_name = "Image Rendition"
+        verbose_name_plural = "Image Renditions"
+        ordering = ['source_name', 'format', 'width']
+        unique_together = [('source_name', 'format', 'width')]
+
 
 # Note: Models like Customer, Project (internal construction project), Vendor, Expense, etc.,
 # from the original Lehman site have been removed as they are not typically needed
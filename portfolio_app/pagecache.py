@@ -0,0 +1,144 @@
+# portfolio_app/pagecache.py
+#
+# Full-page cache for anonymous visitors.
+#
+# The public pages render the same HTML for everyone who is not logged in, so
+# @cache_public_page stores the finished response per URL (plus the few
+# request headers in settings.PAGE_CACHE_VARY_HEADERS) and replays it. Each
+# entry records the versions of the dependency tags it was rendered under
+# (caching.get_tag_versions); signals.py bumps only the tags an edit touches,
+# e.g. saving a blog post purges its detail page, its category page, the blog
+# list and the home page, but not the other posts.
+#
+# Requests carrying a session cookie (staff, logged-in users, pending flash
+# messages) bypass the cache without touching the session store. Responses
+# say X-Page-Cache: HIT, MISS or BYPASS.
+#
+# An entry also holds the page compressed with each encoding compression.py
+# can produce, made once when the entry is stored; hits are served in the
+# encoding the client accepts without compressing again.
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .caching import bump_tags, get_tag_versions
+from .compression import compressed_variants, encode_for_request
+
+PAGE_CACHE_KEY = "portfolio_app:page:{digest}"
+PAGE_CACHE_HEADER = "X-Page-Cache"
+
+# Dependency tags. Templates with {slug} are filled from the view's kwargs.
+HOME = "page:home"
+STATIC_PAGES = "page:static"
+BLOG_LIST = "page:blog_list"
+BLOG_CATEGORIES = "page:blog_categories"  # Category names/links on every blog page
+BLOG_POST = "page:blog_post:{slug}"
+BLOG_CATEGORY = "page:blog_category:{slug}"
+
+
+def blog_post_tag(slug):
+    return BLOG_POST.format(slug=slug)
+
+
+def blog_category_tag(slug):
+    return BLOG_CATEGORY.format(slug=slug)
+
+
+def purge_blog_pages(post_slugs=(), category_slugs=(), categories_changed=False):
+    """Purges the blog list, home and the given post/category pages."""
+    tags = [BLOG_LIST, HOME]
+    tags += [blog_post_tag(slug) for slug in set(post_slugs) if slug]
+    tags += [blog_category_tag(slug) for slug in set(category_slugs) if slug]
+    if categories_changed:
+        tags.append(BLOG_CATEGORIES)
+    bump_tags(*tags)
+
+
+def _bypass(request):
+    if not settings.PAGE_CACHE_ENABLED or request.method not in ("GET", "HEAD"):
+        return True
+    # A session means a logged-in user (the navbar differs for staff) or
+    # one-off flash messages; checking the cookie avoids a session lookup.
+    return (
+        settings.SESSION_COOKIE_NAME in request.COOKIES
+        or "messages" in request.COOKIES
+    )
+
+
+def _cache_key(request):
+    parts = [settings.PAGE_CACHE_RELEASE, request.build_absolute_uri()]
+    parts += [request.headers.get(header, "") for header in settings.PAGE_CACHE_VARY_HEADERS]
+    digest = hashlib.md5("\n".join(parts).encode()).hexdigest()
+    return PAGE_CACHE_KEY.format(digest=digest)
+
+
+def _is_cacheable(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and "private" not in response.get("Cache-Control", "")
+        and "no-store" not in response.get("Cache-Control", "")
+    )
+
+
+def _replay(request, entry):
+    response = HttpResponse(entry["content"], status=entry["status"], headers=entry["headers"])
+    encode_for_request(request, response, entry.get("encoded"))
+    # The page may carry validators from @conditional_on_content; honour them.
+    return get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=parse_http_date_safe(response.get("Last-Modified", "")),
+        response=response,
+    )
+
+
+def cache_public_page(*tags):
+    """
+    Caches a public view's response for anonymous visitors. tags are the
+    dependency tags (constants above) the page must be purged with.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if _bypass(request):
+                response = view_func(request, *args, **kwargs)
+                response[PAGE_CACHE_HEADER] = "BYPASS"
+                return response
+
+            page_tags = [tag.format(**kwargs) for tag in tags]
+            key = _cache_key(request)
+            entry = cache.get(key)
+            versions = get_tag_versions(page_tags)
+            if entry is not None and entry["tags"] == versions:
+                response = _replay(request, entry)
+                response[PAGE_CACHE_HEADER] = "HIT"
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if request.method == "GET" and _is_cacheable(request, response):
+                entry = {
+                    "content": response.content,
+                    "status": response.status_code,
+                    "headers": dict(response.items()),
+                    "encoded": compressed_variants(response),
+                    "tags": versions,
+                }
+                cache.set(key, entry, timeout=settings.PAGE_CACHE_TIMEOUT)
+                encode_for_request(request, response, entry["encoded"])
+            response[PAGE_CACHE_HEADER] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
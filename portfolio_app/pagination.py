@@ -0,0 +1,87 @@
+# portfolio_app/pagination.py
+#
+# Keyset (cursor) pagination for the blog lists.
+#
+# OFFSET pagination makes the database walk and discard every row before the
+# requested page. Here the page boundary is encoded as the (published_date, id)
+# of the first/last post shown, so each page is a range scan on the
+# (published_date, id) index that reads only page_size + 1 rows, however deep
+# the archive goes. Links carry opaque ?after=<cursor> / ?before=<cursor> tokens.
+
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(post):
+    raw = f"{post.published_date.isoformat()}|{post.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Returns (published_date, id), or None if the token is malformed."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        published, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(published), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class KeysetPage:
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        # The cursors come from the first/last row shown, so a page past either
+        # end of the list (a stale or crafted cursor) links nowhere.
+        self.has_next = has_next and bool(object_list)
+        self.has_previous = has_previous and bool(object_list)
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self):
+        return encode_cursor(self.object_list[-1]) if self.has_next else None
+
+    @property
+    def previous_cursor(self):
+        return encode_cursor(self.object_list[0]) if self.has_previous else None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def keyset_paginate(queryset, request, page_size):
+    """
+    Returns a KeysetPage of posts ordered newest first by (published_date, id),
+    positioned by the request's ?after= or ?before= cursor. Malformed cursors
+    fall back to the first page.
+    """
+    after = decode_cursor(request.GET.get("after"))
+    before = None if after else decode_cursor(request.GET.get("before"))
+
+    if before:
+        published, pk = before
+        rows = list(
+            queryset.filter(
+                Q(published_date__gt=published) | Q(published_date=published, pk__gt=pk)
+            ).order_by("published_date", "pk")[: page_size + 1]
+        )
+        has_previous = len(rows) > page_size
+        return KeysetPage(list(reversed(rows[:page_size])), True, has_previous)
+
+    if after:
+        published, pk = after
+        queryset = queryset.filter(
+            Q(published_date__lt=published) | Q(published_date=published, pk__lt=pk)
+        )
+    rows = list(queryset.order_by("-published_date", "-pk")[: page_size + 1])
+    return KeysetPage(rows[:page_size], len(rows) > page_size, after is not None)
@@ -0,0 +1,218 @@
+# portfolio_app/querybudget.py
+#
+# Per-request query budgets.
+#
+# QueryBudgetMiddleware wraps every database connection for the duration of a
+# request (connection.execute_wrapper) and records how many queries ran, how
+# long they took in total, and how often each statement shape repeated.
+# Statements are fingerprinted by collapsing literals and IN (...) lists, so
+# "SELECT ... WHERE project_id = %s" run once per row of a list shows up as one
+# fingerprint with a high count: the usual signature of an N+1.
+#
+# Views declare the most queries a request may take with @query_budget(n).
+# Going over budget logs a warning in production and raises
+# QueryBudgetExceeded when settings.QUERY_BUDGET_RAISE is set (the default
+# under `manage.py test`), so a regression fails the test that hit it.
+#
+# Per-endpoint totals are kept in the default cache so `manage.py
+# query_budget_report` can list the worst endpoints across worker processes.
+# Only QUERY_BUDGET_STATS_SAMPLE_RATE of requests are recorded (all of them in
+# development, none by default in production), since each one costs a cache
+# read and write. The read-modify-write is not atomic; the numbers are
+# diagnostics, not accounting, and averages hold up under sampling.
+
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_KEY = "portfolio_app:querybudget:stats"
+STATS_TIMEOUT = 60 * 60 * 24 * 7
+MAX_DUPLICATES_KEPT = 5
+MAX_FINGERPRINT_LENGTH = 300
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN \((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+# Transaction control repeats by design and says nothing about N+1s.
+_TRANSACTION_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT", "BEGIN", "COMMIT")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(max_queries):
+    """
+    Declares the most queries one request to the view may run, e.g.
+    @query_budget(6). Put it above the other decorators.
+    """
+
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+
+    return decorator
+
+
+def fingerprint(sql):
+    """Normalises a statement so repeats with different parameters match."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _WHITESPACE_RE.sub(" ", sql).strip()
+    sql = _IN_LIST_RE.sub("IN (...)", sql.replace("%s", "?"))
+    return sql[:MAX_FINGERPRINT_LENGTH]
+
+
+class QueryRecorder:
+    """execute_wrapper that counts, times and fingerprints queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            if not sql.lstrip().upper().startswith(_TRANSACTION_PREFIXES):
+                self.fingerprints[fingerprint(sql)] += 1
+
+    def record(self):
+        """Wraps every configured connection until the returned stack closes."""
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self))
+        return stack
+
+    @property
+    def duplicates(self):
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > 1]
+
+
+def load_stats():
+    return cache.get(STATS_CACHE_KEY) or {}
+
+
+def reset_stats():
+    cache.delete(STATS_CACHE_KEY)
+
+
+def _record_stats(endpoint, recorder, budget, exceeded):
+    stats = load_stats()
+    entry = stats.setdefault(
+        endpoint,
+        {
+            "requests": 0,
+            "queries": 0,
+            "max_queries": 0,
+            "db_time": 0.0,
+            "max_db_time": 0.0,
+            "violations": 0,
+            "budget": budget,
+            "duplicates": {},
+        },
+    )
+    entry["requests"] += 1
+    entry["queries"] += recorder.count
+    entry["max_queries"] = max(entry["max_queries"], recorder.count)
+    entry["db_time"] += recorder.duration
+    entry["max_db_time"] = max(entry["max_db_time"], recorder.duration)
+    entry["violations"] += int(exceeded)
+    entry["budget"] = budget
+    duplicates = entry["duplicates"]
+    for sql, count in recorder.duplicates:
+        duplicates[sql] = max(duplicates.get(sql, 0), count)
+    entry["duplicates"] = dict(
+        sorted(duplicates.items(), key=lambda item: -item[1])[:MAX_DUPLICATES_KEPT]
+    )
+    cache.set(STATS_CACHE_KEY, stats, timeout=STATS_TIMEOUT)
+
+
+def _sampled():
+    rate = settings.QUERY_BUDGET_STATS_SAMPLE_RATE
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+class QueryBudgetMiddleware:
+    """
+    Records query count, DB time and duplicate statements per request and
+    enforces the view's @query_budget. Place it first in MIDDLEWARE so the
+    session and auth lookups of later middleware are counted too.
+
+    Under ASGI the ORM runs in the request's thread-sensitive worker thread,
+    so the connection wrappers are installed and removed from that thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.QUERY_BUDGET_ENABLED:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        request.query_recorder = recorder
+        with recorder.record():
+            response = self.get_response(request)
+        self._check(request, recorder)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.QUERY_BUDGET_ENABLED:
+            return await self.get_response(request)
+        recorder = QueryRecorder()
+        request.query_recorder = recorder
+        stack = await sync_to_async(recorder.record)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        await sync_to_async(self._check)(request, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = getattr(view_func, "query_budget", None)
+
+    def _check(self, request, recorder):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return  # 404s and the like have no endpoint to charge
+        endpoint = match.view_name
+        budget = getattr(request, "_query_budget", None)
+        exceeded = budget is not None and recorder.count > budget
+        if _sampled():
+            _record_stats(endpoint, recorder, budget, exceeded)
+        if not exceeded:
+            return
+        message = (
+            f"Query budget exceeded for {endpoint} ({request.method} {request.path}): "
+            f"{recorder.count} queries, budget {budget}, "
+            f"{recorder.duration * 1000:.1f} ms in the database"
+        )
+        if recorder.duplicates:
+            sql, count = recorder.duplicates[0]
+            message += f"; most repeated ({count}x): {sql}"
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,172 @@
+# portfolio_app/queryplans.py
+#
+# Query plan checks for the views.
+#
+# check_query_plans() requests every endpoint of the load benchmark (public
+# pages, APIs, staff lists; see benchmark.default_endpoints()), records each
+# SELECT the request runs with its parameters, and asks SQLite for the plan
+# with EXPLAIN QUERY PLAN. A statement is reported when its plan
+#
+#     scans a table      "SCAN portfolio_app_blogpost" without an index,
+#                        i.e. reads every row
+#     sorts in a temp    "USE TEMP B-TREE FOR ORDER BY / DISTINCT / GROUP
+#     B-tree             BY", i.e. no index delivers the rows in order
+#
+# Scans of subqueries and CTEs are not table reads and are not reported;
+# ALLOWED_SCANS lists tables small enough that reading them whole is the
+# plan we want, as is any table ANALYZE counted at SMALL_TABLE_ROWS rows or
+# fewer (one author, a few categories). ALLOWED_SORTS lists the few sorts no
+# index can remove. The caches are swapped for a dummy backend and the page and
+# fragment caches are switched off for the run, so every query a cold
+# request makes is seen, and everything the requests write (sessions, the
+# staff user) is rolled back afterwards.
+#
+# Plans depend on the data and on ANALYZE statistics, so check against a
+# realistically sized database, e.g. one filled by `manage.py
+# seed_benchmark_data`. `manage.py check_query_plans` fails when any
+# statement is reported, which makes it usable as a CI gate, and
+# QueryPlanTests (tests.py) runs the same check on a small seeded dataset.
+
+import re
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from .querybudget import fingerprint
+
+# Lookup tables read whole by design: they hold a handful of rows.
+ALLOWED_SCANS = {"django_content_type", "django_site"}
+
+# With ANALYZE statistics the planner reads tables this small whole.
+SMALL_TABLE_ROWS = 10
+
+# (plan step, SQL pattern): sorts that are inherent to the statement and only
+# ever see a small, bounded set of rows.
+ALLOWED_SORTS = [
+    # Full-text search: ordering the matches by bm25() rank is the search.
+    ("USE TEMP B-TREE FOR ORDER BY", re.compile(r"\bMATCH\b")),
+    # Prefetches sort the related rows of the objects already fetched.
+    ("USE TEMP B-TREE FOR ORDER BY", re.compile(r'"_prefetch_related_val_')),
+    # Sliced prefetches (with_first_image) filter a window function in a
+    # subquery; the outer query re-sorts the one row kept per object.
+    ("USE TEMP B-TREE FOR ORDER BY", re.compile(r'"qualify_mask"')),
+    # Ordering aggregated rows sorts one row per group.
+    ("USE TEMP B-TREE FOR ORDER BY", re.compile(r"\bGROUP BY\b")),
+    # The admin date_hierarchy's year/month links: DISTINCT over a truncated date.
+    ("USE TEMP B-TREE FOR DISTINCT", re.compile(r"^SELECT DISTINCT django_datetime_trunc\(")),
+]
+
+_SCAN_RE = re.compile(r"^SCAN (\w+)(?: LEFT-JOIN)?$")
+_TEMP_BTREE = "USE TEMP B-TREE"
+
+
+class _SelectRecorder:
+    """execute_wrapper that keeps (alias, sql, params) for every SELECT."""
+
+    def __init__(self, alias, statements):
+        self.alias = alias
+        self.statements = statements
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith("SELECT"):
+            self.statements.append((self.alias, sql, params))
+        return execute(sql, params, many, context)
+
+
+def explain(alias, sql, params):
+    """The detail column of EXPLAIN QUERY PLAN, one line per plan step."""
+    with connections[alias].cursor() as cursor:
+        # A cached EXPLAIN statement is not re-planned when the schema changes
+        # (e.g. an index is added), so key it on the schema version.
+        cursor.execute("PRAGMA schema_version")
+        version = cursor.fetchone()[0]
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql} -- schema {version}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def small_tables(alias):
+    """Tables sqlite_stat1 counts at SMALL_TABLE_ROWS rows or fewer; empty before ANALYZE."""
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            return set()
+        cursor.execute("SELECT tbl, stat FROM sqlite_stat1")
+        return {
+            table for table, stat in cursor.fetchall()
+            if stat and int(stat.split()[0]) <= SMALL_TABLE_ROWS
+        }
+
+
+def _allowed_sort(step, sql):
+    return any(step == allowed and pattern.search(sql) for allowed, pattern in ALLOWED_SORTS)
+
+
+def plan_problems(plan, tables, sql="", small=()):
+    """What is wrong with a plan: full scans of real tables and temp B-tree sorts."""
+    problems = []
+    for step in plan:
+        scan = _SCAN_RE.match(step)
+        table = scan and scan.group(1)
+        if table in tables and table not in ALLOWED_SCANS and table not in small:
+            problems.append(f"full scan of {table}")
+        elif _TEMP_BTREE in step and not _allowed_sort(step, sql):
+            problems.append(step.lower().replace("use ", "", 1))
+    return problems
+
+
+def _request(client, path, statements):
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(_SelectRecorder(alias, statements)))
+        client.get(path)
+
+
+def check_query_plans(endpoints=None, include_staff=True):
+    """
+    Returns [{"endpoint", "path", "sql", "plan", "problems"}] for every distinct
+    SELECT the endpoints run; entries with an empty "problems" list are fine.
+    """
+    from .benchmark import benchmark_staff_user, default_endpoints
+
+    results = []
+    overrides = override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+        PAGE_CACHE_ENABLED=False,
+        FRAGMENT_CACHE_ENABLED=False,
+        QUERY_BUDGET_RAISE=False,
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+    )
+    with overrides, transaction.atomic():
+        endpoints = endpoints or default_endpoints()
+        if not include_staff:
+            endpoints = [endpoint for endpoint in endpoints if not endpoint[2]]
+        anonymous = Client(raise_request_exception=False)
+        staff = Client(raise_request_exception=False)
+        if any(as_staff for _, _, as_staff in endpoints):
+            staff.force_login(benchmark_staff_user())
+        sqlite = [alias for alias in connections if connections[alias].vendor == "sqlite"]
+        tables = {alias: set(connections[alias].introspection.table_names()) for alias in sqlite}
+        small = {alias: small_tables(alias) for alias in sqlite}
+
+        for name, path, as_staff in endpoints:
+            statements = []
+            _request(staff if as_staff else anonymous, path, statements)
+            seen = set()
+            for alias, sql, params in statements:
+                key = (alias, fingerprint(sql))
+                if key in seen or alias not in tables:
+                    continue
+                seen.add(key)
+                plan = explain(alias, sql, params)
+                results.append({
+                    "endpoint": name,
+                    "path": path,
+                    "sql": sql,
+                    "plan": plan,
+                    "problems": plan_problems(plan, tables[alias], sql, small[alias]),
+                })
+        transaction.set_rollback(True)
+    return results
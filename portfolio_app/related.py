@@ -0,0 +1,272 @@
+# portfolio_app/related.py
+#
+# Precomputed "related posts" by content similarity.
+#
+# Every published, active post is turned into a TF-IDF vector over its title
+# (weighted x3), excerpt (x2) and stored plain text (x1). The top
+# settings.RELATED_POSTS_TOP_K neighbours by cosine similarity are stored as
+# RelatedPost rows, so blog_post_detail reads its list with one indexed query.
+#
+# Each post keeps its MAX_TERMS most frequent terms; the vectors are stored
+# as RelatedTerm rows, which double as a term index.
+#
+# rebuild_related_posts() recomputes everything (`manage.py
+# rebuild_related_posts`). When a post is saved or deleted,
+# refresh_related_posts() re-weighs that one post against the stored document
+# frequencies and scores it against the posts sharing its terms, read from
+# the index. Lists are merged rather than rebuilt; a list is rescored from the
+# index only when the changed post drops out of it. Saves that change neither
+# the post's terms nor whether it is listed do nothing. Changed lists purge
+# the cached detail pages they appear on.
+#
+# Other posts keep the weights they were indexed with, so their IDF drifts as
+# the blog grows; `rebuild_related_posts` brings everything back in line.
+
+import logging
+import math
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .caching import bump_tags
+from .dbwrites import run_write
+from .models import BlogPost, RelatedPost, RelatedTerm
+from .pagecache import blog_post_tag
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+MAX_TERMS = 50
+MAX_TERM_LENGTH = 64  # RelatedTerm.term
+FIELD_WEIGHTS = (("title", 3), ("excerpt", 2), ("plain_text", 1))
+STOP_WORDS = frozenset(
+    """
+    about after again also and any are because been before being between both but
+    can could did does doing down during each few for from further had has have
+    having her here hers him his how into its just more most not now off once
+    only other our ours out over own same she should some such than that the
+    their theirs them then there these they this those through too under until
+    very was were what when where which while who whom why will with would you
+    your yours
+    """.split()
+)
+
+
+def _candidates():
+    """Posts that can appear in (or own) a related list."""
+    return BlogPost.objects.filter(status=BlogPost.PUBLISHED, is_active=True).only(
+        "pk", "slug", "title", "excerpt", "plain_text"
+    )
+
+
+def _term_counts(post):
+    """The post's MAX_TERMS most frequent terms, {term: field-weighted count}."""
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for token in TOKEN_RE.findall((getattr(post, field) or "").lower()):
+            if token not in STOP_WORDS and len(token) <= MAX_TERM_LENGTH:
+                counts[token] += weight
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:MAX_TERMS])
+
+
+def _weigh(counts, document_frequency, total):
+    """L2-normalised TF-IDF weights for one post's term counts."""
+    vector = {
+        term: (1 + math.log(count)) * (math.log((1 + total) / (1 + document_frequency[term])) + 1)
+        for term, count in counts.items()
+    }
+    norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+    return {term: weight / norm for term, weight in vector.items()}
+
+
+def build_vectors(term_counts):
+    """Returns {post_pk: {term: weight}} for {post_pk: term counts}."""
+    document_frequency = Counter()
+    for counts in term_counts.values():
+        document_frequency.update(counts.keys())
+    total = len(term_counts)
+    return {pk: _weigh(counts, document_frequency, total) for pk, counts in term_counts.items()}
+
+
+def _similarity(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def _ranked(scores, k):
+    """[(score, pk), ...] best first, positive scores only."""
+    ranked = [(score, pk) for pk, score in scores.items() if score > 0]
+    ranked.sort(key=lambda item: (-item[0], -item[1]))
+    return ranked[:k]
+
+
+def _top_k(pk, vectors, k):
+    vector = vectors[pk]
+    return _ranked(
+        {other_pk: _similarity(vector, other) for other_pk, other in vectors.items() if other_pk != pk},
+        k,
+    )
+
+
+def _indexed_scores(pk, vector):
+    """{other_pk: similarity} for the indexed posts sharing a term with vector."""
+    scores = Counter()
+    rows = RelatedTerm.objects.filter(term__in=vector.keys()).exclude(post_id=pk)
+    for other_pk, term, weight in rows.values_list("post_id", "term", "weight"):
+        scores[other_pk] += vector[term] * weight
+    return scores
+
+
+def _indexed_top_k(pk, k):
+    """Rescores one post's list from its stored vector."""
+    vector = dict(RelatedTerm.objects.filter(post_id=pk).values_list("term", "weight"))
+    return _ranked(_indexed_scores(pk, vector), k)
+
+
+def _stored_lists(queryset):
+    stored = {}
+    for post_id, related_id, score in queryset.values_list(
+        "post_id", "related_id", "score"
+    ).order_by("post_id", "rank"):
+        stored.setdefault(post_id, []).append((score, related_id))
+    return stored
+
+
+def _write_lists(lists, stored):
+    """
+    Replaces the stored lists that differ from the new ones; purges the pages
+    whose list changed. Returns the number of lists rewritten.
+    """
+    changed = {pk: neighbours for pk, neighbours in lists.items() if neighbours != stored.get(pk, [])}
+    if not changed:
+        return 0
+    with transaction.atomic():
+        RelatedPost.objects.filter(post_id__in=changed.keys()).delete()
+        RelatedPost.objects.bulk_create(
+            RelatedPost(post_id=pk, related_id=related_id, score=score, rank=rank)
+            for pk, neighbours in changed.items()
+            for rank, (score, related_id) in enumerate(neighbours, start=1)
+        )
+    purged = [
+        pk
+        for pk, neighbours in changed.items()
+        if [related_id for _, related_id in neighbours]
+        != [related_id for _, related_id in stored.get(pk, [])]
+    ]
+    if purged:
+        slugs = BlogPost.objects.filter(pk__in=purged).values_list("slug", flat=True)
+        bump_tags(*(blog_post_tag(slug) for slug in slugs))
+    return len(changed)
+
+
+def rebuild_related_posts():
+    """Recomputes every vector and related list. Returns the number of posts processed."""
+    term_counts = {post.pk: _term_counts(post) for post in _candidates()}
+    vectors = build_vectors(term_counts)
+    k = settings.RELATED_POSTS_TOP_K
+    lists = {pk: _top_k(pk, vectors, k) for pk in vectors}
+    with transaction.atomic():
+        RelatedTerm.objects.all().delete()
+        RelatedTerm.objects.bulk_create(
+            (
+                RelatedTerm(post_id=pk, term=term, count=term_counts[pk][term], weight=weight)
+                for pk, vector in vectors.items()
+                for term, weight in vector.items()
+            ),
+            batch_size=1000,
+        )
+        RelatedPost.objects.exclude(post_id__in=lists.keys()).delete()
+        _write_lists(lists, _stored_lists(RelatedPost.objects.all()))
+    return len(lists)
+
+
+def _reindex(post_id, counts):
+    """Stores a post's vector, weighed against the indexed posts; returns it."""
+    RelatedTerm.objects.filter(post_id=post_id).delete()
+    if not counts:
+        return {}
+    document_frequency = Counter(
+        dict(
+            RelatedTerm.objects.filter(term__in=counts.keys())
+            .values("term")
+            .annotate(posts=Count("pk"))
+            .values_list("term", "posts")
+        )
+    )
+    document_frequency.update(counts.keys())
+    vector = _weigh(counts, document_frequency, _candidates().count())
+    RelatedTerm.objects.bulk_create(
+        RelatedTerm(post_id=post_id, term=term, count=counts[term], weight=weight)
+        for term, weight in vector.items()
+    )
+    return vector
+
+
+def _rescore(post_id, post, counts, affected):
+    """Re-indexes one post and rewrites the lists it changes; see refresh_related_posts()."""
+    k = settings.RELATED_POSTS_TOP_K
+    vector = _reindex(post_id, counts)
+    if post is None:
+        RelatedPost.objects.filter(post_id=post_id).delete()
+    scores = _indexed_scores(post_id, vector)
+    # Whole lists of: the post, the posts listing it, the posts sharing a term.
+    stored = _stored_lists(
+        RelatedPost.objects.filter(
+            Q(post_id=post_id)
+            | Q(post_id__in=affected)
+            | Q(post_id__in=RelatedPost.objects.filter(related_id=post_id).values("post_id"))
+            | Q(post_id__in=RelatedTerm.objects.filter(term__in=vector.keys()).values("post_id"))
+        )
+    )
+    listed_by = affected | {
+        pk for pk, neighbours in stored.items() if any(r == post_id for _, r in neighbours)
+    }
+
+    lists = {}
+    if post is not None:
+        lists[post_id] = _ranked(scores, k)
+    for pk in listed_by | set(scores):
+        if pk == post_id:
+            continue
+        previous = stored.get(pk, [])
+        score = scores.get(pk, 0.0)
+        neighbours = [(s, r) for s, r in previous if r != post_id]
+        if score > 0:
+            neighbours.append((score, post_id))
+        neighbours.sort(key=lambda item: (-item[0], -item[1]))
+        # Lists of a deleted post lost an entry. Otherwise every unlisted
+        # post scored at most the weakest entry of a full list; if the
+        # post sank to that level, one of them may now outrank it.
+        sank = pk in listed_by and len(previous) >= k and score <= previous[-1][0]
+        if pk in affected or sank:
+            lists[pk] = _indexed_top_k(pk, k)
+        elif neighbours[:k] != previous:
+            lists[pk] = neighbours[:k]
+    return _write_lists(lists, stored)
+
+
+def refresh_related_posts(post_id, affected_ids=()):
+    """
+    Updates the related lists affected by a change to one post (saved,
+    unpublished or deleted). A deleted post's links are already gone by the
+    time this runs, so the caller passes the posts that listed it in
+    affected_ids. Returns the number of lists rewritten.
+    """
+    post = _candidates().filter(pk=post_id).first()
+    counts = _term_counts(post) if post is not None else {}
+    indexed = dict(RelatedTerm.objects.filter(post_id=post_id).values_list("term", "count"))
+    # Listers that were deleted or unpublished since have no list to fix.
+    affected = set(
+        RelatedTerm.objects.filter(post_id__in=affected_ids).values_list("post_id", flat=True).distinct()
+        if affected_ids else ()
+    )
+    if counts == indexed and not affected:
+        return 0  # Same text, and still listed (or still not)
+
+    rewritten = run_write(_rescore, post_id, post, counts, affected)
+    logger.info(f"Related posts refreshed for post {post_id}: {rewritten} list(s) rewritten")
+    return rewritten
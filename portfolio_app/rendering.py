@@ -0,0 +1,243 @@
+# portfolio_app/rendering.py
+#
+# Save-time rendering of blog post bodies.
+#
+# BlogPost.save() runs the CKEditor HTML through render_post_body() once and
+# stores the results (rendered_content, plain_text, meta_description,
+# word_count, reading_time, table_of_contents), so the blog views and cards
+# never strip tags or truncate the full body on a request.
+#
+# The sanitizer is an allowlist built on the standard library's HTMLParser:
+# unknown tags are unwrapped (their text is kept), script-like elements are
+# dropped with their content, event-handler attributes are removed and links
+# may only use http(s), mailto, tel or relative URLs. Inline styles keep only
+# the alignment, indent and image-size properties CKEditor writes, and iframes
+# are kept for YouTube/Vimeo embeds only (CKEditor's media embed output, as
+# <oembed url> or as a preview iframe). h2-h4 headings get stable ids and make
+# up the table of contents.
+
+import math
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.utils.text import Truncator, slugify
+
+WORDS_PER_MINUTE = 200
+META_DESCRIPTION_WORDS = 25
+
+ALLOWED_TAGS = {
+    "a", "abbr", "b", "blockquote", "br", "code", "del", "div", "em", "figcaption",
+    "figure", "h1", "h2", "h3", "h4", "h5", "h6", "hr", "i", "iframe", "img", "kbd",
+    "li", "mark", "oembed", "ol", "p", "pre", "s", "small", "span", "strong", "sub",
+    "sup", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "u", "ul",
+}
+VOID_TAGS = {"br", "hr", "img"}
+DROPPED_TAGS = {"script", "style", "object", "embed", "template", "noscript", "svg", "math"}
+BLOCK_TAGS = {
+    "blockquote", "br", "div", "figcaption", "figure", "h1", "h2", "h3", "h4", "h5",
+    "h6", "hr", "li", "p", "pre", "td", "th", "tr",
+}
+TOC_TAGS = {"h2": 2, "h3": 3, "h4": 4}
+
+ALLOWED_ATTRIBUTES = {
+    "*": {"class", "style", "title"},
+    "a": {"href", "rel", "target"},
+    "iframe": {"allow", "allowfullscreen", "frameborder", "height", "loading", "referrerpolicy", "src", "width"},
+    "img": {"alt", "height", "loading", "sizes", "src", "srcset", "width"},
+    "oembed": {"url"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan", "scope"},
+    "ol": {"start", "reversed"},
+}
+BOOLEAN_ATTRIBUTES = {"allowfullscreen", "reversed"}
+URL_ATTRIBUTES = {"href", "src", "url"}
+SAFE_URL_RE = re.compile(r"^(?:https?:|mailto:|tel:|/|#|\.|[^:/?#]*(?:[/?#]|$))", re.IGNORECASE)
+
+# Only https embeds from these hosts keep their iframe.
+EMBED_HOSTS = {
+    "www.youtube.com", "youtube.com", "www.youtube-nocookie.com", "player.vimeo.com",
+}
+
+_CSS_LENGTH = re.compile(r"^\d+(?:\.\d+)?(?:px|em|rem|%)?$")
+STYLE_PROPERTIES = {
+    "text-align": re.compile(r"^(?:left|right|center|justify)$"),  # Alignment
+    "margin-left": _CSS_LENGTH,  # Indent
+    "float": re.compile(r"^(?:left|right|none)$"),  # Image styles
+    "width": _CSS_LENGTH,  # Image resize
+    "height": _CSS_LENGTH,
+    "max-width": _CSS_LENGTH,
+    "aspect-ratio": re.compile(r"^\d+(?:\.\d+)?\s*/\s*\d+(?:\.\d+)?$"),
+}
+
+
+def _is_safe_url(value):
+    # Browsers ignore control characters and whitespace inside a scheme.
+    compact = re.sub(r"[\x00-\x20]+", "", value)
+    return bool(SAFE_URL_RE.match(compact))
+
+
+def _is_embed_url(value):
+    parts = urlsplit((value or "").strip())
+    return parts.scheme == "https" and parts.hostname in EMBED_HOSTS
+
+
+def _clean_style(value):
+    """Keeps the declarations in STYLE_PROPERTIES; returns "" when none are left."""
+    declarations = []
+    for declaration in value.split(";"):
+        name, _, css_value = declaration.partition(":")
+        name, css_value = name.strip().lower(), css_value.strip().lower()
+        pattern = STYLE_PROPERTIES.get(name)
+        if pattern and pattern.match(css_value):
+            declarations.append(f"{name}:{css_value};")
+    return "".join(declarations)
+
+
+class _PostBodyRenderer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.text = []
+        self.toc = []
+        self.open_tags = []
+        self.dropping = 0  # Depth inside a DROPPED_TAGS element or a dropped iframe
+        self.iframes = []  # Whether each open iframe is being dropped
+        self.heading = None  # (tag, level, attrs, index in self.html, text parts)
+        self.used_ids = set()
+
+    def _attributes(self, tag, attrs):
+        allowed = ALLOWED_ATTRIBUTES["*"] | ALLOWED_ATTRIBUTES.get(tag, set())
+        rendered = []
+        for name, value in attrs:
+            name = name.lower()
+            if name not in allowed:
+                continue
+            if value is None:
+                if name in BOOLEAN_ATTRIBUTES:
+                    rendered.append(f" {name}")
+                continue
+            if name in URL_ATTRIBUTES and not _is_safe_url(value):
+                continue
+            if name == "style":
+                value = _clean_style(value)
+                if not value:
+                    continue
+            rendered.append(f' {name}="{escape(value, quote=True)}"')
+        if tag == "a" and any(name == "target" for name, _ in attrs):
+            rendered.append(' rel="noopener noreferrer"')
+        return "".join(rendered)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "iframe":
+            dropped = bool(self.dropping) or not _is_embed_url(dict(attrs).get("src"))
+            self.iframes.append(dropped)
+            if dropped:
+                self.dropping += 1
+                return
+        if tag in DROPPED_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(" ")
+        if tag not in ALLOWED_TAGS:
+            return
+        if tag == "a":
+            attrs = [(name, value) for name, value in attrs if name != "rel"]
+        if tag in TOC_TAGS and self.heading is None:
+            # The id depends on the heading text, so the start tag is written on close.
+            self.html.append("")
+            self.heading = (tag, TOC_TAGS[tag], attrs, len(self.html) - 1, [])
+        else:
+            self.html.append(f"<{tag}{self._attributes(tag, attrs)}>")
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag == "iframe":
+            if not self.iframes:
+                return
+            if self.iframes.pop():
+                self.dropping = max(0, self.dropping - 1)
+                return
+        if tag in DROPPED_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(" ")
+        if tag not in self.open_tags:
+            return
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            if self.heading and open_tag == self.heading[0]:
+                self._close_heading()
+            self.html.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def _close_heading(self):
+        tag, level, attrs, index, parts = self.heading
+        self.heading = None
+        title = " ".join("".join(parts).split())
+        base = slugify(title) or "section"
+        anchor, counter = base, 2
+        while anchor in self.used_ids:
+            anchor = f"{base}-{counter}"
+            counter += 1
+        self.used_ids.add(anchor)
+        self.html[index] = f'<{tag} id="{anchor}"{self._attributes(tag, attrs)}>'
+        if title:
+            self.toc.append({"level": level, "id": anchor, "title": title})
+
+    def handle_data(self, data):
+        if self.dropping:
+            return
+        self.html.append(escape(data, quote=False))
+        self.text.append(data)
+        if self.heading:
+            self.heading[4].append(data)
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.handle_endtag(self.open_tags[-1])
+
+
+def render_post_body(content, excerpt=""):
+    """
+    Returns a dict with the sanitized body HTML, its plain text, a meta
+    description (the excerpt if given), word count, reading time in minutes
+    and a table of contents [{"level", "id", "title"}, ...].
+    """
+    renderer = _PostBodyRenderer()
+    renderer.feed(content or "")
+    renderer.close()
+    plain_text = " ".join("".join(renderer.text).split())
+    word_count = len(plain_text.split())
+
+    summary_source = plain_text
+    if excerpt:
+        excerpt_renderer = _PostBodyRenderer()
+        excerpt_renderer.feed(excerpt)
+        excerpt_renderer.close()
+        summary_source = " ".join("".join(excerpt_renderer.text).split()) or plain_text
+    meta_description = Truncator(summary_source).words(META_DESCRIPTION_WORDS, truncate="...")
+
+    return {
+        "rendered_content": "".join(renderer.html),
+        "plain_text": plain_text,
+        "meta_description": meta_description[:300],
+        "word_count": word_count,
+        "reading_time": math.ceil(word_count / WORDS_PER_MINUTE) if word_count else 0,
+        "table_of_contents": renderer.toc,
+    }
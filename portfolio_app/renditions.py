@@ -0,0 +1,295 @@
+# portfolio_app/renditions.py
+#
+# Responsive image renditions.
+#
+# Every uploaded image (PortfolioImage.image, PortfolioProject.featured_image,
+# BlogPost.featured_image) gets WebP and JPEG copies at the widths in
+# settings.IMAGE_RENDITION_WIDTHS, saved next to the original as
+# "<name>-<width>w.<ext>" and recorded as ImageRendition rows. Templates read
+# them through the {% srcset %} tag (templatetags/image_tags.py) and the
+# projects API through aget_renditions_bulk(); both go through the cache so a
+# warm page does not touch the ImageRendition table.
+#
+# Saves queue generate_renditions_for() on the job pool (signals.py), off the
+# request; re-saving a model whose image already has its renditions costs one
+# ImageRendition query and never opens the file. A run that changes the set
+# invalidates once, afterwards: the FRAGMENT_MEDIA tag for card srcsets and
+# the caches of the model that owns the image (PORTFOLIO for projects and
+# gallery images, BLOG and the post's pages for blog posts).
+
+import hashlib
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+
+try:
+    from PIL import Image as PillowImage
+    from PIL import ImageOps
+except ImportError:
+    PillowImage = None
+    ImageOps = None
+
+from .caching import BLOG, PORTFOLIO, bump_content_version, bump_tags
+from .fragments import FRAGMENT_MEDIA
+from .models import BlogPost, ImageRendition
+from .pagecache import purge_blog_pages
+
+logger = logging.getLogger(__name__)
+
+RENDITION_CACHE_KEY = "portfolio_app:renditions:{digest}"
+
+FORMAT_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+
+def rendition_name(source_name, width, image_format):
+    """portfolio_gallery/slug/shot.png -> portfolio_gallery/slug/shot-480w.webp"""
+    stem = os.path.splitext(source_name)[0]
+    return f"{stem}-{width}w.{FORMAT_EXTENSIONS[image_format]}"
+
+
+def _cache_key(source_name):
+    digest = hashlib.md5(source_name.encode()).hexdigest()
+    return RENDITION_CACHE_KEY.format(digest=digest)
+
+
+def _prepare_for_format(image, image_format):
+    """JPEG has no alpha channel, so transparent areas are flattened onto white."""
+    if image_format == "JPEG" and image.mode != "RGB":
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = PillowImage.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            return background
+        return image.convert("RGB")
+    if image_format == "WEBP" and image.mode not in ("RGB", "RGBA"):
+        return image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    return image
+
+
+# EXIF orientations that rotate the image by 90 degrees (width and height swap).
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def _missing_renditions(existing, source_width):
+    return [
+        (image_format, width)
+        for width in settings.IMAGE_RENDITION_WIDTHS
+        if width < source_width
+        for image_format in settings.IMAGE_RENDITION_FORMATS
+        if (image_format, width) not in existing
+    ]
+
+
+def _oriented_width(image):
+    """The width after EXIF rotation, read from the header without decoding."""
+    orientation = image.getexif().get(0x0112)
+    return image.height if orientation in _ROTATED_ORIENTATIONS else image.width
+
+
+def generate_renditions(field_file, force=False):
+    """
+    Creates the missing renditions for an image FieldFile and returns the
+    ImageRendition rows that exist for it afterwards. Widths at or above the
+    original width are skipped (upscaling only adds bytes). With force=True
+    existing renditions are deleted and rebuilt.
+
+    The original is only decoded when a rendition is missing: a complete set
+    is recognised from the stored rows alone, and an image too small for any
+    width from its header.
+    """
+    if PillowImage is None or not field_file:
+        return []
+    source_name = field_file.name
+    removed = delete_renditions(source_name) if force else 0
+    existing = {
+        (r.format, r.width): r
+        for r in ImageRendition.objects.filter(source_name=source_name)
+    }
+    created = _create_missing(field_file, existing)
+    if created:
+        cache.delete(_cache_key(source_name))
+        logger.info(f"Generated {len(created)} rendition(s) for {source_name}")
+    if created or removed:
+        _invalidate_owner(field_file.instance)
+    return list(existing.values())
+
+
+def _create_missing(field_file, existing):
+    """Renders and stores the renditions missing from existing (updated in place)."""
+    source_name = field_file.name
+    storage = field_file.storage
+    if existing:
+        source_width = next(iter(existing.values())).source_width
+        if not _missing_renditions(existing, source_width):
+            return []
+
+    try:
+        with storage.open(source_name, "rb") as source:
+            image = PillowImage.open(source)  # Reads the header only
+            if getattr(image, "is_animated", False):
+                return []  # Keep animated GIFs/WebPs as uploaded
+            if not _missing_renditions(existing, _oriented_width(image)):
+                return []
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except Exception as e:
+        logger.error(f"Could not open image {source_name} for renditions: {e}")
+        return []
+
+    created = []
+    for width in settings.IMAGE_RENDITION_WIDTHS:
+        if width >= image.width:
+            continue
+        height = max(1, round(image.height * width / image.width))
+        resized = None
+        for image_format in settings.IMAGE_RENDITION_FORMATS:
+            if (image_format, width) in existing:
+                continue
+            if resized is None:
+                resized = image.resize((width, height), PillowImage.LANCZOS)
+            buffer = BytesIO()
+            _prepare_for_format(resized, image_format).save(
+                buffer, format=image_format, quality=settings.IMAGE_RENDITION_QUALITY
+            )
+            name = rendition_name(source_name, width, image_format)
+            if storage.exists(name):
+                storage.delete(name)
+            saved_name = storage.save(name, ContentFile(buffer.getvalue()))
+            rendition, _ = ImageRendition.objects.update_or_create(
+                source_name=source_name,
+                format=image_format,
+                width=width,
+                defaults={
+                    "source_width": image.width,
+                    "height": height,
+                    "file": saved_name,
+                },
+            )
+            existing[(image_format, width)] = rendition
+            created.append(rendition)
+    return created
+
+
+def _invalidate_owner(instance):
+    """Invalidates the cached pages showing an image whose renditions changed."""
+    bump_tags(FRAGMENT_MEDIA)
+    if isinstance(instance, BlogPost):
+        bump_content_version(BLOG)
+        purge_blog_pages(
+            post_slugs=[instance.slug],
+            category_slugs=[instance.category.slug if instance.category_id else None],
+        )
+    else:
+        bump_content_version(PORTFOLIO)
+
+
+def generate_renditions_for(model, pk, field_name):
+    """Job entry point: renditions for an instance's image field, as stored now."""
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is not None:
+        generate_renditions(getattr(instance, field_name))
+
+
+def delete_renditions(source_name):
+    """
+    Removes the rendition files and rows for an original image and returns
+    how many there were. Nothing is invalidated: the owner is being deleted
+    (and invalidates its own caches), or the image is rebuilt or unused.
+    """
+    renditions = list(ImageRendition.objects.filter(source_name=source_name))
+    for rendition in renditions:
+        try:
+            rendition.file.delete(save=False)
+        except Exception as e:
+            logger.warning(f"Could not delete rendition file {rendition.file.name}: {e}")
+    if renditions:
+        ImageRendition.objects.filter(pk__in=[r.pk for r in renditions]).delete()
+    cache.delete(_cache_key(source_name))
+    return len(renditions)
+
+
+def _group(renditions):
+    """
+    Shapes rendition rows for one source as
+    {"source_width": 1920, "WEBP": [(480, url), ...], "JPEG": [...]}.
+    """
+    grouped = {"source_width": None}
+    for rendition in sorted(renditions, key=lambda r: r.width):
+        grouped["source_width"] = rendition.source_width
+        grouped.setdefault(rendition.format, []).append(
+            (rendition.width, rendition.file.url)
+        )
+    return grouped
+
+
+def get_renditions_bulk(source_names):
+    """
+    Returns {source_name: grouped renditions} for many images using one
+    cache.get_many() and, for misses, a single database query.
+    """
+    source_names = [name for name in set(source_names) if name]
+    keys = {_cache_key(name): name for name in source_names}
+    cached = cache.get_many(keys.keys())
+    result = {keys[key]: value for key, value in cached.items()}
+
+    missing = [name for name in source_names if name not in result]
+    if missing:
+        by_source = {name: [] for name in missing}
+        for rendition in ImageRendition.objects.filter(source_name__in=missing):
+            by_source[rendition.source_name].append(rendition)
+        fetched = {name: _group(rows) for name, rows in by_source.items()}
+        cache.set_many(
+            {_cache_key(name): value for name, value in fetched.items()},
+            timeout=None,
+        )
+        result.update(fetched)
+    return result
+
+
+async def aget_renditions_bulk(source_names):
+    """get_renditions_bulk() for async views."""
+    source_names = [name for name in set(source_names) if name]
+    keys = {_cache_key(name): name for name in source_names}
+    cached = await cache.aget_many(keys.keys())
+    result = {keys[key]: value for key, value in cached.items()}
+
+    missing = [name for name in source_names if name not in result]
+    if missing:
+        by_source = {name: [] for name in missing}
+        async for rendition in ImageRendition.objects.filter(source_name__in=missing).aiterator():
+            by_source[rendition.source_name].append(rendition)
+        fetched = {name: _group(rows) for name, rows in by_source.items()}
+        await cache.aset_many(
+            {_cache_key(name): value for name, value in fetched.items()},
+            timeout=None,
+        )
+        result.update(fetched)
+    return result
+
+
+def get_renditions(source_name):
+    if not source_name:
+        return {"source_width": None}
+    return get_renditions_bulk([source_name])[source_name]
+
+
+def build_srcset(field_file, image_format="WEBP"):
+    """
+    Builds a srcset value ("a-480w.webp 480w, a-960w.webp 960w, ...") for an
+    image FieldFile. The original is listed too, at its own width, so large
+    screens are never stuck with a smaller rendition.
+    """
+    if not field_file:
+        return ""
+    image_format = image_format.upper()
+    if image_format == "JPG":
+        image_format = "JPEG"
+    renditions = get_renditions(field_file.name)
+    candidates = [f"{url} {width}w" for width, url in renditions.get(image_format, [])]
+    if candidates and renditions["source_width"]:
+        candidates.append(f"{field_file.url} {renditions['source_width']}w")
+    return ", ".join(candidates)
@@ -0,0 +1,162 @@
+# portfolio_app/replicas.py
+#
+# Read replicas for the public read paths.
+#
+# settings.DATABASE_REPLICAS lists database aliases that hold copies of
+# "default". PrimaryReplicaRouter sends every write to "default" and sends
+# reads to a replica only where that has been allowed:
+#
+#   * views decorated with @replica_reads (home, the blog pages and the
+#     portfolio APIs); everything else, staff views and api_contact_submit
+#     included, reads from the primary
+#   * code wrapped in `with replica_reads():`, such as
+#     PortfolioProject.get_first_image()
+#
+# Replicas lag behind the primary, so a request that writes must see its own
+# writes: from the first write on, ReplicaRoutingMiddleware pins the rest of
+# the request to the primary. It also sets a short-lived cookie so the same
+# client's next requests (typically the redirect after a POST) stay on the
+# primary for DATABASE_PRIMARY_STICKY_SECONDS.
+#
+# The routing state lives in a ContextVar holding a mutable object, so the
+# router sees the same state from async views and from the sync_to_async
+# threads their ORM calls run on. Outside a request nothing is pinned and
+# only replica_reads() blocks use replicas. With no replicas configured
+# every query goes to "default".
+#
+# For a local stand-in, point DJANGO_SQLITE_REPLICAS at one or more SQLite
+# files and copy the primary into them with `manage.py sync_sqlite_replicas`
+# (re-run it to simulate replication catching up).
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_COOKIE = "use_primary_db"
+
+_routing = ContextVar("replica_routing", default=None)
+
+
+class RoutingState:
+    """Whether replicas may serve reads in the current context, and which one."""
+
+    def __init__(self, allow_replicas=False, pinned=False):
+        self.allow_replicas = allow_replicas
+        self.pinned = pinned
+        self.wrote = False
+        self.replica = None
+
+    def read_alias(self):
+        if self.pinned or not self.allow_replicas or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        if self.replica not in settings.DATABASE_REPLICAS:
+            self.replica = random.choice(settings.DATABASE_REPLICAS)  # One replica per request
+        return self.replica
+
+
+def replica_reads(view_func=None):
+    """
+    As a view decorator, lets the view's reads go to a replica. As a context
+    manager (`with replica_reads():`), does the same for the enclosed code
+    unless the current request has already written.
+    """
+    if view_func is not None:
+        view_func.replica_reads = True
+        return view_func
+    return _replica_reads_block()
+
+
+@contextmanager
+def _replica_reads_block():
+    state = _routing.get()
+    if state is None:
+        token = _routing.set(RoutingState(allow_replicas=True))
+        try:
+            yield
+        finally:
+            _routing.reset(token)
+        return
+    previous, state.allow_replicas = state.allow_replicas, True
+    try:
+        yield
+    finally:
+        state.allow_replicas = previous
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        return state.read_alias() if state is not None else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary.
+        return False if db in settings.DATABASE_REPLICAS else None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Sets up the routing state for each request: replica reads for views
+    marked with @replica_reads, primary reads after a write. Place it before
+    SessionMiddleware so session writes pin the request too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self._finish(state, response)
+
+    async def __acall__(self, request):
+        state, token = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self._finish(state, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._replica_routing.allow_replicas = getattr(view_func, "replica_reads", False)
+
+    def _start(self, request):
+        state = RoutingState(pinned=PRIMARY_COOKIE in request.COOKIES)
+        request._replica_routing = state
+        return state, _routing.set(state)
+
+    def _finish(self, state, response):
+        if state.wrote and settings.DATABASE_REPLICAS and settings.DATABASE_PRIMARY_STICKY_SECONDS:
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                "1",
+                max_age=settings.DATABASE_PRIMARY_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
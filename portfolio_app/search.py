@@ -0,0 +1,412 @@
+# portfolio_app/search.py
+#
+# Full-text search over blog posts and coding projects.
+#
+# A single search table mirrors BlogPost (title/excerpt/content) and
+# PortfolioProject (title/short_description/details/technologies_used):
+#   * SQLite:   an FTS5 virtual table ranked with bm25().
+#   * Postgres: a regular table with a weighted, generated tsvector column and
+#               a GIN index, ranked with ts_rank().
+# Other backends fall back to icontains queries. The table is created after
+# `migrate` (post_migrate), kept in sync by signals (signals.py) and can be
+# rebuilt with `manage.py rebuild_search_index`. Visibility (status, is_active,
+# publish date) is stored alongside each row so public searches need no join.
+
+import logging
+import re
+from datetime import timezone as dt_timezone
+from functools import reduce
+from operator import or_
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape, strip_tags
+
+from .models import BlogPost, PortfolioProject
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "portfolio_app_search"
+
+BLOG = "blog"
+PROJECT = "project"
+
+# Snippet highlight markers; swapped for <mark> tags after HTML-escaping.
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+
+# --- Documents ---
+def _document(obj):
+    if isinstance(obj, BlogPost):
+        return {
+            "kind": BLOG,
+            "object_id": obj.pk,
+            "slug": obj.slug,
+            "visible": obj.status == "PUBLISHED" and obj.is_active,
+            "published_at": obj.published_date,
+            "title": obj.title,
+            "summary": obj.excerpt or "",
+            "body": obj.plain_text,
+            "extra": obj.category.name if obj.category_id else "",
+        }
+    return {
+        "kind": PROJECT,
+        "object_id": obj.pk,
+        "slug": obj.slug,
+        "visible": obj.is_active,
+        "published_at": None,
+        "title": obj.title,
+        "summary": obj.short_description or "",
+        "body": strip_tags(obj.details or ""),
+        "extra": obj.technologies_used or "",
+    }
+
+
+def _kind_for_model(model):
+    return BLOG if issubclass(model, BlogPost) else PROJECT
+
+
+def _result_url(kind, slug):
+    if kind == BLOG:
+        return reverse("portfolio_app:blog_post_detail", kwargs={"slug": slug})
+    return f"{reverse('portfolio_app:portfolio_showcase_react')}#{slug}"
+
+
+def _terms(query):
+    """Splits user input into word tokens so it can never break MATCH syntax."""
+    return re.findall(r"\w+", query.lower())[:10]
+
+
+def _highlight(snippet):
+    return (
+        escape(snippet or "")
+        .replace(_MARK_START, "<mark>")
+        .replace(_MARK_END, "</mark>")
+    )
+
+
+def _sqlite_timestamp(value):
+    """Fixed-width UTC text, so FTS5 (untyped) columns compare chronologically."""
+    return value.astimezone(dt_timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+# --- Backends ---
+class SQLiteFTS5Backend:
+    create_sql = (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "kind UNINDEXED, object_id UNINDEXED, slug UNINDEXED, visible UNINDEXED, "
+        "published_at UNINDEXED, title, summary, body, extra, "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    # No porter stemming: queries are prefix matches ("runn" -> running), and
+    # stemmed tokens ("run") would not match a half-typed word.
+    # bm25() weights per column, in table order: title > summary/extra > body.
+    rank_sql = f"bm25({SEARCH_TABLE}, 0, 0, 0, 0, 0, 10.0, 4.0, 1.0, 3.0)"
+
+    def ensure_table(self, cursor):
+        cursor.execute(self.create_sql)
+
+    def upsert(self, cursor, doc):
+        self.delete(cursor, doc["kind"], doc["object_id"])
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (kind, object_id, slug, visible, published_at, "
+            "title, summary, body, extra) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            [
+                doc["kind"],
+                doc["object_id"],
+                doc["slug"],
+                int(doc["visible"]),
+                (
+                    _sqlite_timestamp(doc["published_at"])
+                    if doc["published_at"]
+                    else None
+                ),
+                doc["title"],
+                doc["summary"],
+                doc["body"],
+                doc["extra"],
+            ],
+        )
+
+    def delete(self, cursor, kind, object_id):
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE kind = %s AND object_id = %s",
+            [kind, object_id],
+        )
+
+    def clear(self, cursor):
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+    def ids_sql(self, terms, kind):
+        match = " ".join(f'"{term}"*' for term in terms)
+        return (
+            f"SELECT object_id FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s AND kind = %s",
+            [match, kind],
+        )
+
+    def query(self, cursor, terms, kinds, public_only, limit):
+        match = " ".join(f'"{term}"*' for term in terms)
+        sql = (
+            f"SELECT kind, object_id, slug, title, "
+            f"snippet({SEARCH_TABLE}, -1, char(2), char(3), '…', 16), {self.rank_sql} "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s"
+        )
+        params = [match]
+        sql += f" AND kind IN ({', '.join(['%s'] * len(kinds))})"
+        params += kinds
+        if public_only:
+            sql += " AND visible = 1 AND (published_at IS NULL OR published_at <= %s)"
+            params.append(_sqlite_timestamp(timezone.now()))
+        sql += " ORDER BY 6"
+        if limit:
+            sql += " LIMIT %s"
+            params.append(limit)
+        cursor.execute(sql, params)
+        # bm25() is "lower is better"; flip it so higher scores rank higher.
+        return [
+            (kind, object_id, slug, title, snippet, -score)
+            for kind, object_id, slug, title, snippet, score in cursor.fetchall()
+        ]
+
+
+class PostgresBackend:
+    create_sql = [
+        f"""CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+            kind varchar(10) NOT NULL,
+            object_id bigint NOT NULL,
+            slug varchar(270) NOT NULL,
+            visible boolean NOT NULL,
+            published_at timestamp with time zone NULL,
+            title text NOT NULL,
+            summary text NOT NULL,
+            body text NOT NULL,
+            extra text NOT NULL,
+            document tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', title), 'A') ||
+                setweight(to_tsvector('english', summary), 'B') ||
+                setweight(to_tsvector('english', extra), 'B') ||
+                setweight(to_tsvector('english', body), 'C')
+            ) STORED,
+            PRIMARY KEY (kind, object_id)
+        )""",
+        f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx "
+        f"ON {SEARCH_TABLE} USING GIN (document)",
+    ]
+
+    def ensure_table(self, cursor):
+        for statement in self.create_sql:
+            cursor.execute(statement)
+
+    def upsert(self, cursor, doc):
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (kind, object_id, slug, visible, published_at, "
+            "title, summary, body, extra) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) "
+            "ON CONFLICT (kind, object_id) DO UPDATE SET slug = EXCLUDED.slug, "
+            "visible = EXCLUDED.visible, published_at = EXCLUDED.published_at, "
+            "title = EXCLUDED.title, summary = EXCLUDED.summary, body = EXCLUDED.body, "
+            "extra = EXCLUDED.extra",
+            [
+                doc["kind"],
+                doc["object_id"],
+                doc["slug"],
+                doc["visible"],
+                doc["published_at"],
+                doc["title"],
+                doc["summary"],
+                doc["body"],
+                doc["extra"],
+            ],
+        )
+
+    def delete(self, cursor, kind, object_id):
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE kind = %s AND object_id = %s",
+            [kind, object_id],
+        )
+
+    def clear(self, cursor):
+        cursor.execute(f"TRUNCATE {SEARCH_TABLE}")
+
+    def ids_sql(self, terms, kind):
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        return (
+            f"SELECT object_id FROM {SEARCH_TABLE} "
+            "WHERE kind = %s AND document @@ to_tsquery('english', %s)",
+            [kind, tsquery],
+        )
+
+    def query(self, cursor, terms, kinds, public_only, limit):
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        sql = (
+            "SELECT kind, object_id, slug, title, "
+            "ts_headline('english', summary || ' ' || body, q, "
+            "'StartSel=\x02, StopSel=\x03, MaxWords=30, MinWords=12'), "
+            f"ts_rank(document, q) FROM {SEARCH_TABLE}, to_tsquery('english', %s) q "
+            "WHERE document @@ q"
+        )
+        params = [tsquery]
+        sql += f" AND kind IN ({', '.join(['%s'] * len(kinds))})"
+        params += kinds
+        if public_only:
+            sql += " AND visible AND (published_at IS NULL OR published_at <= %s)"
+            params.append(timezone.now())
+        sql += " ORDER BY 6 DESC"
+        if limit:
+            sql += " LIMIT %s"
+            params.append(limit)
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def get_backend(vendor=None):
+    vendor = vendor or connection.vendor
+    if vendor == "sqlite":
+        return SQLiteFTS5Backend()
+    if vendor == "postgresql":
+        return PostgresBackend()
+    return None
+
+
+# --- Public API ---
+def ensure_search_table(using=DEFAULT_DB_ALIAS):
+    backend = get_backend(connections[using].vendor)
+    if backend is None:
+        return
+    with connections[using].cursor() as cursor:
+        backend.ensure_table(cursor)
+
+
+def index_object(obj):
+    backend = get_backend()
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        backend.upsert(cursor, _document(obj))
+
+
+def index_objects(queryset):
+    """Re-indexes every object in a queryset, e.g. after a bulk queryset.update()."""
+    backend = get_backend()
+    if backend is None:
+        return
+    if queryset.model is BlogPost:
+        queryset = queryset.select_related("category")
+    with connection.cursor() as cursor:
+        for obj in queryset.iterator(chunk_size=500):
+            backend.upsert(cursor, _document(obj))
+
+
+def remove_object(model, object_id):
+    backend = get_backend()
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        backend.delete(cursor, _kind_for_model(model), object_id)
+
+
+def rebuild_index():
+    """Re-indexes every post and project. Returns the number of documents written."""
+    backend = get_backend()
+    if backend is None:
+        return 0
+    count = 0
+    with connection.cursor() as cursor:
+        backend.ensure_table(cursor)
+        backend.clear(cursor)
+        for queryset in (
+            BlogPost.objects.select_related("category"),
+            PortfolioProject.objects.all(),
+        ):
+            for obj in queryset.iterator(chunk_size=500):
+                backend.upsert(cursor, _document(obj))
+                count += 1
+    return count
+
+
+def search(query, kinds=(BLOG, PROJECT), public_only=True, limit=20):
+    """
+    Returns ranked hits as dicts with type, id, title, url, snippet (HTML with
+    <mark> highlights, everything else escaped) and score.
+    """
+    terms = _terms(query)
+    if not terms or not kinds:
+        return []
+    backend = get_backend()
+    if backend is None:
+        return _fallback_search(terms, kinds, public_only, limit)
+    with connection.cursor() as cursor:
+        rows = backend.query(cursor, terms, list(kinds), public_only, limit)
+    return [
+        {
+            "type": kind,
+            "id": int(object_id),
+            "title": title,
+            "url": _result_url(kind, slug),
+            "snippet": _highlight(snippet),
+            "score": round(float(score), 4),
+        }
+        for kind, object_id, slug, title, snippet, score in rows
+    ]
+
+
+def filter_queryset(queryset, query):
+    """
+    Narrows a queryset to the objects matching query (drafts included), for
+    the admin. The match runs as a subquery on the search table, so no id
+    list is built in Python however many objects match.
+    """
+    terms = _terms(query)
+    if not terms:
+        return queryset.none()
+    kind = _kind_for_model(queryset.model)
+    backend = get_backend()
+    if backend is None:
+        return queryset.filter(_fallback_filter(kind, terms))
+    sql, params = backend.ids_sql(terms, kind)
+    return queryset.filter(pk__in=RawSQL(sql, params))
+
+
+def _fallback_filter(kind, terms):
+    fields = (
+        ("title", "excerpt", "content")
+        if kind == BLOG
+        else ("title", "short_description", "details", "technologies_used")
+    )
+    condition = Q()
+    for term in terms:
+        condition &= reduce(or_, (Q(**{f"{field}__icontains": term}) for field in fields))
+    return condition
+
+
+def _fallback_search(terms, kinds, public_only, limit):
+    """icontains search for databases without a full-text backend."""
+    hits = []
+    if BLOG in kinds:
+        posts = BlogPost.objects.filter(_fallback_filter(BLOG, terms))
+        if public_only:
+            posts = posts.filter(
+                status="PUBLISHED", is_active=True, published_date__lte=timezone.now()
+            )
+        hits += [(BLOG, p.pk, p.slug, p.title, p.excerpt) for p in posts[:limit]]
+    if PROJECT in kinds:
+        projects = PortfolioProject.objects.filter(_fallback_filter(PROJECT, terms))
+        if public_only:
+            projects = projects.filter(is_active=True)
+        hits += [
+            (PROJECT, p.pk, p.slug, p.title, p.short_description)
+            for p in projects[:limit]
+        ]
+    return [
+        {
+            "type": kind,
+            "id": object_id,
+            "title": title,
+            "url": _result_url(kind, slug),
+            "snippet": escape(snippet),
+            "score": 0,
+        }
+        for kind, object_id, slug, title, snippet in hits[:limit]
+    ]
@@ -0,0 +1,255 @@
+# portfolio_app/servertiming.py
+#
+# Server-Timing breakdown for a request.
+#
+# ServerTimingMiddleware splits the time spent in the view stack into:
+#
+#     db    - SQL, via the query recorder of querybudget.py (or its own)
+#     cache - calls on the configured cache backends
+#     tpl   - template rendering, excluding the db/cache time spent inside it
+#             (lazy querysets are often evaluated by the template)
+#     app   - everything else
+#
+# and sends them with counts as a Server-Timing header, which browser devtools
+# show under Network > Timing, e.g.
+#
+#     Server-Timing: db;dur=4.1;desc="6 queries", cache;dur=0.3;desc="4 calls",
+#                    tpl;dur=9.8;desc="1 template", app;dur=2.2, total;dur=16.4
+#
+# The same breakdown is logged on this module's logger for the log pipeline.
+#
+# Timing is opt-in: staff always get it (SERVER_TIMING_STAFF) and everyone
+# else is sampled at SERVER_TIMING_SAMPLE_RATE. Requests that are not timed
+# only pay for one ContextVar lookup per template render.
+#
+# Template time comes from TimedDjangoTemplates, a DjangoTemplates backend
+# whose templates report to the current request's timer. Cache calls are
+# timed by wrapping the request's own cache connections (they are local to
+# the thread/async context), and unwrapped when the request finishes.
+
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.template.backends.django import DjangoTemplates
+
+from .querybudget import QueryRecorder
+
+logger = logging.getLogger(__name__)
+
+HEADER = "Server-Timing"
+CACHE_METHODS = (
+    "get", "get_many", "get_or_set", "set", "set_many", "add", "touch",
+    "delete", "delete_many", "has_key", "incr", "decr",
+)
+
+_current_timer = ContextVar("server_timing", default=None)
+
+
+def _plural(count, singular, plural=None):
+    return f"{count} {singular if count == 1 else plural or singular + 's'}"
+
+
+class RequestTimer:
+    """Accumulates the db/cache/tpl segments of one request."""
+
+    def __init__(self, query_recorder=None):
+        self.recorder = query_recorder
+        self.owns_recorder = query_recorder is None
+        if self.owns_recorder:
+            self.recorder = QueryRecorder()
+        # The query budget recorder may already hold the session/auth queries.
+        self.query_offset = self.recorder.count
+        self.db_offset = self.recorder.duration
+        self.cache_time = 0.0
+        self.cache_calls = 0
+        self.template_time = 0.0
+        self.templates = 0
+        self._cache_depth = 0  # get_or_set() calls get()/add() on itself
+        self._template_depth = 0
+
+    @property
+    def db_time(self):
+        return self.recorder.duration - self.db_offset
+
+    @property
+    def queries(self):
+        return self.recorder.count - self.query_offset
+
+    def _io_time(self):
+        return self.db_time + self.cache_time
+
+    @contextmanager
+    def template(self):
+        self._template_depth += 1
+        start, io_start = time.perf_counter(), self._io_time()
+        try:
+            yield
+        finally:
+            self._template_depth -= 1
+            if not self._template_depth:
+                self.templates += 1
+                self.template_time += (time.perf_counter() - start) - (self._io_time() - io_start)
+
+    def _timed_cache_call(self, method):
+        @wraps(method)
+        def timed(*args, **kwargs):
+            if self._cache_depth:
+                return method(*args, **kwargs)
+            self._cache_depth += 1
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.cache_time += time.perf_counter() - start
+                self.cache_calls += 1
+                self._cache_depth -= 1
+
+        return timed
+
+    def _wrap_cache(self, stack, backend):
+        for name in CACHE_METHODS:
+            setattr(backend, name, self._timed_cache_call(getattr(backend, name)))
+
+        def unwrap():
+            for name in CACHE_METHODS:
+                backend.__dict__.pop(name, None)
+
+        stack.callback(unwrap)
+
+    def record(self):
+        """Installs the db and cache hooks until the returned stack closes."""
+        stack = ExitStack()
+        if self.owns_recorder:
+            stack.enter_context(self.recorder.record())
+        for alias in settings.CACHES:
+            self._wrap_cache(stack, caches[alias])
+        return stack
+
+    def segments(self, total):
+        app = max(total - self.db_time - self.cache_time - self.template_time, 0.0)
+        return [
+            ("db", self.db_time, _plural(self.queries, "query", "queries")),
+            ("cache", self.cache_time, _plural(self.cache_calls, "call")),
+            ("tpl", self.template_time, _plural(self.templates, "template")),
+            ("app", app, None),
+            ("total", total, None),
+        ]
+
+
+def format_header(segments):
+    entries = []
+    for name, seconds, description in segments:
+        entry = f"{name};dur={seconds * 1000:.1f}"
+        if description:
+            entry += f';desc="{description}"'
+        entries.append(entry)
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header to staff and sampled requests. Place it after
+    AuthenticationMiddleware, since the staff check needs request.user.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _sampled():
+        return bool(settings.SERVER_TIMING_SAMPLE_RATE) and random.random() < settings.SERVER_TIMING_SAMPLE_RATE
+
+    @staticmethod
+    def _is_staff(user):
+        return bool(user and user.is_authenticated and user.is_staff)
+
+    def _wanted(self, request):
+        if self._sampled():
+            return True
+        return settings.SERVER_TIMING_STAFF and self._is_staff(getattr(request, "user", None))
+
+    async def _awanted(self, request):
+        if self._sampled():
+            return True
+        if not settings.SERVER_TIMING_STAFF or not hasattr(request, "auser"):
+            return False
+        return self._is_staff(await request.auser())
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._wanted(request):
+            return self.get_response(request)
+        timer = RequestTimer(getattr(request, "query_recorder", None))
+        token = _current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            with timer.record():
+                response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        return self._finish(request, response, timer, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not await self._awanted(request):
+            return await self.get_response(request)
+        timer = RequestTimer(getattr(request, "query_recorder", None))
+        token = _current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            # Database hooks must go on the request's sync worker thread.
+            stack = await sync_to_async(timer.record)()
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current_timer.reset(token)
+        return self._finish(request, response, timer, time.perf_counter() - start)
+
+    def _finish(self, request, response, timer, total):
+        segments = timer.segments(total)
+        response[HEADER] = format_header(segments)
+        logger.info(
+            f"{request.method} {request.path} {response.status_code} "
+            + " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds, _ in segments)
+            + f" queries={timer.queries} cache_calls={timer.cache_calls} templates={timer.templates}"
+        )
+        return response
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        timer = _current_timer.get()
+        if timer is None:
+            return self.template.render(context, request)
+        with timer.template():
+            return self.template.render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, reporting render time to ServerTimingMiddleware."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
@@ -0,0 +1,176 @@
+# portfolio_app/signals.py
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import BLOG, PORTFOLIO, bump_content_version
+from .jobs import submit
+from .pagecache import purge_blog_pages
+from .models import (
+    BlogCategory,
+    BlogPost,
+    PortfolioCategory,
+    PortfolioImage,
+    PortfolioProject,
+    RelatedPost,
+)
+from .related import refresh_related_posts
+from .renditions import delete_renditions, generate_renditions_for
+from . import search
+
+
+# --- Portfolio cache invalidation ---
+@receiver(post_save, sender=PortfolioProject)
+@receiver(post_delete, sender=PortfolioProject)
+@receiver(post_save, sender=PortfolioImage)
+@receiver(post_delete, sender=PortfolioImage)
+@receiver(post_save, sender=PortfolioCategory)
+@receiver(post_delete, sender=PortfolioCategory)
+def invalidate_portfolio_cache(sender, **kwargs):
+    bump_content_version(PORTFOLIO)
+
+
+@receiver(m2m_changed, sender=PortfolioProject.categories.through)
+def invalidate_portfolio_cache_on_categories_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_content_version(PORTFOLIO)
+
+
+@receiver(post_save, sender=PortfolioImage)
+@receiver(post_delete, sender=PortfolioImage)
+def touch_project_on_gallery_change(sender, instance, **kwargs):
+    # The project card shows the first gallery image and is cached on updated_at.
+    PortfolioProject.objects.filter(pk=instance.portfolio_project_id).update(updated_at=timezone.now())
+
+
+# --- Blog cache invalidation ---
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=BlogCategory)
+@receiver(post_delete, sender=BlogCategory)
+def invalidate_blog_cache(sender, **kwargs):
+    bump_content_version(BLOG)
+
+
+# --- Page cache purging ---
+@receiver(pre_save, sender=BlogPost)
+def remember_post_page_slugs(sender, instance, **kwargs):
+    # A post can be renamed or moved; the pages under its old slugs go too.
+    instance._previous_page_slugs = (
+        BlogPost.objects.filter(pk=instance.pk).values_list('slug', 'category__slug').first()
+        if instance.pk else None
+    ) or ()
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def purge_post_pages(sender, instance, **kwargs):
+    previous_slug, previous_category_slug = getattr(instance, '_previous_page_slugs', ()) or (None, None)
+    category_slug = instance.category.slug if instance.category_id else None
+    purge_blog_pages(
+        post_slugs=[instance.slug, previous_slug],
+        category_slugs=[category_slug, previous_category_slug],
+    )
+
+
+@receiver(pre_save, sender=BlogCategory)
+def remember_category_page_slug(sender, instance, **kwargs):
+    instance._previous_page_slug = (
+        BlogCategory.objects.filter(pk=instance.pk).values_list('slug', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=BlogCategory)
+@receiver(post_delete, sender=BlogCategory)
+def purge_category_pages(sender, instance, **kwargs):
+    purge_blog_pages(
+        category_slugs=[instance.slug, getattr(instance, '_previous_page_slug', None)],
+        categories_changed=True,
+    )
+
+
+# --- Blog category counters ---
+@receiver(post_delete, sender=BlogPost)
+def recount_category_posts(sender, instance, **kwargs):
+    # Runs inside the delete's transaction; saves are handled by BlogPost.save().
+    if instance.category_id:
+        BlogCategory.objects.filter(pk=instance.category_id).refresh_post_counts()
+
+
+# --- Related posts ---
+@receiver(post_save, sender=BlogPost)
+def update_related_posts(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) - {'updated_at'}:
+        return
+    post_id = instance.pk
+    transaction.on_commit(lambda: submit(refresh_related_posts, post_id))
+
+
+@receiver(pre_delete, sender=BlogPost)
+def remember_posts_listing(sender, instance, **kwargs):
+    # The CASCADE removes these links before post_delete; keep who listed the post.
+    instance._listed_by = list(
+        RelatedPost.objects.filter(related_id=instance.pk).values_list('post_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=BlogPost)
+def update_related_posts_on_delete(sender, instance, **kwargs):
+    post_id, listed_by = instance.pk, getattr(instance, '_listed_by', [])
+    transaction.on_commit(lambda: submit(refresh_related_posts, post_id, listed_by))
+
+
+# --- Responsive image renditions ---
+# Generated on the job pool once the save commits; generate_renditions() returns
+# without touching the file when the set is already complete.
+def _queue_renditions(instance, field_name):
+    model, pk = type(instance), instance.pk
+    transaction.on_commit(lambda: submit(generate_renditions_for, model, pk, field_name))
+
+
+@receiver(post_save, sender=PortfolioImage)
+def render_gallery_image(sender, instance, **kwargs):
+    if settings.IMAGE_RENDITIONS_ON_SAVE and instance.image:
+        _queue_renditions(instance, 'image')
+
+
+@receiver(post_save, sender=PortfolioProject)
+@receiver(post_save, sender=BlogPost)
+def render_featured_image(sender, instance, **kwargs):
+    if settings.IMAGE_RENDITIONS_ON_SAVE and instance.featured_image:
+        _queue_renditions(instance, 'featured_image')
+
+
+@receiver(post_delete, sender=PortfolioImage)
+def delete_gallery_image_renditions(sender, instance, **kwargs):
+    if instance.image:
+        delete_renditions(instance.image.name)
+
+
+@receiver(post_delete, sender=PortfolioProject)
+@receiver(post_delete, sender=BlogPost)
+def delete_featured_image_renditions(sender, instance, **kwargs):
+    if instance.featured_image:
+        delete_renditions(instance.featured_image.name)
+
+
+# --- Full-text search index ---
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=PortfolioProject)
+def update_search_index(sender, instance, **kwargs):
+    search.index_object(instance)
+
+
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=PortfolioProject)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_object(sender, instance.pk)
+
+
+def create_search_table(sender, using, **kwargs):
+    # Connected to post_migrate in apps.py: the FTS5/tsvector table is raw SQL
+    # that migrations do not manage.
+    search.ensure_search_table(using)
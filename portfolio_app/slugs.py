@@ -0,0 +1,103 @@
+# portfolio_app/slugs.py
+#
+# Unique slug allocation for the sluggable models (PortfolioCategory,
+# PortfolioProject, BlogCategory, BlogPost).
+#
+# Slugs keep the existing scheme ("weekly-notes", "weekly-notes-1",
+# "weekly-notes-2", ...), but instead of probing one candidate per query,
+# allocate_slugs() fetches the existing slugs of that form (the base itself
+# or the base plus a numeric suffix, not every slug that merely starts with
+# it) in a single query and picks free suffixes in memory. It takes a whole batch of unsaved
+# instances, so bulk imports allocate all their slugs with one query too.
+#
+# Two concurrent saves can still pick the same slug between that query and
+# the INSERT; UniqueSlugMixin.save() catches the unique-constraint error and
+# allocates again.
+
+import re
+
+from django.db import IntegrityError, models, transaction
+from django.utils.text import slugify
+
+SUFFIX_RESERVE = 7  # Room for "-" plus up to six digits
+SAVE_ATTEMPTS = 3
+
+
+def _base_slug(instance, source_field, max_length):
+    base = slugify(getattr(instance, source_field) or "")
+    return base[:max_length].strip("-") or instance._meta.model_name
+
+
+def _with_suffix(base, counter, max_length):
+    suffix = f"-{counter}"
+    return f"{base[: max_length - len(suffix)].rstrip('-')}{suffix}"
+
+
+def _taken_pattern(base, max_length):
+    """Matches base itself and every "<base>-<n>" _with_suffix() can produce."""
+    # A long base is cut shorter the longer the suffix, so each cut is a stem.
+    stems = {
+        _with_suffix(base, 10 ** (digits - 1), max_length)[: -digits - 1]
+        for digits in range(1, SUFFIX_RESERVE)
+    }
+    alternatives = "|".join(re.escape(stem) for stem in sorted(stems))
+    return rf"^(?:{re.escape(base)}|(?:{alternatives})-[0-9]+)$"
+
+
+def allocate_slugs(instances, source_field, slug_field="slug"):
+    """
+    Fills in a unique slug on every instance in the batch that has none,
+    using one query for the whole batch. Instances must share a model.
+    """
+    pending = [obj for obj in instances if not getattr(obj, slug_field)]
+    if not pending:
+        return instances
+    model = type(pending[0])
+    max_length = model._meta.get_field(slug_field).max_length
+    bases = {id(obj): _base_slug(obj, source_field, max_length) for obj in pending}
+
+    matches = models.Q()
+    for base in set(bases.values()):
+        matches |= models.Q(**{f"{slug_field}__regex": _taken_pattern(base, max_length)})
+    existing = model._default_manager.filter(matches)
+    own_pks = [obj.pk for obj in pending if obj.pk is not None]
+    if own_pks:
+        existing = existing.exclude(pk__in=own_pks)
+    taken = set(existing.values_list(slug_field, flat=True))
+
+    next_counter = {}
+    for obj in pending:
+        base = bases[id(obj)]
+        candidate = base
+        if candidate in taken:
+            counter = next_counter.get(base, 1)
+            candidate = _with_suffix(base, counter, max_length)
+            while candidate in taken:
+                counter += 1
+                candidate = _with_suffix(base, counter, max_length)
+            next_counter[base] = counter + 1
+        taken.add(candidate)
+        setattr(obj, slug_field, candidate)
+    return instances
+
+
+class UniqueSlugMixin:
+    """
+    Gives a model an auto-allocated unique `slug` from slug_source_field when
+    none is set, retrying when a concurrent save takes the same slug first.
+    """
+    slug_source_field = "name"
+
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+        for attempt in range(1, SAVE_ATTEMPTS + 1):
+            allocate_slugs([self], self.slug_source_field)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                lost_race = type(self)._default_manager.filter(slug=self.slug).exclude(pk=self.pk).exists()
+                if not lost_race or attempt == SAVE_ATTEMPTS:
+                    raise
+                self.slug = ""
@@ -0,0 +1,230 @@
+# portfolio_app/static_export.py
+#
+# Incremental static export of the public site.
+#
+# export_site() renders the public pages and the two portfolio JSON APIs
+# through the normal request/response stack (middleware included) as an
+# anonymous visitor and writes them to an output tree that nginx can serve
+# directly, e.g.
+#
+#     location / {
+#         gzip_static on; brotli_static on;
+#         try_files $uri $uri/index.html $uri/index.json @django;
+#     }
+#
+# Every page has a fingerprint of the rows it is built from. manifest.json
+# remembers the fingerprint each file was written with, so a later run only
+# re-renders pages whose posts, categories or projects changed and removes
+# pages that are no longer public (unpublished posts, inactive categories).
+# List pages are exported at their first page; ?after=/?before= pages and
+# query-string variants still fall through to Django.
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.db.models import Max
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from .compression import FILE_SUFFIXES, precompress
+from .models import (
+    BlogCategory,
+    BlogPost,
+    ImageRendition,
+    PortfolioCategory,
+    PortfolioImage,
+    PortfolioProject,
+    RelatedPost,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+FILE_EXTENSIONS = {"text/html": ".html", "application/json": ".json"}
+MIN_COMPRESS_BYTES = 256
+
+
+def _fingerprint(*parts):
+    payload = repr((settings.PAGE_CACHE_RELEASE,) + parts).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _portfolio_state():
+    """Everything the portfolio APIs and the home page's project cards read."""
+    return (
+        list(PortfolioProject.objects.filter(is_active=True).values_list("pk", "updated_at").order_by("pk")),
+        list(PortfolioCategory.objects.values_list("pk", "name", "slug", "is_active").order_by("pk")),
+        list(PortfolioProject.categories.through.objects.values_list().order_by("pk")),
+        list(PortfolioImage.objects.values_list("pk", "image", "order", "caption").order_by("pk")),
+        ImageRendition.objects.aggregate(latest=Max("created_at"))["latest"],
+    )
+
+
+def page_inventory():
+    """Returns {path: fingerprint} for every page the export should contain."""
+    now = timezone.now()
+    page_size = settings.BLOG_POSTS_PER_PAGE
+    live_posts = list(
+        BlogPost.objects.filter(status=BlogPost.PUBLISHED, is_active=True, published_date__lte=now)
+        .order_by("-published_date", "-pk")
+        .values_list("pk", "slug", "updated_at", "category_id", "author_id")
+    )
+    live_ids = {pk for pk, *_ in live_posts}
+    categories = {
+        pk: row
+        for pk, *row in BlogCategory.objects.values_list("pk", "slug", "name", "description", "is_active")
+    }
+    sidebar = sorted((pk, row[0], row[1]) for pk, row in categories.items() if row[3])
+    related = {}
+    for post_id, related_id, rank in RelatedPost.objects.values_list("post_id", "related_id", "rank"):
+        if related_id in live_ids:
+            related.setdefault(post_id, []).append((rank, related_id))
+    post_rows = {row[0]: row for row in live_posts}
+    portfolio = _portfolio_state()
+
+    pages = {
+        reverse("portfolio_app:home"): _fingerprint(live_posts[:3], sidebar, portfolio),
+        reverse("portfolio_app:about_us"): _fingerprint(),
+        reverse("portfolio_app:portfolio_showcase_react"): _fingerprint(),
+        reverse("portfolio_app:api_portfolio_projects"): _fingerprint(portfolio),
+        reverse("portfolio_app:api_portfolio_categories"): _fingerprint(portfolio),
+        reverse("portfolio_app:blog_list"): _fingerprint(live_posts[: page_size + 1], sidebar),
+    }
+    for pk, (slug, name, description, is_active) in categories.items():
+        if not is_active:
+            continue
+        in_category = [row for row in live_posts if row[3] == pk][: page_size + 1]
+        path = reverse("portfolio_app:blog_category_list", kwargs={"slug": slug})
+        pages[path] = _fingerprint(in_category, (slug, name, description), sidebar)
+    for pk, slug, updated_at, category_id, author_id in live_posts:
+        neighbours = [post_rows[related_id] for _, related_id in sorted(related.get(pk, []))[:3]]
+        path = reverse("portfolio_app:blog_post_detail", kwargs={"slug": slug})
+        pages[path] = _fingerprint(
+            (pk, updated_at, author_id), categories.get(category_id), neighbours, sidebar
+        )
+    return pages
+
+
+class _Renderer:
+    """Runs GET requests through the full middleware stack without a server."""
+
+    def __init__(self, base_url):
+        scheme, _, host = base_url.partition("://")
+        self.secure = scheme == "https"
+        self.host = host.rstrip("/") or "localhost"
+        self.factory = RequestFactory()
+        self.handler = BaseHandler()
+        self.handler.load_middleware()
+
+    def get(self, path):
+        request = self.factory.get(path, HTTP_HOST=self.host, secure=self.secure)
+        return self.handler.get_response(request)
+
+
+def _file_for(path, content_type):
+    extension = FILE_EXTENSIONS.get(content_type.split(";")[0].strip(), ".html")
+    return path.strip("/") + ("/" if path.strip("/") else "") + "index" + extension
+
+
+def _write_atomic(target, data):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_name(target.name + ".tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, target)
+
+
+def _write_page(output_dir, relative_name, content):
+    target = output_dir / relative_name
+    _write_atomic(target, content)
+    encodings = []
+    variants = precompress(content, MIN_COMPRESS_BYTES)
+    for encoding, suffix in FILE_SUFFIXES.items():
+        sibling = target.with_name(target.name + suffix)
+        if encoding not in variants:
+            sibling.unlink(missing_ok=True)
+            continue
+        _write_atomic(sibling, variants[encoding])
+        encodings.append(encoding)
+    return encodings
+
+
+def _remove_page(output_dir, relative_name):
+    target = output_dir / relative_name
+    for name in (target.name, *(target.name + suffix for suffix in FILE_SUFFIXES.values())):
+        target.with_name(name).unlink(missing_ok=True)
+
+
+def load_manifest(output_dir):
+    try:
+        return json.loads((Path(output_dir) / MANIFEST_NAME).read_text())
+    except (FileNotFoundError, ValueError):
+        return {"pages": {}}
+
+
+def export_site(output_dir, base_url="http://localhost", full=False):
+    """
+    Brings output_dir up to date and returns a summary dict with the paths
+    rendered, skipped (unchanged), removed and failed.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest(output_dir)
+    if previous.get("base_url") != base_url:
+        full = True  # Absolute URLs in the APIs depend on it
+    old_pages = previous.get("pages", {})
+    inventory = page_inventory()
+    renderer = None
+    summary = {"rendered": [], "skipped": [], "removed": [], "failed": []}
+    pages = {}
+
+    for path, fingerprint in sorted(inventory.items()):
+        entry = old_pages.get(path)
+        if (
+            not full
+            and entry
+            and entry["fingerprint"] == fingerprint
+            and (output_dir / entry["file"]).exists()
+        ):
+            pages[path] = entry
+            summary["skipped"].append(path)
+            continue
+        renderer = renderer or _Renderer(base_url)
+        response = renderer.get(path)
+        if response.status_code != 200 or response.streaming:
+            logger.warning(f"Static export skipped {path}: HTTP {response.status_code}")
+            summary["failed"].append(path)
+            if entry:
+                pages[path] = entry  # Keep serving the last good copy
+            continue
+        content_type = response.get("Content-Type", "text/html")
+        relative_name = _file_for(path, content_type)
+        encodings = _write_page(output_dir, relative_name, response.content)
+        pages[path] = {
+            "file": relative_name,
+            "fingerprint": fingerprint,
+            "content_type": content_type,
+            "sha256": hashlib.sha256(response.content).hexdigest(),
+            "bytes": len(response.content),
+            "encodings": encodings,
+            "exported_at": timezone.now().isoformat(),
+        }
+        summary["rendered"].append(path)
+
+    for path, entry in old_pages.items():
+        if path not in inventory:
+            _remove_page(output_dir, entry["file"])
+            summary["removed"].append(path)
+
+    manifest = {
+        "base_url": base_url,
+        "generated_at": timezone.now().isoformat(),
+        "pages": pages,
+    }
+    _write_atomic(output_dir / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return summary
@@ -0,0 +1,67 @@
+# portfolio_app/staticstorage.py
+#
+# Precompressed static files.
+#
+# CompressedStaticFilesStorage is StaticFilesStorage with a collectstatic
+# post-processing step: every collected file gets .gz and (with the optional
+# `brotli` package) .br siblings at maximum compression, so the web server
+# serves static files compressed without compressing anything per request:
+#
+#     location /static/ {
+#         gzip_static on; brotli_static on;
+#     }
+#
+# Formats that are compressed already (images, fonts, archives, media) and
+# files below settings.COMPRESSION_MIN_SIZE are skipped, and so is an encoding
+# that would not make the file smaller. Siblings newer than their file are
+# kept, so a re-run of collectstatic only compresses what changed.
+
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import StaticFilesStorage
+from django.core.files.base import ContentFile
+
+from .compression import FILE_SUFFIXES, precompress
+
+ALREADY_COMPRESSED = {
+    ".avif", ".br", ".gif", ".gz", ".ico", ".jpeg", ".jpg", ".mp3", ".mp4", ".ogg",
+    ".pdf", ".png", ".webm", ".webp", ".woff", ".woff2", ".zip",
+}
+
+
+class CompressedStaticFilesStorage(StaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+        for name in sorted(paths):
+            if os.path.splitext(name)[1].lower() in ALREADY_COMPRESSED:
+                continue
+            if self._siblings_current(name):
+                continue
+            written = self._compress(name)
+            if written:
+                yield name, ", ".join(written), True
+
+    def _siblings_current(self, name):
+        siblings = [
+            name + suffix for suffix in FILE_SUFFIXES.values() if self.exists(name + suffix)
+        ]
+        if not siblings:
+            return False
+        modified = self.get_modified_time(name)
+        return all(self.get_modified_time(sibling) >= modified for sibling in siblings)
+
+    def _compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        variants = precompress(content, settings.COMPRESSION_MIN_SIZE)
+        written = []
+        for encoding, suffix in FILE_SUFFIXES.items():
+            sibling = name + suffix
+            if self.exists(sibling):
+                self.delete(sibling)  # save() would pick a new name instead of overwriting
+            if encoding in variants:
+                self.save(sibling, ContentFile(variants[encoding]))
+                written.append(sibling)
+        return written
@@ -1,16 +1,19 @@
 # LehmanCustomConstruction/templatetags/auth_extras.py
 from django import template
-from django.contrib.auth.models import Group
 
 register = template.Library()
 
 @register.filter(name='has_group')
 def has_group(user, group_name):
-    """ Checks if a user belongs to a specific group. """
-    if user.is_authenticated:
-        try:
-            group = Group.objects.get(name=group_name)
-            return group in user.groups.all()
-        except Group.DoesNotExist:
-            return False
-    return False
\ No newline at end of file
+    """
+    Checks if a user belongs to a specific group. The user's group names are
+    fetched once and kept on the user object, so repeated checks in one
+    request (navbar, sidebar, page body) cost a single query.
+    """
+    if not user.is_authenticated:
+        return False
+    group_names = getattr(user, '_group_names', None)
+    if group_names is None:
+        group_names = set(user.groups.values_list('name', flat=True))
+        user._group_names = group_names
+    return group_name in group_names
@@ -0,0 +1,69 @@
+# portfolio_app/templatetags/fragment_tags.py
+import hashlib
+
+from django import template
+
+from ..fragments import get_or_render
+
+register = template.Library()
+
+
+class FragmentCacheNode(template.Node):
+    def __init__(self, nodelist, name, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+        self._source_digest = None
+
+    def source_digest(self):
+        """Hash of the template file the tag sits in, so an edited template gets new keys."""
+        if self._source_digest is None:
+            try:
+                source = self.origin.loader.get_contents(self.origin)
+            except (AttributeError, template.TemplateDoesNotExist):
+                source = ""  # Template.from_string(): no file to hash
+            self._source_digest = hashlib.md5(source.encode()).hexdigest()
+        return self._source_digest
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        vary_on = [self.source_digest()] + [value.resolve(context) for value in self.vary_on]
+        return get_or_render(
+            name, vary_on, lambda: self.nodelist.render(context), request=context.get("request")
+        )
+
+
+@register.tag(name="fragment_cache")
+def do_fragment_cache(parser, token):
+    """
+    Caches the enclosed HTML keyed on the fragment name and the given values;
+    model instances are keyed on their pk and updated_at (see fragments.py).
+    Usage: {% fragment_cache "blog_card" post post.category.slug %} ... {% endfragment_cache %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires at least a fragment name.")
+    nodelist = parser.parse(("endfragment_cache",))
+    parser.delete_first_token()
+    return FragmentCacheNode(
+        nodelist, parser.compile_filter(bits[1]), [parser.compile_filter(bit) for bit in bits[2:]]
+    )
+
+
+@register.filter
+def nav_section(path):
+    """
+    The navbar link a path marks active: "home", "about", "portfolio", "blog",
+    "staff" or "". The cached navbar is keyed on this rather than on the path.
+    """
+    if path == "/":
+        return "home"
+    if path == "/about/":
+        return "about"
+    if path == "/portfolio/":
+        return "portfolio"
+    if path == "/blog/" or "blog/category" in path:
+        return "blog"
+    if "/staff/" in path:
+        return "staff"
+    return ""
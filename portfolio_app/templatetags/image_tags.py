@@ -0,0 +1,15 @@
+# portfolio_app/templatetags/image_tags.py
+from django import template
+
+from ..renditions import build_srcset
+
+register = template.Library()
+
+
+@register.simple_tag
+def srcset(image, image_format="webp"):
+    """
+    Returns the srcset for an ImageField value's renditions, or "" if it has none.
+    Usage: {% srcset project.featured_image "webp" as webp_srcset %}
+    """
+    return build_srcset(image, image_format)
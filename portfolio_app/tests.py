@@ -1,3 +1,181 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from io import BytesIO
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.core.files.base import ContentFile
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import path
+from django.utils import timezone
+
+from PIL import Image as PillowImage
+
+from .benchmark import seed_benchmark_data
+from .caching import BLOG, PORTFOLIO, get_content_version
+from .fragments import FRAGMENT_MEDIA
+from .models import BlogCategory, BlogPost, ImageRendition, RelatedPost
+from .pagination import encode_cursor
+from .querybudget import QueryBudgetExceeded, load_stats, query_budget, reset_stats
+from .queryplans import check_query_plans
+from .renditions import generate_renditions
+from .slugs import allocate_slugs
+
+
+@query_budget(2)
+def _two_queries(request):
+    BlogCategory.objects.count()
+    BlogCategory.objects.exists()
+    return HttpResponse("ok")
+
+
+@query_budget(2)
+def _three_queries(request):
+    for _ in range(3):
+        BlogCategory.objects.count()
+    return HttpResponse("ok")
+
+
+urlpatterns = [
+    path("within-budget/", _two_queries, name="within_budget"),
+    path("over-budget/", _three_queries, name="over_budget"),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__, QUERY_BUDGET_STATS_SAMPLE_RATE=0)
+class QueryBudgetTests(TestCase):
+    """@query_budget views checked by QueryBudgetMiddleware, as configured in settings."""
+
+    def test_raises_under_the_test_runner(self):
+        self.assertTrue(settings.QUERY_BUDGET_RAISE)
+
+    def test_view_within_budget_passes(self):
+        response = self.client.get("/within-budget/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_view_over_budget_raises(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "over_budget (GET /over-budget/): 3 queries, budget 2"):
+            self.client.get("/over-budget/")
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_view_over_budget_logs_when_not_raising(self):
+        with self.assertLogs("portfolio_app.querybudget", "WARNING"):
+            response = self.client.get("/over-budget/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_stats_recorded_only_for_sampled_requests(self):
+        reset_stats()
+        self.client.get("/within-budget/")
+        self.assertEqual(load_stats(), {})
+        with self.settings(QUERY_BUDGET_STATS_SAMPLE_RATE=1):
+            self.client.get("/within-budget/")
+        self.assertEqual(load_stats()["within_budget"]["requests"], 1)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class QueryPlanTests(TestCase):
+    """Every SELECT the views run must use an index: no full scans, no temp B-tree sorts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_benchmark_data(categories=4, projects=12, images_per_project=2, posts=40, inquiries=20)
+
+    def test_view_queries_use_indexes(self):
+        results = check_query_plans()
+        self.assertTrue(results)
+        endpoints = {result["endpoint"] for result in results}
+        self.assertTrue({"home", "blog_list", "api_portfolio_projects"} <= endpoints, endpoints)
+        for result in results:
+            with self.subTest(endpoint=result["endpoint"], sql=result["sql"][:120]):
+                self.assertEqual(result["problems"], [], "\n".join(result["plan"]))
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursors pointing past either end of the blog list give an empty page, not an error."""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.posts = [
+            BlogPost.objects.create(
+                title=f"Post {i}", content="<p>Body</p>", status=BlogPost.PUBLISHED,
+                published_date=now - timedelta(days=i),
+            )
+            for i in range(3)
+        ]
+
+    def test_out_of_range_cursors(self):
+        newest, oldest = self.posts[0], self.posts[-1]
+        for query in (f"after={encode_cursor(oldest)}", f"before={encode_cursor(newest)}"):
+            with self.subTest(query=query):
+                response = self.client.get(f"/blog/?format=json&{query}")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), {"posts": [], "next": None, "previous": None})
+                self.assertEqual(self.client.get(f"/blog/?{query}").status_code, 200)
+
+
+@override_settings(BACKGROUND_JOBS_ASYNC=False)
+class BlogPostAdminActionTests(TestCase):
+    """The bulk publish/draft actions update rows directly, so they refresh what signals would."""
+
+    def test_make_published_refreshes_related_posts(self):
+        body = "<p>Keyset pagination with cursors keeps deep blog pages fast.</p>"
+        with self.captureOnCommitCallbacks(execute=True):
+            published = BlogPost.objects.create(
+                title="Keyset pagination", content=body, status=BlogPost.PUBLISHED,
+                published_date=timezone.now(),
+            )
+            draft = BlogPost.objects.create(title="Cursor pagination", content=body)
+        before = draft.updated_at
+        version = get_content_version(BLOG)
+
+        model_admin = admin.site._registry[BlogPost]
+        with self.captureOnCommitCallbacks(execute=True):
+            model_admin.make_published(None, BlogPost.objects.filter(pk=draft.pk))
+
+        draft.refresh_from_db()
+        self.assertEqual(draft.status, BlogPost.PUBLISHED)
+        self.assertGreater(draft.updated_at, before)
+        self.assertNotEqual(get_content_version(BLOG), version)
+        self.assertTrue(RelatedPost.objects.filter(post=published, related=draft).exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), IMAGE_RENDITIONS_ON_SAVE=False)
+class RenditionInvalidationTests(TestCase):
+    """A rendition run invalidates once, and only the caches of the image's owner."""
+
+    def test_blog_featured_image_bumps_blog_not_portfolio(self):
+        buffer = BytesIO()
+        PillowImage.new("RGB", (1000, 600), (200, 80, 40)).save(buffer, format="PNG")
+        post = BlogPost(title="Renditions", content="<p>Body</p>")
+        post.featured_image.save("renditions.png", ContentFile(buffer.getvalue()))
+        tags = (FRAGMENT_MEDIA, BLOG, PORTFOLIO)
+        before = {tag: get_content_version(tag) for tag in tags}
+
+        renditions = generate_renditions(post.featured_image)
+
+        self.assertEqual(len(renditions), 4)  # 480w and 960w, WebP and JPEG
+        after = {tag: get_content_version(tag) for tag in tags}
+        self.assertEqual(after[FRAGMENT_MEDIA], before[FRAGMENT_MEDIA] + 1)
+        self.assertEqual(after[BLOG], before[BLOG] + 1)
+        self.assertEqual(after[PORTFOLIO], before[PORTFOLIO])
+        self.assertCountEqual(generate_renditions(post.featured_image), renditions)
+        self.assertEqual(get_content_version(FRAGMENT_MEDIA), after[FRAGMENT_MEDIA])
+        self.assertEqual(ImageRendition.objects.filter(source_name=post.featured_image.name).count(), 4)
+
+
+class SlugAllocationTests(TestCase):
+    """allocate_slugs() only counts the base and its numbered variants as taken."""
+
+    def test_suffixes_follow_the_base_only(self):
+        BlogPost.objects.create(title="Django tips", content="x")
+        BlogPost.objects.create(title="Django", content="x")
+        posts = allocate_slugs([BlogPost(title="Django"), BlogPost(title="Django")], "title")
+        self.assertEqual([post.slug for post in posts], ["django-1", "django-2"])
+
+    def test_long_bases_are_cut_before_the_suffix(self):
+        title = "word " * 60
+        first, second, third = (BlogPost.objects.create(title=title, content="x") for _ in range(3))
+        stem = first.slug[:268].rstrip("-")  # Room for "-1"
+        self.assertEqual([second.slug, third.slug], [f"{stem}-1", f"{stem}-2"])
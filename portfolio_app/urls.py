@@ -21,6 +21,7 @@ urlpatterns = [
     path('api/portfolio-projects/', views.api_portfolio_projects, name='api_portfolio_projects'),
     path('api/portfolio-categories/', views.api_portfolio_categories, name='api_portfolio_categories'),
     path('api/contact-submit/', views.api_contact_submit, name='api_contact_submit'),  # For React contact form
+    path('api/search/', views.api_search, name='api_search'),
 
     # --- Staff Portal URLs ---
     path('staff/', views.staff_dashboard, name='staff_dashboard'),  # For your admin/content management
@@ -36,6 +37,8 @@ urlpatterns = [
     path('staff/coding-projects/<int:pk>/delete/', views.staff_portfolio_delete, name='staff_portfolio_delete'),
     path('staff/coding-projects/<int:pk>/manage-images/', views.staff_manage_portfolio_images,
          name='staff_manage_portfolio_images'),
+    path('staff/coding-projects/<int:pk>/upload-status/', views.staff_portfolio_upload_status,
+         name='staff_portfolio_upload_status'),
     path('react-minimal-test/', views.react_test_minimal_view, name='react_test_minimal'),
 
     # --- Commented out URLs for features you might not need for a personal portfolio ---
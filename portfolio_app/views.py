@@ -1,12 +1,16 @@
 # portfolio_app/views.py
 
 # --- Standard Library Imports ---
+import hashlib
 import os
 import logging
 from collections import defaultdict
+from datetime import timedelta
 from decimal import Decimal
+from functools import wraps
 
 # --- Django Imports ---
+from asgiref.sync import iscoroutinefunction
 from django.contrib import admin, messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required, user_passes_test
@@ -20,9 +24,10 @@ from django.http import HttpResponse, HttpResponseForbidden, Http404, JsonRespon
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.utils import timezone
+from django.views.decorators.http import condition
 from django.views.generic import ListView
 from django.utils.text import Truncator
-from django.utils.html import strip_tags
+from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.contrib.auth import update_session_auth_hash
 from django.conf import settings
@@ -38,6 +43,30 @@ except ImportError:
     )
 
 # --- App Imports ---
+from . import search
+from .caching import (
+    BLOG,
+    PORTFOLIO,
+    aget_content_version,
+    aversioned_cache_key,
+    get_content_version,
+    versioned_cache_key,
+)
+from .dbwrites import arun_write, run_write, write_transaction
+from .jobs import has_allowed_extension, queue_gallery_uploads
+from .pagecache import (
+    BLOG_CATEGORIES,
+    BLOG_CATEGORY,
+    BLOG_LIST,
+    BLOG_POST,
+    HOME,
+    STATIC_PAGES,
+    cache_public_page,
+)
+from .pagination import keyset_paginate
+from .querybudget import query_budget
+from .replicas import replica_reads
+from .renditions import aget_renditions_bulk
 from .forms import (
     ContactForm,  # Keep ContactForm if used by Django before React takes over
     # ExpenseForm, # Likely remove if internal Project model is removed
@@ -53,6 +82,7 @@ from .models import (
     PortfolioCategory,
     PortfolioImage,
     PortfolioProject,
+    RelatedPost,
     # Models to likely remove/re-evaluate for portfolio:
     # CostItem, Customer, CustomerDocument, Expense, ExpenseCategory,
     # Project, InternalProjectImage, Vendor
@@ -70,7 +100,188 @@ def is_office_staff(user):  # For your portfolio, this might just become `user.i
     )
 
 
+# Cards only need the precomputed summary columns, never the post bodies.
+BLOG_CARD_DEFERRED_FIELDS = ("content", "rendered_content", "plain_text", "table_of_contents")
+
+
+def live_blog_posts():
+    """Published, active posts whose publish date has passed."""
+    published_status = getattr(BlogPost, "PUBLISHED", "PUBLISHED")
+    return BlogPost.objects.filter(
+        status=published_status, published_date__lte=timezone.now(), is_active=True
+    )
+
+
+# --- Conditional GET Validators ---
+def conditional_on_content(namespace, get_queryset, per_user=False, cache_stats=False):
+    """
+    Wraps a view in Django's @condition using a validator derived from
+    Max('updated_at') and the row count of get_queryset(request, *args, **kwargs),
+    plus the namespace's content version (bumped by signals for edits that do
+    not touch updated_at, e.g. category renames). The aggregate runs once per
+    request and a matching If-None-Match/If-Modified-Since short-circuits to 304
+    before the view queries, serializes or renders anything.
+
+    per_user=True mixes in the user id for HTML pages whose navbar differs for
+    logged-in staff. cache_stats=True stores the aggregate under the versioned
+    cache key; only use it when every change to the result bumps the version
+    (i.e. the queryset does not depend on the current time).
+
+    Async views get the same validator from the async ORM and cache calls,
+    computed before Django's (synchronous) @condition runs.
+    """
+    stats_fields = {"latest": Max("updated_at"), "total": Count("pk")}
+
+    def get_stats(request, *args, **kwargs):
+        queryset = get_queryset(request, *args, **kwargs)
+        if not cache_stats:
+            return queryset.aggregate(**stats_fields)
+        key = versioned_cache_key(
+            namespace, "validator", get_queryset.__name__, *args
+        )
+        stats = cache.get(key)
+        if stats is None:
+            stats = queryset.aggregate(**stats_fields)
+            cache.set(key, stats, timeout=settings.PORTFOLIO_API_CACHE_TIMEOUT)
+        return stats
+
+    async def aget_stats(request, *args, **kwargs):
+        queryset = get_queryset(request, *args, **kwargs)
+        if not cache_stats:
+            return await queryset.aaggregate(**stats_fields)
+        key = await aversioned_cache_key(
+            namespace, "validator", get_queryset.__name__, *args
+        )
+        stats = await cache.aget(key)
+        if stats is None:
+            stats = await queryset.aaggregate(**stats_fields)
+            await cache.aset(
+                key, stats, timeout=settings.PORTFOLIO_API_CACHE_TIMEOUT
+            )
+        return stats
+
+    def build_validator(stats, version, user_id):
+        etag = None
+        if stats["total"]:
+            raw = ":".join(
+                str(part)
+                for part in (
+                    namespace,
+                    version,
+                    stats["latest"],
+                    stats["total"],
+                    user_id,
+                )
+            )
+            etag = hashlib.md5(raw.encode()).hexdigest()
+        return (etag, stats["latest"])
+
+    def get_validator(request, *args, **kwargs):
+        if not hasattr(request, "_content_validator"):
+            stats = get_stats(request, *args, **kwargs)
+            request._content_validator = build_validator(
+                stats,
+                get_content_version(namespace) if stats["total"] else None,
+                request.user.pk if per_user else None,
+            )
+        return request._content_validator
+
+    async def aset_validator(request, *args, **kwargs):
+        stats = await aget_stats(request, *args, **kwargs)
+        request._content_validator = build_validator(
+            stats,
+            await aget_content_version(namespace) if stats["total"] else None,
+            (await request.auser()).pk if per_user else None,
+        )
+
+    conditional = condition(
+        etag_func=lambda request, *args, **kwargs: get_validator(
+            request, *args, **kwargs
+        )[0],
+        last_modified_func=lambda request, *args, **kwargs: get_validator(
+            request, *args, **kwargs
+        )[1],
+    )
+
+    def decorator(view_func):
+        conditional_view = conditional(view_func)
+        if not iscoroutinefunction(view_func):
+            return conditional_view
+
+        @wraps(view_func)
+        async def inner(request, *args, **kwargs):
+            await aset_validator(request, *args, **kwargs)
+            return await conditional_view(request, *args, **kwargs)
+
+        return inner
+
+    return decorator
+
+
+def _active_portfolio_projects(request):
+    return PortfolioProject.objects.filter(is_active=True)
+
+
+def _live_posts_for_list(request):
+    return live_blog_posts()
+
+
+def _live_posts_for_category(request, slug):
+    return live_blog_posts().filter(category__slug=slug, category__is_active=True)
+
+
+def _live_post_by_slug(request, slug):
+    return live_blog_posts().filter(slug=slug)
+
+
+def blog_page_json_response(request, page):
+    """JSON variant of a blog list page (?format=json), used for infinite scroll."""
+    posts = []
+    for post in page:
+        posts.append(
+            {
+                "title": post.title,
+                "slug": post.slug,
+                "url": post.get_absolute_url(),
+                "excerpt": post.excerpt,
+                "reading_time": post.reading_time,
+                "published_date": post.published_date.isoformat(),
+                "featured_image": (
+                    post.featured_image.url if post.featured_image else None
+                ),
+                "category": (
+                    {"name": post.category.name, "slug": post.category.slug}
+                    if post.category
+                    else None
+                ),
+                "author": (
+                    post.author.get_full_name() or post.author.username
+                    if post.author
+                    else None
+                ),
+            }
+        )
+    return JsonResponse(
+        {
+            "posts": posts,
+            "next": (
+                f"{request.path}?format=json&after={page.next_cursor}"
+                if page.has_next
+                else None
+            ),
+            "previous": (
+                f"{request.path}?format=json&before={page.previous_cursor}"
+                if page.has_previous
+                else None
+            ),
+        }
+    )
+
+
 # --- Public Site Views ---
+@query_budget(8)
+@replica_reads
+@cache_public_page(HOME, PORTFOLIO, BLOG_CATEGORIES)
 def home(request):
     published_status = getattr(BlogPost, "PUBLISHED", "PUBLISHED")
     try:
@@ -81,6 +292,7 @@ def home(request):
                 is_active=True,
             )
             .select_related("category", "author")
+            .defer(*BLOG_CARD_DEFERRED_FIELDS)
             .order_by("-published_date")[:3]
         )
     except Exception as e:
@@ -89,9 +301,11 @@ def home(request):
 
     # Fetch your coding projects for the homepage
     try:
-        latest_portfolio_projects = PortfolioProject.objects.filter(
-            is_active=True
-        ).order_by("order", "-created_at")[:3]
+        latest_portfolio_projects = (
+            PortfolioProject.objects.filter(is_active=True)
+            .order_by("order", "-created_at")
+            .with_first_image()[:3]
+        )
     except Exception as e:
         logger.error(f"Error fetching latest portfolio projects for home page: {e}")
         latest_portfolio_projects = []
@@ -106,6 +320,8 @@ def home(request):
     return render(request, "portfolio_app/home.html", context)
 
 
+@query_budget(3)
+@cache_public_page(STATIC_PAGES)
 def about_us(request):  # Will be "About Me"
     context = {
         "page_title": "About Tony the Coder",
@@ -119,6 +335,7 @@ def about_us(request):  # Will be "About Me"
     return render(request, "portfolio_app/about_us.html", context)
 
 
+@query_budget(3)
 def contact_us(request):
     # This view will initially serve the page for the React contact form.
     # The actual form submission will be handled by an API view.
@@ -139,13 +356,15 @@ def contact_us(request):
 
 
 # API endpoint for React contact form (Example)
-def api_contact_submit(request):
+@query_budget(6)
+async def api_contact_submit(request):
     if request.method == "POST":
 
         form = ContactForm(request.POST)
 
+        # ContactForm has no unique fields, so validation never queries.
         if form.is_valid():
-            form.save()
+            await arun_write(form.save)
             # In a real API, you wouldn't use Django messages directly like this for React
             return JsonResponse(
                 {
@@ -160,6 +379,10 @@ def api_contact_submit(request):
     )
 
 
+@query_budget(8)
+@replica_reads
+@cache_public_page(BLOG_LIST, BLOG_CATEGORIES)
+@conditional_on_content(BLOG, _live_posts_for_list, per_user=True)
 def blog_list(request):
     published_status = getattr(BlogPost, "PUBLISHED", "PUBLISHED")
     posts = (
@@ -167,25 +390,16 @@ def blog_list(request):
             status=published_status, published_date__lte=timezone.now(), is_active=True
         )
         .select_related("category", "author")
-        .order_by("-published_date")
-    )
-    categories = (
-        BlogCategory.objects.filter(is_active=True)
-        .annotate(
-            num_posts=Count(
-                "posts",
-                filter=Q(
-                    posts__status=published_status,
-                    posts__published_date__lte=timezone.now(),
-                    posts__is_active=True,
-                ),
-            )
-        )
-        .filter(num_posts__gt=0)
-        .order_by("name")
+        .defer(*BLOG_CARD_DEFERRED_FIELDS)
     )
+    page = keyset_paginate(posts, request, settings.BLOG_POSTS_PER_PAGE)
+    if request.GET.get("format") == "json":
+        return blog_page_json_response(request, page)
+    categories = BlogCategory.objects.for_sidebar()
     context = {
-        "blog_posts": posts,
+        "blog_posts": page.object_list,
+        "page_obj": page,
+        "is_paginated": page.has_other_pages,
         "categories_for_sidebar": categories,
         "page_title": "Tony's Tech Blog - Coding & AI Insights",
         "meta_description": "Explore articles on web development, Python, Django, React, AI, and other technology topics by Tony the Coder.",
@@ -198,32 +412,35 @@ def blog_list(request):
     return render(request, "portfolio_app/blog_list.html", context)
 
 
+@query_budget(8)
+@replica_reads
+@cache_public_page(BLOG_POST, BLOG_CATEGORIES)
+@conditional_on_content(BLOG, _live_post_by_slug, per_user=True)
 def blog_post_detail(request, slug):
     published_status = getattr(BlogPost, "PUBLISHED", "PUBLISHED")
     post_instance = get_object_or_404(
-        BlogPost.objects.select_related("category", "author"),
+        BlogPost.objects.select_related("category", "author").defer(
+            "content", "plain_text"
+        ),
         slug=slug,
         status=published_status,
         published_date__lte=timezone.now(),
         is_active=True,
     )
-    related_posts = BlogPost.objects.none()
-    if post_instance:
-        base_query = (
-            BlogPost.objects.filter(
-                status=published_status,
-                published_date__lte=timezone.now(),
-                is_active=True,
-            )
-            .exclude(pk=post_instance.pk)
-            .select_related("category")
+    post_instance.ensure_rendered()
+    # Precomputed by related.py; one query on the (post, rank) index.
+    related_links = (
+        RelatedPost.objects.filter(
+            post=post_instance,
+            related__status=published_status,
+            related__published_date__lte=timezone.now(),
+            related__is_active=True,
         )
-        if post_instance.category:
-            related_posts = base_query.filter(category=post_instance.category).order_by(
-                "-published_date"
-            )[:3]
-        if not related_posts.exists():
-            related_posts = base_query.order_by("-published_date")[:3]
+        .select_related("related__category", "related__author")
+        .defer(*(f"related__{field}" for field in BLOG_CARD_DEFERRED_FIELDS))
+        .order_by("rank")[:3]
+    )
+    related_posts = [link.related for link in related_links]
 
     breadcrumbs = [
         {"name": "Home", "url": reverse("portfolio_app:home")},
@@ -249,16 +466,17 @@ def blog_post_detail(request, slug):
         "post": post_instance,
         "related_posts": related_posts,
         "page_title": post_instance.title,
-        "meta_description": (
-            post_instance.excerpt
-            or Truncator(strip_tags(post_instance.content)).words(25, truncate="...")
-        ),
+        "meta_description": post_instance.meta_description,
         "breadcrumbs": breadcrumbs,
         "is_staff_portal": False,
     }
     return render(request, "portfolio_app/blog_post_detail.html", context)
 
 
+@query_budget(9)
+@replica_reads
+@cache_public_page(BLOG_CATEGORY, BLOG_CATEGORIES)
+@conditional_on_content(BLOG, _live_posts_for_category, per_user=True)
 def blog_category_list(request, slug):
     category = get_object_or_404(BlogCategory, slug=slug, is_active=True)
     published_status = getattr(BlogPost, "PUBLISHED", "PUBLISHED")
@@ -270,23 +488,12 @@ def blog_category_list(request, slug):
             is_active=True,
         )
         .select_related("author", "category")
-        .order_by("-published_date")
-    )
-    all_categories = (
-        BlogCategory.objects.filter(is_active=True)
-        .annotate(
-            num_posts=Count(
-                "posts",
-                filter=Q(
-                    posts__status=published_status,
-                    posts__published_date__lte=timezone.now(),
-                    posts__is_active=True,
-                ),
-            )
-        )
-        .filter(num_posts__gt=0)
-        .order_by("name")
+        .defer(*BLOG_CARD_DEFERRED_FIELDS)
     )
+    page = keyset_paginate(posts, request, settings.BLOG_POSTS_PER_PAGE)
+    if request.GET.get("format") == "json":
+        return blog_page_json_response(request, page)
+    all_categories = BlogCategory.objects.for_sidebar()
     breadcrumbs = [
         {"name": "Home", "url": reverse("portfolio_app:home")},
         {"name": "Blog", "url": reverse("portfolio_app:blog_list")},
@@ -294,7 +501,9 @@ def blog_category_list(request, slug):
     ]
     context = {
         "category": category,
-        "blog_posts": posts,
+        "blog_posts": page.object_list,
+        "page_obj": page,
+        "is_paginated": page.has_other_pages,
         "categories_for_sidebar": all_categories,
         "page_title": f"{category.name} Posts - Tony's Tech Blog",
         "meta_description": category.description
@@ -308,6 +517,8 @@ def blog_category_list(request, slug):
 # --- New React Portfolio Views ---
 
 
+@query_budget(3)
+@cache_public_page(STATIC_PAGES)
 def portfolio_showcase_react(request):
     context = {
         "page_title": "My Coding Portfolio - Tony the Coder",
@@ -321,40 +532,83 @@ def portfolio_showcase_react(request):
     return render(request, "portfolio_app/portfolio_showcase_react.html", context)
 
 
-def api_portfolio_projects(request):
-    projects = (
+API_PROJECTS_CHUNK_SIZE = 2000
+
+
+def portfolio_project_payload(request, p, first_image, renditions_by_name):
+    """One project's entry in api_portfolio_projects (also used by the microbenchmarks)."""
+    project_data = {
+        "id": p.pk,
+        "title": p.title,
+        "slug": p.slug,
+        "short_description": p.short_description,
+        "details": p.details,
+        "imageUrl": None,
+        "imageRenditions": {},  # {"webp": [{"width": 480, "url": ...}], "jpeg": [...]}
+        "categories": [
+            {"name": cat.name, "slug": cat.slug} for cat in p.categories.all()
+        ],
+        "technologies_used": p.technologies_used,
+        "github_url": p.github_url,
+        "live_demo_url": p.live_demo_url,
+        "year_completed": p.year_completed,
+        "status": p.get_status_display(),  # To get the display name of status
+    }
+    if first_image:
+        project_data["imageUrl"] = request.build_absolute_uri(first_image.url)
+        renditions = renditions_by_name.get(first_image.name, {})
+        for image_format in settings.IMAGE_RENDITION_FORMATS:
+            if renditions.get(image_format):
+                project_data["imageRenditions"][image_format.lower()] = [
+                    {"width": width, "url": request.build_absolute_uri(url)}
+                    for width, url in renditions[image_format]
+                ]
+    # else:
+    # project_data['imageUrl'] = request.build_absolute_uri(settings.STATIC_URL + 'images/default_project_thumb.png') # Example default
+    return project_data
+
+
+@query_budget(7)
+@replica_reads
+@conditional_on_content(PORTFOLIO, _active_portfolio_projects, cache_stats=True)
+async def api_portfolio_projects(request):
+    # The payload embeds absolute image URLs, so the key varies by scheme/host.
+    cache_key = await aversioned_cache_key(
+        PORTFOLIO, "api_portfolio_projects", request.build_absolute_uri("/")
+    )
+    cached_body = await cache.aget(cache_key)
+    if cached_body is not None:
+        return HttpResponse(cached_body, content_type="application/json")
+
+    queryset = (
         PortfolioProject.objects.filter(is_active=True)
         .order_by("order", "-created_at")
         .prefetch_related("categories")
+        .with_first_image()
     )
-    data = []
-    for p in projects:
-        project_data = {
-            "id": p.pk,
-            "title": p.title,
-            "slug": p.slug,
-            "short_description": p.short_description,
-            "details": p.details,
-            "imageUrl": None,
-            "categories": [
-                {"name": cat.name, "slug": cat.slug} for cat in p.categories.all()
-            ],
-            "technologies_used": p.technologies_used,
-            "github_url": p.github_url,
-            "live_demo_url": p.live_demo_url,
-            "year_completed": p.year_completed,
-            "status": p.get_status_display(),  # To get the display name of status
-        }
-        first_image_url_path = p.get_first_image_url()
-        if first_image_url_path:
-            project_data["imageUrl"] = request.build_absolute_uri(first_image_url_path)
-        # else:
-        # project_data['imageUrl'] = request.build_absolute_uri(settings.STATIC_URL + 'images/default_project_thumb.png') # Example default
-        data.append(project_data)
-    return JsonResponse({"projects": data})
+    # Prefetches run once per chunk; one chunk keeps the query count flat.
+    projects = [
+        p async for p in queryset.aiterator(chunk_size=API_PROJECTS_CHUNK_SIZE)
+    ]
+    first_images = {p.pk: p.get_first_image() for p in projects}
+    renditions_by_name = await aget_renditions_bulk(
+        image.name for image in first_images.values() if image
+    )
+    data = [
+        portfolio_project_payload(request, p, first_images[p.pk], renditions_by_name)
+        for p in projects
+    ]
+    response = JsonResponse({"projects": data})
+    await cache.aset(
+        cache_key, response.content, timeout=settings.PORTFOLIO_API_CACHE_TIMEOUT
+    )
+    return response
 
 
-def api_portfolio_categories(request):  # New API view for categories
+@query_budget(4)
+@replica_reads
+@conditional_on_content(PORTFOLIO, _active_portfolio_projects, cache_stats=True)
+async def api_portfolio_categories(request):  # New API view for categories
     published_status = getattr(
         BlogPost, "PUBLISHED", "PUBLISHED"
     )  # Used in BlogPost category count
@@ -370,14 +624,38 @@ def api_portfolio_categories(request):  # New API view for categories
     )
     data = [
         {"name": cat.name, "slug": cat.slug, "description": cat.description}
-        for cat in categories
+        async for cat in categories.aiterator()
     ]
     return JsonResponse({"categories": data})
 
 
+@query_budget(3)
+def api_search(request):
+    """
+    Ranked full-text search over live blog posts and active coding projects.
+    ?q= search text, optional ?type=blog|project (repeatable), ?limit= (max 50).
+    Snippets are HTML with <mark> highlights; all other text is escaped.
+    """
+    query = request.GET.get("q", "").strip()
+    kinds = [
+        kind
+        for kind in request.GET.getlist("type")
+        if kind in (search.BLOG, search.PROJECT)
+    ] or [search.BLOG, search.PROJECT]
+    try:
+        limit = min(max(int(request.GET.get("limit", 20)), 1), 50)
+    except ValueError:
+        limit = 20
+    if len(query) < 2:
+        return JsonResponse({"query": query, "results": []})
+    results = search.search(query, kinds=kinds, limit=limit)
+    return JsonResponse({"query": query, "results": results})
+
+
 # --- Staff Portal Views (Updated for TonyTheCoder.com) ---
 
 
+@query_budget(8)
 @login_required
 @user_passes_test(is_office_staff)
 def staff_dashboard(request):
@@ -399,6 +677,7 @@ def staff_dashboard(request):
     return render(request, "portfolio_app/staff/dashboard.html", context)
 
 
+@query_budget(5)
 @login_required
 @user_passes_test(is_office_staff)
 def staff_user_profile(request):
@@ -418,13 +697,14 @@ def staff_user_profile(request):
     return render(request, "portfolio_app/staff/staff_user_profile.html", context)
 
 
+@query_budget(10)
 @login_required
 @user_passes_test(is_office_staff)
 def staff_user_profile_edit(request):
     if request.method == "POST":
         form = StaffUserChangeForm(request.POST, instance=request.user)
         if form.is_valid():
-            form.save()
+            run_write(form.save)
             messages.success(request, "Your profile has been updated successfully!")
             return redirect(reverse("portfolio_app:staff_user_profile"))
         else:
@@ -447,7 +727,26 @@ def staff_user_profile_edit(request):
     return render(request, "portfolio_app/staff/staff_user_profile_edit.html", context)
 
 
+def _queue_gallery_uploads(request, project):
+    """
+    Hands the "new_images" uploads to the background job queue after a cheap
+    extension check. Pillow verification and PortfolioImage creation happen
+    off the request thread (see jobs.py). Returns the number of queued files.
+    """
+    accepted_files = []
+    for uploaded_file in request.FILES.getlist("new_images"):
+        if not has_allowed_extension(uploaded_file):
+            messages.error(
+                request,
+                f"Invalid file type: {uploaded_file.name}. Only image files allowed.",
+            )
+            continue
+        accepted_files.append(uploaded_file)
+    return len(queue_gallery_uploads(project, accepted_files))
+
+
 # Staff Portfolio Project Management (for coding projects)
+@query_budget(6)
 @login_required
 @user_passes_test(is_office_staff)
 def staff_portfolio_list(request):
@@ -475,46 +774,16 @@ def staff_portfolio_add(request):
     if request.method == "POST":
         form = StaffPortfolioProjectForm(request.POST, request.FILES)
         if form.is_valid():
-            project_instance = form.save()
-            new_gallery_images = request.FILES.getlist("new_images")
-            images_uploaded_count = 0
-            allowed_extensions = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
-            for uploaded_file in new_gallery_images:
-                ext = os.path.splitext(uploaded_file.name)[1].lower()
-                if ext not in allowed_extensions:
-                    messages.error(
-                        request,
-                        f"Invalid file type: {uploaded_file.name}. Only image files allowed.",
-                    )
-                    continue
-                if PillowImage:
-                    try:
-                        img = PillowImage.open(uploaded_file)
-                        img.verify()  # Check if it's a valid image
-                        uploaded_file.seek(0)  # Reset file pointer after verify
-                    except Exception as e:
-                        logger.error(
-                            f"Pillow could not verify gallery image {uploaded_file.name}: {e}"
-                        )
-                        messages.error(
-                            request,
-                            f"File {uploaded_file.name} could not be verified as a valid image.",
-                        )
-                        continue
-                PortfolioImage.objects.create(
-                    portfolio_project=project_instance,
-                    image=uploaded_file,
-                    caption="",
-                    order=0,
-                )
-                images_uploaded_count += 1
+            project_instance = run_write(form.save)
+            images_queued_count = _queue_gallery_uploads(request, project_instance)
             messages.success(
                 request,
                 f'Coding Project "{project_instance.title}" created successfully.',
             )
-            if images_uploaded_count > 0:
+            if images_queued_count > 0:
                 messages.info(
-                    request, f"{images_uploaded_count} new gallery image(s) uploaded."
+                    request,
+                    f"{images_queued_count} new gallery image(s) queued for processing.",
                 )
             return redirect(
                 reverse(
@@ -559,46 +828,16 @@ def staff_portfolio_edit(request, pk):
             request.POST, request.FILES, instance=project_instance
         )
         if form.is_valid():
-            updated_project = form.save()
-            new_gallery_images = request.FILES.getlist("new_images")
-            images_uploaded_count = 0
-            allowed_extensions = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
-            for uploaded_file in new_gallery_images:
-                ext = os.path.splitext(uploaded_file.name)[1].lower()
-                if ext not in allowed_extensions:
-                    messages.error(
-                        request,
-                        f"Invalid file type: {uploaded_file.name}. Only image files allowed.",
-                    )
-                    continue
-                if PillowImage:
-                    try:
-                        img = PillowImage.open(uploaded_file)
-                        img.verify()
-                        uploaded_file.seek(0)
-                    except Exception as e:
-                        logger.error(
-                            f"Pillow could not verify gallery image {uploaded_file.name}: {e}"
-                        )
-                        messages.error(
-                            request,
-                            f"File {uploaded_file.name} could not be verified as a valid image.",
-                        )
-                        continue
-                PortfolioImage.objects.create(
-                    portfolio_project=updated_project,
-                    image=uploaded_file,
-                    caption="",
-                    order=0,
-                )
-                images_uploaded_count += 1
+            updated_project = run_write(form.save)
+            images_queued_count = _queue_gallery_uploads(request, updated_project)
             messages.success(
                 request,
                 f'Coding Project "{updated_project.title}" updated successfully.',
             )
-            if images_uploaded_count > 0:
+            if images_queued_count > 0:
                 messages.info(
-                    request, f"{images_uploaded_count} new gallery image(s) uploaded."
+                    request,
+                    f"{images_queued_count} new gallery image(s) queued for processing.",
                 )
             return redirect(
                 reverse(
@@ -634,6 +873,15 @@ def staff_portfolio_edit(request, pk):
     return render(request, "portfolio_app/staff/portfolio_project_form.html", context)
 
 
+@write_transaction
+def _save_gallery_changes(project, deleted_images, changed_images):
+    for image in deleted_images:
+        image.delete()
+    for image in changed_images:
+        image.portfolio_project = project
+        image.save()
+
+
 @login_required
 @user_passes_test(is_office_staff)
 def staff_manage_portfolio_images(request, pk):
@@ -662,10 +910,7 @@ def staff_manage_portfolio_images(request, pk):
                         os.remove(obj.image.path)
                     except OSError as e:
                         logger.error(f"Error deleting image file {obj.image.path}: {e}")
-                obj.delete()
-            for instance in instances:
-                instance.portfolio_project = project
-                instance.save()
+            _save_gallery_changes(project, formset.deleted_objects, instances)
 
             featured_image_id_str = request.POST.get("set_featured_image_id")
             if featured_image_id_str:
@@ -707,7 +952,7 @@ def staff_manage_portfolio_images(request, pk):
                             messages.info(
                                 request, "Selected image is already the featured image."
                             )
-                    project.save()  # Save the project here to persist featured_image changes
+                    run_write(project.save)  # Save the project here to persist featured_image changes
                 except (ValueError, PortfolioImage.DoesNotExist):
                     messages.error(
                         request,
@@ -771,6 +1016,40 @@ def staff_manage_portfolio_images(request, pk):
     return render(request, "portfolio_app/staff/manage_portfolio_images.html", context)
 
 
+@query_budget(5)
+@login_required
+@user_passes_test(is_office_staff)
+def staff_portfolio_upload_status(request, pk):
+    """Progress of background gallery uploads for a project, polled by the staff UI."""
+    project = get_object_or_404(PortfolioProject, pk=pk)
+    recent_jobs = project.upload_jobs.filter(
+        created_at__gte=timezone.now() - timedelta(days=1)
+    ).order_by("created_at")
+    counts = {"PENDING": 0, "PROCESSING": 0, "DONE": 0, "FAILED": 0}
+    jobs = []
+    for job in recent_jobs:
+        counts[job.status] += 1
+        jobs.append(
+            {
+                "id": job.pk,
+                "name": job.original_name,
+                "status": job.status,
+                "error": job.error,
+            }
+        )
+    return JsonResponse(
+        {
+            "pending": counts["PENDING"],
+            "processing": counts["PROCESSING"],
+            "done": counts["DONE"],
+            "failed": counts["FAILED"],
+            "finished": counts["PENDING"] + counts["PROCESSING"] == 0,
+            "jobs": jobs,
+        }
+    )
+
+
+@query_budget(8)
 @login_required
 @user_passes_test(is_office_staff)
 def portfolio_project_detail_staff(request, pk):
@@ -807,7 +1086,7 @@ def staff_portfolio_delete(request, pk):
     project_instance = get_object_or_404(PortfolioProject, pk=pk)
     project_title = project_instance.title
     if request.method == "POST":
-        project_instance.delete()
+        run_write(project_instance.delete)
         messages.success(
             request, f'Coding Project "{project_title}" and its images deleted.'
         )
@@ -836,6 +1115,7 @@ def staff_portfolio_delete(request, pk):
     )
 
 
+@query_budget(3)
 def react_test_minimal_view(request):
     return render(request, "portfolio_app/react_test_minimal.html")
 
@@ -0,0 +1,105 @@
+# portfolio_app/warmup.py
+#
+# Start-of-worker warm-up.
+#
+# A fresh gunicorn/uvicorn worker pays for a lot of one-off work on its first
+# requests: importing the view modules, building the URL resolver's reverse
+# tables, and parsing and compiling every template it touches. warm_up() does
+# all of that up front:
+#
+#   * imports the root URLconf (and with it every app's urls/views) and fills
+#     the resolver's reverse/namespace tables, so the first {% url %} and
+#     reverse() calls are dictionary lookups
+#   * compiles every template under the template DIRS and each installed
+#     app's templates/ directory through the configured engines; with the
+#     cached loader (settings_production.py) the compiled templates stay in
+#     the worker for its lifetime
+#   * opens the database connection
+#
+# It runs from `manage.py warmup` and, when settings.WARMUP_ON_STARTUP is set,
+# from wsgi.py/asgi.py as each worker imports the application. Templates
+# that fail to compile are reported, not raised, so one broken template
+# cannot keep a worker from starting.
+
+import logging
+import os
+import time
+from pathlib import Path
+
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+from django.urls import URLPattern, URLResolver, get_resolver
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = (".html", ".txt", ".xml")
+
+
+def template_names(engine):
+    """Every template name the engine can load from its dirs and app dirs."""
+    dirs = list(engine.dirs)
+    if engine.app_dirs or isinstance(engine, DjangoTemplates):
+        dirs += list(get_app_template_dirs("templates"))
+    names = set()
+    for directory in dirs:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    names.add(Path(root, filename).relative_to(directory).as_posix())
+    return sorted(names)
+
+
+def compile_templates():
+    """Compiles every template; returns (compiled count, {name: error})."""
+    compiled, errors = 0, {}
+    for engine in engines.all():
+        for name in template_names(engine):
+            try:
+                engine.get_template(name)
+                compiled += 1
+            except (TemplateSyntaxError, UnicodeDecodeError) as e:
+                errors[f"{engine.name}:{name}"] = str(e)
+    return compiled, errors
+
+
+def _walk_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _walk_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def resolve_urls():
+    """Imports every view and fills the resolver's lookup tables; returns the pattern count."""
+    resolver = get_resolver()
+    resolver.reverse_dict  # Populates reverse_dict, namespace_dict and app_dict
+    count = 0
+    for pattern in _walk_patterns(resolver.url_patterns):
+        pattern.callback  # Imports string-referenced views and caches the callable
+        count += 1
+    return count
+
+
+def warm_up():
+    """Runs every warm-up step and returns a summary dict."""
+    start = time.perf_counter()
+    url_count = resolve_urls()
+    template_count, template_errors = compile_templates()
+    for alias in connections:
+        connections[alias].ensure_connection()
+    summary = {
+        "urls": url_count,
+        "templates": template_count,
+        "template_errors": template_errors,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    for name, error in template_errors.items():
+        logger.warning(f"Warm-up could not compile {name}: {error}")
+    logger.info(
+        f"Warm-up done in {summary['seconds']}s: {url_count} URL patterns, "
+        f"{template_count} templates, {len(template_errors)} template error(s)"
+    )
+    return summary